@@ -158,6 +158,7 @@ from .input_media_video import InputMediaVideo
 from .input_sticker import InputSticker
 from .input_text_message_content import InputTextMessageContent
 from .input_venue_message_content import InputVenueMessageContent
+from .intern import InternCache, InternStats, interning, current_intern_cache
 from .invoice import Invoice
 from .keyboard_button import KeyboardButton
 from .keyboard_button_poll_type import KeyboardButtonPollType
@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Optional
 
 from .photo_size import PhotoSize
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class Audio:
     """\
@@ -6,7 +6,10 @@
 from dataclasses import dataclass
 from typing import Optional, Dict
 
+from .utils import slotted
 
+
+@slotted
 @dataclass(frozen=True)
 class BotDescription:
     """\
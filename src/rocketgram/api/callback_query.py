@@ -8,8 +8,10 @@ from typing import Optional
 
 from .message import Message
 from .user import User
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class CallbackQuery:
     """\
@@ -4,7 +4,7 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Dict, Optional, List
 
 from . import message
@@ -12,14 +12,22 @@ from .chat_location import ChatLocation
 from .chat_permissions import ChatPermissions
 from .chat_photo import ChatPhoto
 from .chat_type import ChatType
+from .intern import current_intern_cache
 from .reaction_type import ReactionType
+from .utils import LazyParseMixin, slotted, plain, parsed, parsed_list
 
 
+@slotted
 @dataclass(frozen=True)
-class Chat:
+class Chat(LazyParseMixin):
     """\
     Represents Chat object:
     https://core.telegram.org/bots/api#chat
+
+    Lazily parsed chats decode all fields except `id` and `type` on first access.
+
+    Repeated chats are shared instances when parsed with InternCache, see `interning`.
+    Cached instance may be returned for both lazy and regular parsing.
     """
 
     id: int
@@ -60,52 +68,66 @@ class Chat:
     linked_chat_id: Optional[int]
     location: Optional[ChatLocation]
 
+    _parsers = {
+        'title': plain('title'),
+        'username': plain('username'),
+        'first_name': plain('first_name'),
+        'last_name': plain('last_name'),
+        'is_forum': plain('is_forum'),
+        'photo': parsed(ChatPhoto, 'photo'),
+        'active_usernames': plain('active_usernames'),
+        'available_reactions': parsed_list(ReactionType, 'available_reactions'),
+        'accent_color_id': plain('accent_color_id'),
+        'background_custom_emoji_id': plain('background_custom_emoji_id'),
+        'profile_accent_color_id': plain('profile_accent_color_id'),
+        'profile_background_custom_emoji_id': plain('profile_background_custom_emoji_id'),
+        'emoji_status_custom_emoji_id': plain('emoji_status_custom_emoji_id'),
+        'emoji_status_expiration_date': plain('emoji_status_expiration_date'),
+        'bio': plain('bio'),
+        'has_private_forwards': plain('has_private_forwards'),
+        'has_restricted_voice_and_video_messages': plain('has_restricted_voice_and_video_messages'),
+        'join_to_send_messages': plain('join_to_send_messages'),
+        'join_by_request': plain('join_by_request'),
+        'description': plain('description'),
+        'invite_link': plain('invite_link'),
+        'pinned_message': parsed('message.Message', 'pinned_message', lazy=True),
+        'permissions': parsed(ChatPermissions, 'permissions'),
+        'slow_mode_delay': plain('slow_mode_delay'),
+        'unrestrict_boost_count': plain('unrestrict_boost_count'),
+        'message_auto_delete_time': plain('message_auto_delete_time'),
+        'has_aggressive_anti_spam_enabled': plain('has_aggressive_anti_spam_enabled'),
+        'has_hidden_members': plain('has_hidden_members'),
+        'has_protected_content': plain('has_protected_content'),
+        'has_visible_history': plain('has_visible_history'),
+        'sticker_set_name': plain('sticker_set_name'),
+        'can_set_sticker_set': plain('can_set_sticker_set'),
+        'custom_emoji_sticker_set_name': plain('custom_emoji_sticker_set_name'),
+        'linked_chat_id': plain('linked_chat_id'),
+        'location': parsed(ChatLocation, 'location'),
+    }
+
     @classmethod
-    def parse(cls, data: Optional[Dict]) -> Optional['Chat']:
+    def parse(cls, data: Optional[Dict], lazy: bool = False) -> Optional['Chat']:
         if data is None:
             return None
 
+        cache = current_intern_cache()
+        if cache is not None:
+            obj = cache.get(cls, data)
+            if obj is not None:
+                return obj
+
         try:
             chat_type = ChatType(data['type'])
         except ValueError:
             chat_type = ChatType.unknown
-        return cls(
-            data['id'],
-            chat_type,
-            data.get('title'),
-            data.get('username'),
-            data.get('first_name'),
-            data.get('last_name'),
-            data.get('is_forum'),
-            ChatPhoto.parse(data.get('photo')),
-            data['active_usernames'] if 'active_usernames' in data else None,
-            [ReactionType.parse(r) for r in data['available_reactions']] if 'available_reactions' in data else None,
-            data.get('accent_color_id'),
-            data.get('background_custom_emoji_id'),
-            data.get('profile_accent_color_id'),
-            data.get('profile_background_custom_emoji_id'),
-            data.get('emoji_status_custom_emoji_id'),
-            datetime.fromtimestamp(data['emoji_status_expiration_date'],
-                                   tz=timezone.utc) if 'emoji_status_expiration_date' in data else None,
-            data.get('bio'),
-            data.get('has_private_forwards'),
-            data.get('has_restricted_voice_and_video_messages'),
-            data.get('join_to_send_messages'),
-            data.get('join_by_request'),
-            data.get('description'),
-            data.get('invite_link'),
-            message.Message.parse(data.get('pinned_message')),
-            ChatPermissions.parse(data.get('permissions')),
-            data.get('slow_mode_delay'),
-            data.get('unrestrict_boost_count'),
-            data.get('message_auto_delete_time'),
-            data.get('has_aggressive_anti_spam_enabled'),
-            data.get('has_hidden_members'),
-            data.get('has_protected_content'),
-            data.get('has_visible_history'),
-            data.get('sticker_set_name'),
-            data.get('can_set_sticker_set'),
-            data.get('custom_emoji_sticker_set_name'),
-            data.get('linked_chat_id'),
-            ChatLocation.parse(data.get('location'))
-        )
+
+        if lazy:
+            obj = cls._lazy(data, id=data['id'], type=chat_type)
+        else:
+            obj = cls._parse_fields(data, id=data['id'], type=chat_type)
+
+        if cache is not None:
+            cache.put(cls, data, obj)
+
+        return obj
@@ -4,12 +4,14 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional
 
 from . import chat_boost_source
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class ChatBoost:
     """\
@@ -29,7 +31,7 @@ class ChatBoost:
 
         return cls(
             data['boost_id'],
-            datetime.fromtimestamp(data['add_date'], tz=timezone.utc),
-            datetime.fromtimestamp(data['expiration_date'], tz=timezone.utc),
+            data['add_date'],
+            data['expiration_date'],
             chat_boost_source.ChatBoostSource.parse(data['source'])
         )
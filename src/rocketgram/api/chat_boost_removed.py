@@ -4,13 +4,15 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional
 
 from . import chat
 from . import chat_boost_source
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class ChatBoostRemoved:
     """\
@@ -31,6 +33,6 @@ class ChatBoostRemoved:
         return cls(
             chat.Chat.parse(data['chat']),
             data['boost_id'],
-            datetime.fromtimestamp(data['remove_date'], tz=timezone.utc),
+            data['remove_date'],
             chat_boost_source.ChatBoostSource.parse(data['source'])
         )
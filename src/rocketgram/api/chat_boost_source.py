@@ -8,8 +8,10 @@ from typing import Optional
 
 from . import chat_boost_source_type
 from . import user
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class ChatBoostSource:
     """\
@@ -8,8 +8,10 @@ from typing import Optional
 
 from . import chat
 from . import chat_boost
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class ChatBoostUpdated:
     """\
@@ -4,12 +4,14 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Dict, Optional
 
 from . import user
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class ChatInviteLink:
     """\
@@ -32,7 +34,7 @@ class ChatInviteLink:
         if data is None:
             return None
 
-        expire_date = datetime.fromtimestamp(data['expire_date'], tz=timezone.utc) if 'expire_date' in data else None
+        expire_date = data.get('expire_date')
 
         return cls(data['invite_link'], user.User.parse(data['creator']), data['creates_join_request'],
                    data['is_primary'], data['is_revoked'], data.get('name'), expire_date, data.get('member_limit'),
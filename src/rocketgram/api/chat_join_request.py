@@ -4,14 +4,16 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Dict, Optional
 
 from .chat import Chat
 from .chat_invite_link import ChatInviteLink
 from .user import User
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class ChatJoinRequest:
     """\
@@ -38,7 +40,7 @@ class ChatJoinRequest:
             Chat.parse(data['chat']),
             User.parse(data['from']),
             data['user_chat_id'],
-            datetime.fromtimestamp(data['date'], tz=timezone.utc),
+            data['date'],
             data.get('bio'),
             ChatInviteLink.parse(data.get('invite_link'))
         )
@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Dict, Optional
 
 from .location import Location
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class ChatLocation:
     """\
@@ -4,13 +4,15 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional
 
 from .chat_member_status_type import ChatMemberStatusType
 from .user import User
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class ChatMember:
     """\
@@ -67,7 +69,7 @@ class ChatMember:
             ChatMemberStatusType(data['status']),
             data.get('custom_title'),
             data.get('is_anonymous'),
-            datetime.fromtimestamp(data['until_date'], tz=timezone.utc) if 'until_date' in data else None,
+            data.get('until_date'),
             data.get('can_be_edited'),
             data.get('can_manage_chat'),
             data.get('can_change_info'),
@@ -4,15 +4,17 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Dict, Optional
 
 from . import chat
 from . import chat_invite_link
 from . import chat_member
 from . import user
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class ChatMemberUpdated:
     """\
@@ -39,7 +41,7 @@ class ChatMemberUpdated:
         return cls(
             chat.Chat.parse(data['chat']),
             user.User.parse(data['from']),
-            datetime.fromtimestamp(data['date'], tz=timezone.utc) if 'date' in data else None,
+            data.get('date'),
             chat_member.ChatMember.parse(data['old_chat_member']),
             chat_member.ChatMember.parse(data['new_chat_member']),
             chat_invite_link.ChatInviteLink.parse(data.get('invite_link')),
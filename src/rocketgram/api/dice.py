@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Optional
 
 from .dice_type import DiceType
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class Dice:
     """\
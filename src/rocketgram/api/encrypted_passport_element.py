@@ -8,8 +8,10 @@ from typing import Optional, List
 
 from .encrypted_passport_element_type import EncryptedPassportElementType
 from .password_file import PassportFile
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class EncryptedPassportElement:
     """\
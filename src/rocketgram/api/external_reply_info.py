@@ -28,8 +28,10 @@ from . import venue
 from . import video
 from . import video_note
 from . import voice
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class ExternalReplyInfo:
     """\
@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Optional
 
 from ..context import context
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class File:
     """\
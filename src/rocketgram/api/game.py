@@ -9,8 +9,10 @@ from typing import Optional, List
 from .animation import Animation
 from .message_entity import MessageEntity
 from .photo_size import PhotoSize
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class Game:
     """\
@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Optional
 
 from .user import User
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class GameHighScore:
     """\
@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Optional, List
 
 from . import chat
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class Giveaway:
     """\
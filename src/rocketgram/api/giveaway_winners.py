@@ -4,13 +4,15 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional, List
 
 from . import chat
 from . import user
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class GiveawayWinners:
     """\
@@ -38,7 +40,7 @@ class GiveawayWinners:
         return cls(
             chat.Chat.parse(data['chat']),
             data['giveaway_message_id'],
-            datetime.fromtimestamp(data['winners_selection_date'], tz=timezone.utc),
+            data['winners_selection_date'],
             data['winner_count'],
             [user.User.parse(u) for u in data['winners']],
             data.get('additional_chat_count'),
@@ -8,9 +8,11 @@ from typing import Optional, Dict
 
 from .login_url import LoginUrl
 from .switch_inline_query_chosen_chat import SwitchInlineQueryChosenChat
+from .utils import slotted
 from .web_app_info import WebAppInfo
 
 
+@slotted
 @dataclass(frozen=True)
 class InlineKeyboardButton:
     """\
@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Optional, Dict, List
 
 from .inline_keyboard_button import InlineKeyboardButton
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class InlineKeyboardMarkup:
     """\
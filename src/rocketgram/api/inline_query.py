@@ -9,8 +9,10 @@ from typing import Optional
 from .chat_type import ChatType
 from .location import Location
 from .user import User
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class InlineQuery:
     """\
@@ -0,0 +1,132 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class InternStats:
+    """\
+    Snapshot of the intern cache state.
+
+    size: number of cached objects
+    max_size: maximum number of cached objects
+    hits: number of parsings that returned cached object
+    misses: number of parsings that created new object
+    evictions: number of objects evicted from the cache
+    changed: number of cached objects replaced because payload changed
+    """
+
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    changed: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class InternCache:
+    """\
+    Bounded LRU cache of parsed objects.
+
+    Objects are cached by type and id. Cached object is returned only
+    when its payload is equal to the parsed one, so the same payload returns
+    the same shared immutable instance and changed payload replaces it.
+    Payloads are compared as is, without hashing, so nested lists and dicts
+    are supported. Least recently used objects are evicted when cache is full.
+
+    Cache is enabled for parsing with `interning` or by passing it to
+    `Bot(intern_cache=...)`. One cache can be shared by several bots.
+    Users and chats are interned.
+
+    max_size: maximum number of cached objects
+    """
+
+    __slots__ = ('__max_size', '__items', '__hits', '__misses', '__evictions', '__changed')
+
+    def __init__(self, max_size: int = 10000):
+        assert max_size > 0, "max_size should be positive!"
+
+        self.__max_size = max_size
+        self.__items: 'OrderedDict[Tuple[type, Hashable], Tuple[Dict, Any]]' = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__changed = 0
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    def get(self, kind: type, data: Dict) -> Optional[Any]:
+        """Returns cached object of the type parsed from equal payload or None."""
+
+        key = (kind, data['id'])
+        entry = self.__items.get(key)
+
+        if entry is None or entry[0] != data:
+            self.__misses += 1
+            return None
+
+        self.__hits += 1
+        self.__items.move_to_end(key)
+        return entry[1]
+
+    def put(self, kind: type, data: Dict, obj: Any):
+        """Caches object parsed from the payload replacing object with the same id."""
+
+        key = (kind, data['id'])
+        if self.__items.pop(key, None) is not None:
+            self.__changed += 1
+
+        self.__items[key] = (data, obj)
+
+        if len(self.__items) > self.__max_size:
+            self.__items.popitem(last=False)
+            self.__evictions += 1
+
+    def clear(self):
+        self.__items.clear()
+
+    def stats(self) -> InternStats:
+        return InternStats(len(self.__items), self.__max_size, self.__hits, self.__misses, self.__evictions,
+                           self.__changed)
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+
+_current_cache: ContextVar[Optional[InternCache]] = ContextVar('_current_cache', default=None)
+
+
+def current_intern_cache() -> Optional[InternCache]:
+    """Returns intern cache used for parsing in the current context."""
+
+    return _current_cache.get()
+
+
+@contextmanager
+def interning(cache: Optional[InternCache]) -> Iterator[Optional[InternCache]]:
+    """\
+    Uses the cache for objects parsed inside the block.
+
+    Lazily parsed objects keep the cache and use it for fields decoded later.
+    None disables interning inside the block.
+    """
+
+    token = _current_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _current_cache.reset(token)
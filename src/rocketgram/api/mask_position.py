@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Optional
 
 from .mask_position_point_type import MaskPositionPointType
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class MaskPosition:
     """\
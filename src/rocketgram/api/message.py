@@ -4,7 +4,7 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Dict, Optional, List
 
 from .animation import Animation
@@ -45,6 +45,7 @@ from .successful_payment import SuccessfulPayment
 from .text_quote import TextQuote
 from .user import User
 from .user_shared import UserShared
+from .utils import LazyParseMixin, slotted, plain, parsed, parsed_list, computed
 from .venue import Venue
 from .video import Video
 from .video_chat_ended import VideoChatEnded
@@ -57,8 +58,9 @@ from .web_app_data import WebAppData
 from .write_access_allowed import WriteAccessAllowed
 
 
+@slotted
 @dataclass(frozen=True)
-class Message:
+class Message(LazyParseMixin):
     """\
     Represents Message object:
     https://core.telegram.org/bots/api#message
@@ -68,6 +70,8 @@ class Message:
 
     Additional fields:
     type
+
+    Lazily parsed messages decode all fields except `type` on first access.
     """
 
     type: MessageType
@@ -176,305 +180,92 @@ class Message:
 
     reply_markup: Optional[InlineKeyboardMarkup]
 
+    _parsers = {
+        'message_id': plain('message_id', required=True),
+        'message_thread_id': plain('message_thread_id'),
+        'user': parsed(User, 'from'),
+        'sender_chat': parsed(Chat, 'sender_chat', lazy=True),
+        'sender_boost_count': plain('sender_boost_count'),
+        'date': plain('date', required=True),
+        'chat': parsed(Chat, 'chat', required=True, lazy=True),
+        'forward_origin': parsed(MessageOrigin, 'forward_origin'),
+        'is_topic_message': plain('is_topic_message'),
+        'is_automatic_forward': plain('is_automatic_forward'),
+        'reply_to_message': parsed('Message', 'reply_to_message', lazy=True),
+        'external_reply': parsed(ExternalReplyInfo, 'external_reply'),
+        'quote': parsed(TextQuote, 'quote'),
+        'reply_to_story': parsed(Story, 'reply_to_story'),
+        'via_bot': parsed(User, 'via_bot'),
+        'edit_date': plain('edit_date'),
+        'has_protected_content': plain('has_protected_content'),
+        'media_group_id': plain('media_group_id'),
+        'author_signature': plain('author_signature'),
+        'text': plain('text'),
+        'entities': parsed_list(MessageEntity, 'entities'),
+        'link_preview_options': parsed(LinkPreviewOptions, 'link_preview_options'),
+        'animation': parsed(Animation, 'animation'),
+        'audio': parsed(Audio, 'audio'),
+        'document': computed(lambda d: Document.parse(d.get('document')) if 'animation' not in d else None),
+        'photo': parsed_list(PhotoSize, 'photo'),
+        'sticker': parsed(Sticker, 'sticker'),
+        'story': parsed(Story, 'story'),
+        'video': parsed(Video, 'video'),
+        'video_note': parsed(VideoNote, 'video_note'),
+        'voice': parsed(Voice, 'voice'),
+        'caption': plain('caption'),
+        'caption_entities': parsed_list(MessageEntity, 'caption_entities'),
+        'has_media_spoiler': plain('has_media_spoiler'),
+        'contact': parsed(Contact, 'contact'),
+        'dice': parsed(Dice, 'dice'),
+        'game': parsed(Game, 'game'),
+        'poll': parsed(Poll, 'poll'),
+        'venue': parsed(Venue, 'venue'),
+        'location': parsed(Location, 'location'),
+        'new_chat_members': parsed_list(User, 'new_chat_members'),
+        'left_chat_member': parsed(User, 'left_chat_member'),
+        'new_chat_title': plain('new_chat_title'),
+        'new_chat_photo': parsed_list(PhotoSize, 'new_chat_photo'),
+        'delete_chat_photo': plain('delete_chat_photo'),
+        'group_chat_created': plain('group_chat_created'),
+        'supergroup_chat_created': plain('supergroup_chat_created'),
+        'channel_chat_created': plain('channel_chat_created'),
+        'message_auto_delete_timer_changed': parsed(MessageAutoDeleteTimerChanged, 'message_auto_delete_timer_changed'),
+        'migrate_to_chat_id': plain('migrate_to_chat_id'),
+        'migrate_from_chat_id': plain('migrate_from_chat_id'),
+        'pinned_message': parsed('Message', 'pinned_message', lazy=True),
+        'invoice': parsed(Invoice, 'invoice'),
+        'successful_payment': parsed(SuccessfulPayment, 'successful_payment'),
+        'user_shared': parsed(UserShared, 'user_shared'),
+        'chat_shared': parsed(ChatShared, 'chat_shared'),
+        'connected_website': plain('connected_website'),
+        'write_access_allowed': parsed(WriteAccessAllowed, 'write_access_allowed'),
+        'passport_data': parsed(PassportData, 'passport_data'),
+        'proximity_alert_triggered': parsed(ProximityAlertTriggered, 'proximity_alert_triggered'),
+        'boost_added': parsed(ChatBoostAdded, 'boost_added'),
+        'forum_topic_created': parsed(ForumTopicCreated, 'forum_topic_created'),
+        'forum_topic_edited': parsed(ForumTopicEdited, 'forum_topic_edited'),
+        'forum_topic_closed': parsed(ForumTopicClosed, 'forum_topic_closed'),
+        'forum_topic_reopened': parsed(ForumTopicReopened, 'forum_topic_reopened'),
+        'general_forum_topic_hidden': parsed(GeneralForumTopicHidden, 'general_forum_topic_hidden'),
+        'general_forum_topic_unhidden': parsed(GeneralForumTopicUnhidden, 'general_forum_topic_unhidden'),
+        'giveaway_created': parsed(GiveawayCreated, 'giveaway_created'),
+        'giveaway': parsed(Giveaway, 'giveaway'),
+        'giveaway_winners': parsed(GiveawayWinners, 'giveaway_winners'),
+        'giveaway_completed': parsed(GiveawayCompleted, 'giveaway_completed'),
+        'video_chat_scheduled': parsed(VideoChatScheduled, 'video_chat_scheduled'),
+        'video_chat_started': parsed(VideoChatStarted, 'video_chat_started'),
+        'video_chat_ended': parsed(VideoChatEnded, 'video_chat_ended'),
+        'video_chat_participants_invited': parsed(VideoChatParticipantsInvited, 'video_chat_participants_invited'),
+        'web_app_data': parsed(WebAppData, 'web_app_data'),
+        'reply_markup': parsed(InlineKeyboardMarkup, 'reply_markup'),
+    }
+
     @classmethod
-    def parse(cls, data: Optional[Dict]) -> Optional['Message']:
+    def parse(cls, data: Optional[Dict], lazy: bool = False) -> Optional['Message']:
         if data is None:
             return None
 
-        message_id = data['message_id']
-        message_thread_id = data.get('message_thread_id')
-        user = User.parse(data.get('from'))
-        sender_chat = Chat.parse(data.get('sender_chat'))
-        sender_boost_count = data.get('sender_boost_count')
-        date = datetime.fromtimestamp(data['date'], tz=timezone.utc)
-        chat = Chat.parse(data["chat"])
-        forward_origin = MessageOrigin.parse(data.get('forward_origin'))
-        is_topic_message = data.get('is_topic_message')
-        is_automatic_forward = data.get('is_automatic_forward')
-        reply_to_message = Message.parse(data.get('reply_to_message'))
-        external_reply = ExternalReplyInfo.parse(data.get('external_reply'))
-        quote = TextQuote.parse(data.get('quote'))
-        reply_to_story = Story.parse(data.get('reply_to_story'))
-        via_bot = User.parse(data.get('via_bot'))
-        edit_date = datetime.fromtimestamp(data['edit_date'], tz=timezone.utc) if 'edit_date' in data else None
-        has_protected_content = data.get('has_protected_content')
-        media_group_id = data.get('media_group_id')
-        author_signature = data.get('author_signature')
-
-        text = data.get('text')
-        entities = [MessageEntity.parse(d) for d in data['entities']] if 'entities' in data else None
-
-        link_preview_options = LinkPreviewOptions.parse(data.get('link_preview_options'))
-
-        animation = Animation.parse(data.get('animation'))
-        audio = Audio.parse(data.get('audio'))
-        document = Document.parse(data.get('document'))
-        if animation is not None:
-            document = None
-        photo = [PhotoSize.parse(d) for d in data['photo']] if 'photo' in data else None
-        sticker = Sticker.parse(data.get('sticker'))
-        story = Story.parse(data.get('story'))
-        video = Video.parse(data.get('video'))
-        video_note = VideoNote.parse(data.get('video_note'))
-        voice = Voice.parse(data.get('voice'))
-
-        caption = data.get('caption')
-        caption_entities = [MessageEntity.parse(d) for d in data['caption_entities']] \
-            if 'caption_entities' in data else None
-
-        has_media_spoiler = data.get('has_media_spoiler')
-
-        contact = Contact.parse(data.get('contact'))
-        dice = Dice.parse(data.get('dice'))
-        game = Game.parse(data.get('game'))
-        poll = Poll.parse(data.get('poll'))
-        venue = Venue.parse(data.get('venue'))
-        location = Location.parse(data.get('location'))
-
-        new_chat_members = [User.parse(d) for d in data['new_chat_members']] \
-            if 'new_chat_members' in data else None
-        left_chat_member = User.parse(data.get('left_chat_member'))
-
-        new_chat_title = data.get('new_chat_title')
-
-        new_chat_photo = [PhotoSize.parse(d) for d in data['new_chat_photo']] if 'new_chat_photo' in data else None
-        delete_chat_photo = data.get('delete_chat_photo')
-
-        group_chat_created = data.get('group_chat_created')
-        supergroup_chat_created = data.get('supergroup_chat_created')
-        channel_chat_created = data.get('channel_chat_created')
-
-        message_auto_delete_timer_changed = MessageAutoDeleteTimerChanged.parse(
-            data.get('message_auto_delete_timer_changed'))
-
-        migrate_to_chat_id = data.get('migrate_to_chat_id')
-        migrate_from_chat_id = data.get('migrate_from_chat_id')
-
-        pinned_message = Message.parse(data.get('pinned_message'))
-
-        invoice = Invoice.parse(data.get('invoice'))
-        successful_payment = SuccessfulPayment.parse(data.get('successful_payment'))
-
-        user_shared = UserShared.parse(data.get('user_shared'))
-        chat_shared = ChatShared.parse(data.get('chat_shared'))
-
-        connected_website = data.get('connected_website')
-
-        write_access_allowed = WriteAccessAllowed.parse(data.get('write_access_allowed'))
-
-        passport_data = PassportData.parse(data.get('passport_data'))
-
-        proximity_alert_triggered = ProximityAlertTriggered.parse(data.get('proximity_alert_triggered'))
-
-        boost_added = ChatBoostAdded.parse(data.get('boost_added'))
-
-        forum_topic_created = ForumTopicCreated.parse(data.get('forum_topic_created'))
-        forum_topic_edited = ForumTopicEdited.parse(data.get('forum_topic_edited'))
-        forum_topic_closed = ForumTopicClosed.parse(data.get('forum_topic_closed'))
-        forum_topic_reopened = ForumTopicReopened.parse(data.get('forum_topic_reopened'))
-
-        general_forum_topic_hidden = GeneralForumTopicHidden.parse(data.get('general_forum_topic_hidden'))
-        general_forum_topic_unhidden = GeneralForumTopicUnhidden.parse(data.get('general_forum_topic_unhidden'))
-
-        giveaway_created = GiveawayCreated.parse(data.get('giveaway_created'))
-        giveaway = Giveaway.parse(data.get('giveaway'))
-        giveaway_winners = GiveawayWinners.parse(data.get('giveaway_winners'))
-        giveaway_completed = GiveawayCompleted.parse(data.get('giveaway_completed'))
-
-        video_chat_scheduled = VideoChatScheduled.parse(data.get('video_chat_scheduled'))
-        video_chat_started = VideoChatStarted.parse(data.get('video_chat_started'))
-        video_chat_ended = VideoChatEnded.parse(data.get('video_chat_ended'))
-        video_chat_participants_invited = VideoChatParticipantsInvited.parse(
-            data.get('video_chat_participants_invited'))
-
-        web_app_data = WebAppData.parse(data.get('web_app_data'))
-
-        reply_markup = InlineKeyboardMarkup.parse(data.get('reply_markup'))
-
-        message_type = MessageType.unknown
-
-        if text:
-            message_type = MessageType.text
-        elif audio:
-            message_type = MessageType.audio
-        elif document:
-            message_type = MessageType.document
-        elif animation:
-            message_type = MessageType.animation
-        elif game:
-            message_type = MessageType.game
-        elif photo:
-            message_type = MessageType.photo
-        elif sticker:
-            message_type = MessageType.sticker
-        elif story:
-            message_type = MessageType.story
-        elif video:
-            message_type = MessageType.video
-        elif voice:
-            message_type = MessageType.voice
-        elif video_note:
-            message_type = MessageType.video_note
-        elif new_chat_members:
-            message_type = MessageType.new_chat_members
-        elif contact:
-            message_type = MessageType.contact
-        elif location:
-            message_type = MessageType.location
-        elif venue:
-            message_type = MessageType.venue
-        elif poll:
-            message_type = MessageType.poll
-        elif dice:
-            message_type = MessageType.dice
-        elif left_chat_member:
-            message_type = MessageType.left_chat_member
-        elif new_chat_title:
-            message_type = MessageType.new_chat_title
-        elif new_chat_photo:
-            message_type = MessageType.new_chat_photo
-        elif delete_chat_photo:
-            message_type = MessageType.delete_chat_photo
-        elif group_chat_created:
-            message_type = MessageType.group_chat_created
-        elif supergroup_chat_created:
-            message_type = MessageType.supergroup_chat_created
-        elif channel_chat_created:
-            message_type = MessageType.channel_chat_created
-        elif migrate_to_chat_id:
-            message_type = MessageType.migrate_to_chat_id
-        elif migrate_from_chat_id:
-            message_type = MessageType.migrate_from_chat_id
-        elif pinned_message:
-            message_type = MessageType.pinned_message
-        elif invoice:
-            message_type = MessageType.invoice
-        elif successful_payment:
-            message_type = MessageType.successful_payment
-        elif user_shared:
-            message_type = MessageType.user_shared
-        elif chat_shared:
-            message_type = MessageType.chat_shared
-        elif connected_website:
-            message_type = MessageType.connected_website
-        elif write_access_allowed:
-            message_type = MessageType.write_access_allowed
-        elif passport_data:
-            message_type = MessageType.passport_data
-        elif proximity_alert_triggered:
-            message_type = MessageType.proximity_alert_triggered
-        elif boost_added:
-            message_type = MessageType.boost_added
-        elif forum_topic_created:
-            message_type = MessageType.forum_topic_created
-        elif forum_topic_edited:
-            message_type = MessageType.forum_topic_edited
-        elif forum_topic_closed:
-            message_type = MessageType.forum_topic_closed
-        elif forum_topic_reopened:
-            message_type = MessageType.forum_topic_reopened
-        elif general_forum_topic_hidden:
-            message_type = MessageType.general_forum_topic_hidden
-        elif general_forum_topic_unhidden:
-            message_type = MessageType.general_forum_topic_unhidden
-        elif giveaway_created:
-            message_type = MessageType.giveaway_created
-        elif giveaway:
-            message_type = MessageType.giveaway
-        elif giveaway_winners:
-            message_type = MessageType.giveaway_winners
-        elif giveaway_completed:
-            message_type = MessageType.giveaway_completed
-        elif video_chat_scheduled:
-            message_type = MessageType.video_chat_scheduled
-        elif video_chat_started:
-            message_type = MessageType.video_chat_started
-        elif video_chat_ended:
-            message_type = MessageType.video_chat_ended
-        elif video_chat_participants_invited:
-            message_type = MessageType.video_chat_participants_invited
-        elif message_auto_delete_timer_changed:
-            message_type = MessageType.message_auto_delete_timer_changed
-        elif web_app_data:
-            message_type = MessageType.web_app_data
-
-        return cls(
-            message_type,
-            message_id,
-            message_thread_id,
-            user,
-            sender_chat,
-            sender_boost_count,
-            date,
-            chat,
-            forward_origin,
-            is_topic_message,
-            is_automatic_forward,
-            reply_to_message,
-            external_reply,
-            quote,
-            reply_to_story,
-            via_bot,
-            edit_date,
-            has_protected_content,
-            media_group_id,
-            author_signature,
-            text,
-            entities,
-            link_preview_options,
-            animation,
-            audio,
-            document,
-            photo,
-            sticker,
-            story,
-            video,
-            video_note,
-            voice,
-            caption,
-            caption_entities,
-            has_media_spoiler,
-            contact,
-            dice,
-            game,
-            poll,
-            venue,
-            location,
-            new_chat_members,
-            left_chat_member,
-            new_chat_title,
-            new_chat_photo,
-            delete_chat_photo,
-            group_chat_created,
-            supergroup_chat_created,
-            channel_chat_created,
-            message_auto_delete_timer_changed,
-            migrate_to_chat_id,
-            migrate_from_chat_id,
-            pinned_message,
-            invoice,
-            successful_payment,
-            user_shared,
-            chat_shared,
-            connected_website,
-            write_access_allowed,
-            passport_data,
-            proximity_alert_triggered,
-            boost_added,
-            forum_topic_created,
-            forum_topic_edited,
-            forum_topic_closed,
-            forum_topic_reopened,
-            general_forum_topic_hidden,
-            general_forum_topic_unhidden,
-            giveaway_created,
-            giveaway,
-            giveaway_winners,
-            giveaway_completed,
-            video_chat_scheduled,
-            video_chat_started,
-            video_chat_ended,
-            video_chat_participants_invited,
-            web_app_data,
-            reply_markup
-        )
+        if lazy:
+            return cls._lazy(data, type=MessageType.detect(data))
+
+        return cls._parse_fields(data, type=MessageType.detect(data))
@@ -8,8 +8,10 @@ from typing import Optional
 
 from .entity_type import EntityType
 from .user import User
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class MessageEntity:
     """\
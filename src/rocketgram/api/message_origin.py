@@ -4,14 +4,16 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Dict, Optional
 
 from . import chat
 from . import user
 from .message_origin_type import MessageOriginType
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class MessageOrigin:
     """\
@@ -41,7 +43,7 @@ class MessageOrigin:
 
         return cls(
             message_origin_type,
-            datetime.fromtimestamp(data['date'], tz=timezone.utc),
+            data['date'],
             user.User.parse(data.get('sender_user')),
             data.get('sender_user_name'),
             chat.Chat.parse(data.get('sender_chat')),
@@ -4,13 +4,15 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional, List
 
 from . import chat
 from . import reaction_count
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class MessageReactionCountUpdated:
     """\
@@ -31,6 +33,6 @@ class MessageReactionCountUpdated:
         return cls(
             chat.Chat.parse(data['chat']),
             data['message_id'],
-            datetime.fromtimestamp(data['date'], tz=timezone.utc),
+            data['date'],
             [reaction_count.ReactionCount.parse(rt) for rt in data['reactions']],
         )
@@ -4,14 +4,16 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional, List
 
 from . import chat
 from . import reaction_type
 from . import user
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class MessageReactionUpdated:
     """\
@@ -37,7 +39,7 @@ class MessageReactionUpdated:
             data['message_id'],
             user.User.parse(data.get('user')),
             chat.Chat.parse(data.get('actor_chat')),
-            datetime.fromtimestamp(data['date'], tz=timezone.utc),
+            data['date'],
             [reaction_type.ReactionType.parse(rt) for rt in data['old_reaction']],
             [reaction_type.ReactionType.parse(rt) for rt in data['new_reaction']]
         )
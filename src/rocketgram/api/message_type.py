@@ -4,6 +4,7 @@
 
 
 from enum import auto
+from typing import Dict
 
 from .utils import EnumAutoName
 
@@ -62,3 +63,75 @@ class MessageType(EnumAutoName):
     message_auto_delete_timer_changed = auto()
     web_app_data = auto()
     unknown = auto()
+
+    @classmethod
+    def detect(cls, data: Dict) -> 'MessageType':
+        """Detects the type of raw message dict without parsing it."""
+
+        found = _KEYS.intersection(data)
+
+        if not found:
+            return cls.unknown
+
+        return _TYPES[min(map(_PRIORITIES.__getitem__, found))]
+
+
+# Keys of raw message that determine its type, from the highest priority to the lowest.
+# Animation goes before document because Telegram sends both fields for animations.
+_TYPES = (
+    MessageType.text,
+    MessageType.audio,
+    MessageType.animation,
+    MessageType.document,
+    MessageType.game,
+    MessageType.photo,
+    MessageType.sticker,
+    MessageType.story,
+    MessageType.video,
+    MessageType.voice,
+    MessageType.video_note,
+    MessageType.new_chat_members,
+    MessageType.contact,
+    MessageType.location,
+    MessageType.venue,
+    MessageType.poll,
+    MessageType.dice,
+    MessageType.left_chat_member,
+    MessageType.new_chat_title,
+    MessageType.new_chat_photo,
+    MessageType.delete_chat_photo,
+    MessageType.group_chat_created,
+    MessageType.supergroup_chat_created,
+    MessageType.channel_chat_created,
+    MessageType.migrate_to_chat_id,
+    MessageType.migrate_from_chat_id,
+    MessageType.pinned_message,
+    MessageType.invoice,
+    MessageType.successful_payment,
+    MessageType.user_shared,
+    MessageType.chat_shared,
+    MessageType.connected_website,
+    MessageType.write_access_allowed,
+    MessageType.passport_data,
+    MessageType.proximity_alert_triggered,
+    MessageType.boost_added,
+    MessageType.forum_topic_created,
+    MessageType.forum_topic_edited,
+    MessageType.forum_topic_closed,
+    MessageType.forum_topic_reopened,
+    MessageType.general_forum_topic_hidden,
+    MessageType.general_forum_topic_unhidden,
+    MessageType.giveaway_created,
+    MessageType.giveaway,
+    MessageType.giveaway_winners,
+    MessageType.giveaway_completed,
+    MessageType.video_chat_scheduled,
+    MessageType.video_chat_started,
+    MessageType.video_chat_ended,
+    MessageType.video_chat_participants_invited,
+    MessageType.message_auto_delete_timer_changed,
+    MessageType.web_app_data,
+)
+
+_PRIORITIES = {t.value: i for i, t in enumerate(_TYPES)}
+_KEYS = frozenset(_PRIORITIES)
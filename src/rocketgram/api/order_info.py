@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Optional
 
 from .shipping_address import ShippingAddress
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class OrderInfo:
     """\
@@ -8,8 +8,10 @@ from typing import Optional, List
 
 from .encrypted_credentials import EncryptedCredentials
 from .encrypted_passport_element import EncryptedPassportElement
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class PassportData:
     """\
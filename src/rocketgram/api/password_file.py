@@ -4,10 +4,13 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional
 
+from .utils import slotted
 
+
+@slotted
 @dataclass(frozen=True)
 class PassportFile:
     """\
@@ -26,4 +29,4 @@ class PassportFile:
             return None
 
         return cls(data['file_id'], data['file_unique_id'], data['file_size'],
-                   datetime.fromtimestamp(data['file_date'], tz=timezone.utc))
+                   data['file_date'])
@@ -4,14 +4,16 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional, List
 
 from .message_entity import MessageEntity
 from .poll_option import PollOption
 from .poll_type import PollType
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class Poll:
     """\
@@ -41,7 +43,7 @@ class Poll:
         options = [PollOption.parse(i) for i in data['options']]
         explanation_entities = [MessageEntity.parse(d) for d in data['explanation_entities']] \
             if 'explanation_entities' in data else None
-        close_date = datetime.fromtimestamp(data['close_date'], tz=timezone.utc) if 'close_date' in data else None
+        close_date = data.get('close_date')
 
         return cls(data['id'], data['question'], options, data['total_voter_count'], data['is_closed'],
                    data['is_anonymous'], PollType(data['type']), data['allows_multiple_answers'],
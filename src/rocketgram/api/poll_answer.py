@@ -8,8 +8,10 @@ from typing import Optional, List
 
 from .chat import Chat
 from .user import User
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class PollAnswer:
     """\
@@ -8,8 +8,10 @@ from typing import Optional
 
 from .order_info import OrderInfo
 from .user import User
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class PreCheckoutQuery:
     """\
@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Optional
 
 from . import reaction_type
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class ReactionCount:
     """\
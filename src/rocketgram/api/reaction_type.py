@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Optional
 
 from .reaction_type_type import ReactionTypeType
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class ReactionType:
     """\
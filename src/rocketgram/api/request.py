@@ -3,15 +3,138 @@
 # Rocketgram is released under the MIT License (see LICENSE).
 
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields, is_dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Union, Dict, List
+from typing import Dict, List, Any, Callable, Tuple, Type, TYPE_CHECKING
 
 from .. import api
 from ..context import context
 from ..keyboards import keyboard
 
+if TYPE_CHECKING:
+    from ..json_adapters import BaseJsonAdapter
+
+_SCALARS = frozenset((str, int, float, bool))
+_RENDERERS: Dict[type, Callable[[Any], Dict]] = dict()
+_FIELDS: Dict[type, Tuple[str, ...]] = dict()
+_ENCODERS: Dict[type, Callable[[Any], bytes]] = dict()
+
+
+def _timestamp(v: Any) -> Any:
+    # Converts datetime to unix time, other values are returned as is.
+
+    return int(v.timestamp()) if isinstance(v, datetime) else v
+
+
+def _fields(cls: type) -> Tuple[str, ...]:
+    # Returns names of all fields of the dataclass.
+
+    result = _FIELDS[cls] = tuple(f.name for f in fields(cls))
+    return result
+
+
+def _render_value(v: Any) -> Any:
+    # Converts value to its wire representation.
+
+    if type(v) in _SCALARS:
+        return v
+    if isinstance(v, Enum):
+        return v.value
+    if isinstance(v, datetime):
+        return int(v.timestamp())
+    if isinstance(v, api.InputFile):
+        return f'attach://{v.file_name}'
+    if isinstance(v, keyboard.Keyboard):
+        return _render_value(v.render())
+    if isinstance(v, (list, tuple)):
+        return [_render_value(i) for i in v if i is not None]
+    if isinstance(v, dict):
+        return {k: _render_value(i) for k, i in v.items() if i is not None}
+    if is_dataclass(v):
+        return _renderer(v.__class__)(v)
+    return v
+
+
+def _renderer(cls: type) -> Callable[[Any], Dict]:
+    # Returns renderer for the dataclass. Renderer is made once per class
+    # and converts the object to the wire dict in a single pass skipping None fields.
+
+    renderer = _RENDERERS.get(cls)
+    if renderer is not None:
+        return renderer
+
+    names = _fields(cls)
+
+    def renderer(obj) -> Dict:
+        d = dict()
+        for name in names:
+            v = getattr(obj, name)
+            if v is None:
+                continue
+            d[name] = v if type(v) in _SCALARS else _render_value(v)
+        return d
+
+    _RENDERERS[cls] = renderer
+    return renderer
+
+
+_DIRTY = (list, tuple, dict, datetime)
+
+
+def _clean(v: Any) -> Any:
+    # Drops None items from lists and dicts and converts datetime values in them,
+    # like render() does. Containers that need no changes are returned as is.
+    # Dataclass items are left for the serializer.
+
+    if isinstance(v, (list, tuple)):
+        for i in v:
+            if i is None or isinstance(i, _DIRTY):
+                return [_clean(i) for i in v if i is not None]
+        return v
+    if isinstance(v, dict):
+        for i in v.values():
+            if i is None or isinstance(i, _DIRTY):
+                return {k: _clean(i) for k, i in v.items() if i is not None}
+        return v
+    return _timestamp(v)
+
+
+def _encode_default(v: Any) -> Any:
+    # Serializer hook for the direct encoding path. Dataclasses are turned into
+    # shallow dicts so nested values are handled by the serializer itself and
+    # are passed back here only if the serializer does not know them.
+
+    if isinstance(v, Enum):
+        return v.value
+    if isinstance(v, datetime):
+        return int(v.timestamp())
+    if isinstance(v, api.InputFile):
+        return f'attach://{v.file_name}'
+    if isinstance(v, keyboard.Keyboard):
+        return _clean(v.render())
+    if is_dataclass(v):
+        return _shallow(v)
+    raise TypeError(f'Object of type {v.__class__.__name__} is not JSON serializable')
+
+
+def _shallow(obj) -> Dict:
+    # Returns dict of non-None fields of the dataclass converting only datetime values
+    # and copying lists and dicts without None items. Nested dataclasses are left as is.
+
+    names = _FIELDS.get(obj.__class__)
+    if names is None:
+        names = _fields(obj.__class__)
+
+    d = dict()
+    for name in names:
+        v = getattr(obj, name)
+        if v is None:
+            continue
+        d[name] = v if type(v) in _SCALARS else _clean(v)
+
+    return d
+
 
 @dataclass(frozen=True)
 class Request:
@@ -19,29 +142,6 @@ class Request:
     Base class for all request objects.
     """
 
-    def __prepare(self, d: Union[Dict, List]) -> Union[Dict, List]:
-        assert isinstance(d, (list, dict))
-
-        for k, v in d.items() if isinstance(d, dict) else enumerate(d):
-            if isinstance(v, Enum):
-                d[k] = v.value
-                continue
-            if isinstance(v, datetime):
-                d[k] = int(v.timestamp())
-                continue
-            if isinstance(v, api.InputFile):
-                d[k] = f'attach://{v.file_name}'
-                continue
-            if isinstance(v, keyboard.Keyboard):
-                d[k] = self.__prepare(asdict(v.render()))
-                continue
-            if isinstance(v, (list, dict)):
-                d[k] = self.__prepare(v)
-
-        if isinstance(d, dict):
-            return {k: v for k, v in d.items() if v is not None}
-        return [v for v in d if v is not None]
-
     @property
     def method(self) -> str:
         return self.__class__.__name__
@@ -51,12 +151,33 @@ class Request:
 
         assert self.__class__.__name__ != 'Request'
 
-        d = asdict(self)
+        d = _renderer(self.__class__)(self)
+
+        if with_method:
+            d['method'] = self.method
+
+        return d
+
+    def encode(self, json_adapter: Type['BaseJsonAdapter'], with_method=False) -> bytes:
+        """\
+        Return utf-8 encoded json representation of this request object.
+
+        Result is the same as serialized render(). Nested objects are passed
+        to the serializer as is, so no intermediate dicts are made for them.
+        """
+
+        assert self.__class__.__name__ != 'Request'
+
+        encoder = _ENCODERS.get(json_adapter)
+        if encoder is None:
+            encoder = _ENCODERS[json_adapter] = json_adapter.encoder(_encode_default)
+
+        d = _shallow(self)
 
         if with_method:
-            d['method'] = self.__class__.__name__
+            d['method'] = self.method
 
-        return self.__prepare(d)
+        return encoder(d)
 
     def files(self) -> List['api.InputFile']:
         """Returns list of binary files that exist in request."""
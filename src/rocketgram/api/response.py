@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Optional, Any
 
 from .. import api
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class Response:
     """\
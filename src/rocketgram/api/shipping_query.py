@@ -8,8 +8,10 @@ from typing import Optional
 
 from .shipping_address import ShippingAddress
 from .user import User
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class ShippingQuery:
     """\
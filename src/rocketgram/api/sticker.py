@@ -10,8 +10,10 @@ from .file import File
 from .mask_position import MaskPosition
 from .photo_size import PhotoSize
 from .sticker_type import StickerType
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class Sticker:
     """\
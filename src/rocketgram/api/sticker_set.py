@@ -9,8 +9,10 @@ from typing import Optional, List
 from .photo_size import PhotoSize
 from .sticker import Sticker
 from .sticker_type import StickerType
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class StickerSet:
     """\
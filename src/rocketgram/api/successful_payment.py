@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Optional
 
 from .order_info import OrderInfo
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class SuccessfulPayment:
     """\
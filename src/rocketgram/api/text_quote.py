@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Optional, List
 
 from . import message_entity
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class TextQuote:
     """\
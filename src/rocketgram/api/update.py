@@ -21,10 +21,12 @@ from .poll_answer import PollAnswer
 from .pre_checkout_query import PreCheckoutQuery
 from .shipping_query import ShippingQuery
 from .update_type import UpdateType
+from .utils import LazyParseMixin, slotted, parsed
 
 
+@slotted
 @dataclass(frozen=True)
-class Update:
+class Update(LazyParseMixin):
     """\
     Represents Update object:
     https://core.telegram.org/bots/api#update
@@ -32,6 +34,8 @@ class Update:
     Additional fields:
     raw
     type
+
+    Lazily parsed updates decode all fields except `raw`, `update_id` and `type` on first access.
     """
 
     raw: Dict
@@ -56,85 +60,32 @@ class Update:
     chat_boost: Optional[ChatBoostUpdated]
     removed_chat_boost: Optional[ChatBoostRemoved]
 
+    _parsers = {
+        'message': parsed(Message, 'message', lazy=True),
+        'edited_message': parsed(Message, 'edited_message', lazy=True),
+        'channel_post': parsed(Message, 'channel_post', lazy=True),
+        'edited_channel_post': parsed(Message, 'edited_channel_post', lazy=True),
+        'message_reaction': parsed(MessageReactionUpdated, 'message_reaction'),
+        'message_reaction_count': parsed(MessageReactionCountUpdated, 'message_reaction_count'),
+        'inline_query': parsed(InlineQuery, 'inline_query'),
+        'chosen_inline_result': parsed(ChosenInlineResult, 'chosen_inline_result'),
+        'callback_query': parsed(CallbackQuery, 'callback_query'),
+        'shipping_query': parsed(ShippingQuery, 'shipping_query'),
+        'pre_checkout_query': parsed(PreCheckoutQuery, 'pre_checkout_query'),
+        'poll': parsed(Poll, 'poll'),
+        'poll_answer': parsed(PollAnswer, 'poll_answer'),
+        'my_chat_member': parsed(ChatMemberUpdated, 'my_chat_member'),
+        'chat_member': parsed(ChatMemberUpdated, 'chat_member'),
+        'chat_join_request': parsed(ChatJoinRequest, 'chat_join_request'),
+        'chat_boost': parsed(ChatBoostUpdated, 'chat_boost'),
+        'removed_chat_boost': parsed(ChatBoostRemoved, 'removed_chat_boost'),
+    }
+
     @classmethod
-    def parse(cls, data: Dict) -> 'Update':
-        message = Message.parse(data.get('message'))
-        edited_message = Message.parse(data.get('edited_message'))
-        channel_post = Message.parse(data.get('channel_post'))
-        edited_channel_post = Message.parse(data.get('edited_channel_post'))
-        message_reaction = MessageReactionUpdated.parse(data.get('message_reaction'))
-        message_reaction_count = MessageReactionCountUpdated.parse(data.get('message_reaction_count'))
-        inline_query = InlineQuery.parse(data.get('inline_query'))
-        chosen_inline_result = ChosenInlineResult.parse(data.get('chosen_inline_result'))
-        callback_query = CallbackQuery.parse(data.get('callback_query'))
-        shipping_query = ShippingQuery.parse(data.get('shipping_query'))
-        pre_checkout_query = PreCheckoutQuery.parse(data.get('pre_checkout_query'))
-        poll = Poll.parse(data.get('poll'))
-        poll_answer = PollAnswer.parse(data.get('poll_answer'))
-        my_chat_member = ChatMemberUpdated.parse(data.get('my_chat_member'))
-        chat_member = ChatMemberUpdated.parse(data.get('chat_member'))
-        chat_join_request = ChatJoinRequest.parse(data.get('chat_join_request'))
-        chat_boost = ChatBoostUpdated.parse(data.get('chat_boost'))
-        removed_chat_boost = ChatBoostRemoved.parse(data.get('removed_chat_boost'))
+    def parse(cls, data: Dict, lazy: bool = False) -> 'Update':
+        update_type = UpdateType.detect(data)
 
-        update_type = UpdateType.unknown
-        if message:
-            update_type = UpdateType.message
-        elif edited_message:
-            update_type = UpdateType.edited_message
-        elif channel_post:
-            update_type = UpdateType.channel_post
-        elif edited_channel_post:
-            update_type = UpdateType.edited_channel_post
-        elif message_reaction:
-            update_type = UpdateType.message_reaction
-        elif message_reaction_count:
-            update_type = UpdateType.message_reaction_count
-        elif inline_query:
-            update_type = UpdateType.inline_query
-        elif chosen_inline_result:
-            update_type = UpdateType.chosen_inline_result
-        elif callback_query:
-            update_type = UpdateType.callback_query
-        elif shipping_query:
-            update_type = UpdateType.shipping_query
-        elif pre_checkout_query:
-            update_type = UpdateType.pre_checkout_query
-        elif poll:
-            update_type = UpdateType.poll
-        elif poll_answer:
-            update_type = UpdateType.poll_answer
-        elif my_chat_member:
-            update_type = UpdateType.my_chat_member
-        elif chat_member:
-            update_type = UpdateType.chat_member
-        elif chat_join_request:
-            update_type = UpdateType.chat_join_request
-        elif chat_boost:
-            update_type = UpdateType.chat_boost
-        elif removed_chat_boost:
-            update_type = UpdateType.removed_chat_boost
+        if lazy:
+            return cls._lazy(data, raw=data, update_id=data['update_id'], type=update_type)
 
-        return cls(
-            data,
-            data['update_id'],
-            update_type,
-            message,
-            edited_message,
-            channel_post,
-            edited_channel_post,
-            message_reaction,
-            message_reaction_count,
-            inline_query,
-            chosen_inline_result,
-            callback_query,
-            shipping_query,
-            pre_checkout_query,
-            poll,
-            poll_answer,
-            my_chat_member,
-            chat_member,
-            chat_join_request,
-            chat_boost,
-            removed_chat_boost
-        )
+        return cls._parse_fields(data, raw=data, update_id=data['update_id'], type=update_type)
@@ -4,6 +4,7 @@
 
 
 from enum import auto
+from typing import Dict
 
 from .utils import EnumAutoName
 
@@ -28,3 +29,21 @@ class UpdateType(EnumAutoName):
     chat_boost = auto()
     removed_chat_boost = auto()
     unknown = auto()
+
+    @classmethod
+    def detect(cls, data: Dict) -> 'UpdateType':
+        """Detects the type of raw update dict without parsing it."""
+
+        found = _KEYS.intersection(data)
+
+        if not found:
+            return cls.unknown
+
+        return _TYPES[min(map(_PRIORITIES.__getitem__, found))]
+
+
+# Keys of raw update that determine its type, from the highest priority to the lowest.
+_TYPES = tuple(t for t in UpdateType if t is not UpdateType.unknown)
+
+_PRIORITIES = {t.value: i for i, t in enumerate(_TYPES)}
+_KEYS = frozenset(_PRIORITIES)
@@ -6,12 +6,18 @@
 from dataclasses import dataclass
 from typing import Dict, Optional
 
+from .intern import current_intern_cache
+from .utils import slotted
 
+
+@slotted
 @dataclass(frozen=True)
 class User:
     """\
     Represents User object:
     https://core.telegram.org/bots/api#user
+
+    Repeated users are shared instances when parsed with InternCache, see `interning`.
     """
 
     id: int
@@ -31,7 +37,18 @@ class User:
         if data is None:
             return None
 
-        return cls(data['id'], data['is_bot'], data['first_name'], data.get('last_name'), data.get('username'),
-                   data.get('language_code'), data.get('is_premium'), data.get('added_to_attachment_menu'),
-                   data.get('can_join_groups'), data.get('can_read_all_group_messages'),
-                   data.get('supports_inline_queries'))
+        cache = current_intern_cache()
+        if cache is not None:
+            obj = cache.get(cls, data)
+            if obj is not None:
+                return obj
+
+        obj = cls(data['id'], data['is_bot'], data['first_name'], data.get('last_name'), data.get('username'),
+                  data.get('language_code'), data.get('is_premium'), data.get('added_to_attachment_menu'),
+                  data.get('can_join_groups'), data.get('can_read_all_group_messages'),
+                  data.get('supports_inline_queries'))
+
+        if cache is not None:
+            cache.put(cls, data, obj)
+
+        return obj
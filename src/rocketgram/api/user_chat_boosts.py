@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Dict, Optional, List
 
 from . import chat_boost
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class UserChatBoosts:
     """\
@@ -3,12 +3,17 @@
 # Rocketgram is released under the MIT License (see LICENSE).
 
 
+import sys
+from dataclasses import fields, MISSING, FrozenInstanceError
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Union
+from functools import lru_cache
+from typing import Union, Dict, Callable, Any, ClassVar, Tuple
 
 from .. import api
 from .. import keyboards  # noqa
 from ..context import context
+from .intern import current_intern_cache, interning
 
 
 class EnumAutoName(Enum):
@@ -18,6 +23,351 @@ class EnumAutoName(Enum):
         return self
 
 
+@lru_cache(maxsize=4096)
+def utc_datetime(timestamp: int) -> datetime:
+    """\
+    Converts unix time to aware datetime.
+
+    Results are cached because updates received at the same time have equal dates.
+    """
+
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+class _TimestampField:
+    # Descriptor of datetime field. Raw unix time is kept in the slot
+    # and converted to datetime on first access. Converted value replaces
+    # the raw one, so conversion is done once.
+
+    __slots__ = ('slot',)
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+
+        # raises AttributeError for not decoded field of lazily parsed object
+        value = self.slot.__get__(obj, owner)
+        if type(value) is int:
+            value = utc_datetime(value)
+            self.slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj, value):
+        self.slot.__set__(obj, value)
+
+    def __delete__(self, obj):
+        self.slot.__delete__(obj)
+
+
+def _is_datetime(tp) -> bool:
+    return tp is datetime or datetime in getattr(tp, '__args__', ())
+
+
+def _slot_name(cls, name: str) -> str:
+    # Datetime fields are stored in private slots behind _TimestampField.
+
+    f = cls.__dataclass_fields__[name]
+    return f'_{name}_ts' if _is_datetime(f.type) else name
+
+
+def _all_slots(cls) -> Tuple[str, ...]:
+    # Returns names of all slots of the class including inherited ones.
+
+    names = list()
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get('__slots__', ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    return tuple(names)
+
+
+def _frozen_setattr(self, name: str, value: Any):
+    raise FrozenInstanceError(f'cannot assign to field {name!r}')
+
+
+def _frozen_delattr(self, name: str):
+    raise FrozenInstanceError(f'cannot delete field {name!r}')
+
+
+def _rebind_class_cell(namespace: Dict[str, Any], old, new):
+    # Methods that use zero-argument super() or __class__ refer to the class
+    # through closure cell, it should point to the recreated class.
+
+    for value in namespace.values():
+        if isinstance(value, (classmethod, staticmethod)):
+            value = value.__func__
+        elif isinstance(value, property):
+            value = value.fget
+
+        closure = getattr(value, '__closure__', None)
+        if not closure:
+            continue
+
+        for name, cell in zip(value.__code__.co_freevars, closure):
+            if name == '__class__' and cell.cell_contents is old:
+                cell.cell_contents = new
+
+
+# Slots that are not part of the state: weak references and intern cache of lazily parsed objects.
+_UNPICKLED_SLOTS = ('__weakref__', '_lazy_intern')
+
+
+def _getstate(self) -> Dict[str, Any]:
+    state = dict()
+    for name in self.__class__._slots_all:
+        try:
+            state[name] = object.__getattribute__(self, name)
+        except AttributeError:
+            # not decoded field of lazily parsed object
+            pass
+    return state
+
+
+def _setstate(self, state: Dict[str, Any]):
+    for name, value in state.items():
+        object.__setattr__(self, name, value)
+
+
+def _make_init(cls):
+    # Generates __init__ that fills slots through their descriptors
+    # skipping frozen __setattr__ that is called by dataclass's one.
+
+    args = list()
+    body = list()
+    scope: Dict[str, Any] = {'MISSING': MISSING}
+
+    for f in fields(cls):
+        if not f.init:
+            continue
+
+        setter = f'_set_{f.name}'
+        scope[setter] = cls.__dict__[_slot_name(cls, f.name)].__set__
+
+        if f.default is not MISSING:
+            scope[f'_default_{f.name}'] = f.default
+            args.append(f'{f.name}=_default_{f.name}')
+        elif f.default_factory is not MISSING:
+            scope[f'_factory_{f.name}'] = f.default_factory
+            args.append(f'{f.name}=MISSING')
+            body.append(f'    if {f.name} is MISSING: {f.name} = _factory_{f.name}()')
+        else:
+            args.append(f.name)
+
+        body.append(f'    {setter}(self, {f.name})')
+
+    if hasattr(cls, '__post_init__'):
+        body.append('    self.__post_init__()')
+
+    source = f"def __init__(self, {', '.join(args)}):\n" + ('\n'.join(body) or '    pass') + '\n'
+    exec(source, scope)  # noqa
+
+    init = scope['__init__']
+    init.__qualname__ = f'{cls.__qualname__}.__init__'
+    return init
+
+
+class _FieldParser:
+    # Parser of one field given as python expression of raw data `d` and `lazy` flag.
+    # Objects used by the expression are referred as `{name}` and bound from `scope`,
+    # other names are looked up in the module of the parsed class.
+
+    __slots__ = ('expr', 'scope')
+
+    def __init__(self, expr: str, scope: Dict[str, Any]):
+        self.expr = expr
+        self.scope = scope
+
+
+def _ref(tp: Union[type, str]) -> Tuple[str, Dict[str, Any]]:
+    # Strings are names in the module of the parsed class,
+    # they are used for classes that are not defined yet, e.g. for the class itself.
+
+    if isinstance(tp, str):
+        return tp, dict()
+    return '{tp}', {'tp': tp}
+
+
+def _item(key: str, required: bool) -> str:
+    return f'd[{key!r}]' if required else f'd.get({key!r})'
+
+
+def plain(key: str, required: bool = False) -> _FieldParser:
+    """Field parser that takes value of the key as is."""
+
+    return _FieldParser(_item(key, required), dict())
+
+
+def parsed(tp: Union[type, str], key: str, required: bool = False, lazy: bool = False) -> _FieldParser:
+    """\
+    Field parser that parses value of the key with `tp.parse`.
+
+    lazy: value is parsed lazily in lazily parsed objects, `tp` should support lazy parsing
+    """
+
+    name, scope = _ref(tp)
+    return _FieldParser(f"{name}.parse({_item(key, required)}{', lazy' if lazy else ''})", scope)
+
+
+def parsed_list(tp: Union[type, str], key: str) -> _FieldParser:
+    """Field parser that parses every item of the list with `tp.parse`."""
+
+    name, scope = _ref(tp)
+    return _FieldParser(f'[{name}.parse(v) for v in d[{key!r}]] if {key!r} in d else None', scope)
+
+
+def computed(func: Callable[[Dict], Any]) -> _FieldParser:
+    """Field parser that computes value from raw data with the function."""
+
+    return _FieldParser('{func}(d)', {'func': func})
+
+
+def _compile_parsers(cls) -> Tuple[Callable, Dict[str, Callable[[Dict], Any]]]:
+    # Compiles `_parsers` of the class into function that parses all fields at once
+    # and into decoders of lazily parsed fields, so both ways share the same parsers.
+    # Fields without parser are passed to the function as keyword arguments.
+
+    parsers: Dict[str, _FieldParser] = cls._parsers
+    names = [f.name for f in fields(cls)]
+    assert set(parsers) <= set(names), "Parsers should be given for fields only!"
+
+    bound: Dict[str, Any] = dict()
+    exprs: Dict[str, str] = dict()
+
+    for index, name in enumerate(names):
+        parser = parsers.get(name)
+        if parser is None:
+            continue
+
+        refs = {ref: f'_{ref}_{index}' for ref in parser.scope}
+        bound.update((refs[ref], obj) for ref, obj in parser.scope.items())
+        exprs[name] = parser.expr.format(**refs)
+
+    args = ''.join(f'{name}, ' for name in names if name not in exprs)
+    values = ', '.join(exprs.get(name, name) for name in names)
+
+    source = [f"def _make({', '.join(bound)}):",
+              f'    def _parse_fields(cls, d, {args}lazy=False):',
+              f'        return cls({values})']
+    for name, expr in exprs.items():
+        source.append(f'    def _decode_{name}(d, lazy=True):')
+        source.append(f'        return {expr}')
+    source.append(f"    return _parse_fields, {{{', '.join(f'{n!r}: _decode_{n}' for n in exprs)}}}")
+
+    # functions use globals of the module, so names of classes are resolved when fields are parsed
+    scope: Dict[str, Any] = dict()
+    exec('\n'.join(source) + '\n', sys.modules[cls.__module__].__dict__, scope)  # noqa
+    return scope['_make'](**bound)
+
+
+def slotted(cls):
+    """\
+    Turns frozen dataclass into class with `__slots__`.
+
+    Instances of slotted class have no `__dict__`, so they take less memory,
+    and are constructed without calling frozen `__setattr__` for every field.
+    Datetime fields also accept unix time that is converted to datetime on first access.
+    Instances support weak references. Should be applied on top of `@dataclass(frozen=True)`.
+    """
+
+    names = tuple(_slot_name(cls, f.name) for f in fields(cls))
+    inherited = set(_all_slots(cls))
+
+    # instances can be weakly referenced like dataclasses without slots
+    if '__weakref__' not in inherited:
+        names += ('__weakref__',)
+
+    namespace = dict(cls.__dict__)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    for f in fields(cls):
+        # defaults are kept in dataclass fields, class attributes conflict with slots
+        namespace.pop(f.name, None)
+    namespace['__slots__'] = tuple(n for n in names if n not in inherited)
+
+    if cls.__dataclass_params__.frozen:
+        # methods made by dataclass refer to the original class
+        namespace['__setattr__'] = _frozen_setattr
+        namespace['__delattr__'] = _frozen_delattr
+
+    old, cls = cls, type(cls)(cls.__name__, cls.__bases__, namespace)
+    _rebind_class_cell(namespace, old, cls)
+
+    for f in fields(cls):
+        if _is_datetime(f.type):
+            setattr(cls, f.name, _TimestampField(cls.__dict__[_slot_name(cls, f.name)]))
+
+    if '_parsers' in namespace:
+        parse_fields, decoders = _compile_parsers(cls)
+        cls._parse_fields = classmethod(parse_fields)
+        cls._lazy_fields = decoders
+
+    cls._slots_all = tuple(n for n in _all_slots(cls) if n not in _UNPICKLED_SLOTS)
+    cls.__init__ = _make_init(cls)
+    cls.__getstate__ = _getstate
+    cls.__setstate__ = _setstate
+
+    return cls
+
+
+class LazyParseMixin:
+    """\
+    Mixin for api objects that can be parsed lazily.
+
+    Fields are described once by parsers in `_parsers`, see `plain`, `parsed`,
+    `parsed_list` and `computed`. For slotted class they are compiled into
+    `_parse_fields` that parses all fields at once and into `_lazy_fields`
+    that decode fields of lazily parsed object.
+
+    A lazily parsed object keeps the raw data and decodes fields on first access.
+    Decoded values are cached in the object.
+    Intern cache used for parsing is kept too and used for decoded fields.
+    """
+
+    __slots__ = ('_lazy_data', '_lazy_intern')
+
+    _parsers: ClassVar[Dict[str, _FieldParser]] = dict()
+    _lazy_fields: ClassVar[Dict[str, Callable[[Dict], Any]]] = dict()
+
+    @classmethod
+    def _lazy(cls, data: Dict, **fields):
+        obj = object.__new__(cls)
+        for name, value in fields.items():
+            object.__setattr__(obj, name, value)
+        object.__setattr__(obj, '_lazy_data', data)
+        object.__setattr__(obj, '_lazy_intern', current_intern_cache())
+        return obj
+
+    def __getattr__(self, name: str):
+        # called only for slots that are not filled yet
+
+        decoder = self._lazy_fields.get(name)
+        if decoder is None:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+
+        try:
+            data = object.__getattribute__(self, '_lazy_data')
+        except AttributeError:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'") from None
+
+        try:
+            cache = object.__getattribute__(self, '_lazy_intern')
+        except AttributeError:
+            # unpickled object
+            cache = None
+
+        if cache is None:
+            value = decoder(data)
+        else:
+            with interning(cache):
+                value = decoder(data)
+
+        object.__setattr__(self, name, value)
+        # datetime fields are converted by their descriptors
+        return object.__getattribute__(self, name)
+
+
 class BoolResultMixin:
     """Mixin for request classes that returns bool"""
 
@@ -7,8 +7,10 @@ from dataclasses import dataclass
 from typing import Dict, Optional, List
 
 from . import user
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class VideoChatParticipantsInvited:
     """\
@@ -4,10 +4,13 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional
 
+from .utils import slotted
 
+
+@slotted
 @dataclass(frozen=True)
 class VideoChatScheduled:
     """\
@@ -22,6 +25,6 @@ class VideoChatScheduled:
         if data is None:
             return None
 
-        start_date = datetime.fromtimestamp(data['start_date'], tz=timezone.utc) if 'start_date' in data else None
+        start_date = data.get('start_date')
 
         return cls(start_date)
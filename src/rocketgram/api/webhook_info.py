@@ -4,12 +4,14 @@
 
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Dict, Optional, List
 
 from .update_type import UpdateType
+from .utils import slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class WebhookInfo:
     """\
@@ -32,10 +34,8 @@ class WebhookInfo:
         if data is None:
             return None
 
-        last_error_date = datetime.fromtimestamp(data['last_error_date'], tz=timezone.utc) \
-            if 'last_error_date' in data else None
-        l_s_e_d = data.get('last_synchronization_error_date')
-        last_synchronization_error_date = datetime.fromtimestamp(l_s_e_d, tz=timezone.utc) if l_s_e_d else None
+        last_error_date = data.get('last_error_date')
+        last_synchronization_error_date = data.get('last_synchronization_error_date') or None
         allowed_updates = [UpdateType(m) for m in data['allowed_updates']] if 'allowed_updates' in data else None
 
         return cls(
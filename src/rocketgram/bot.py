@@ -10,7 +10,8 @@ from inspect import isawaitable
 from typing import List, Optional
 
 from . import executors, routers, connectors, middlewares
-from .api import Request, Response, Update
+from .api import InternCache, Request, Response, Update
+from .connectors.priority import request_priority
 from .context import context
 from .errors import RocketgramRequestError
 from .errors import RocketgramStopRequest
@@ -21,17 +22,24 @@ logger_raw_out = logging.getLogger('rocketgram.raw.out')
 
 
 class Bot:
-    __slots__ = ('__token', '__name', '__user_id', '__middlewares', '__router', '__own_connector', '__connector')
+    __slots__ = ('__token', '__name', '__user_id', '__middlewares', '__router', '__own_connector', '__connector',
+                 '__lazy_parsing', '__intern_cache')
 
     def __init__(self, token: str, *, connector: Optional['connectors.Connector'] = None,
-                 router: Optional['routers.Router'] = None):
+                 router: Optional['routers.Router'] = None, lazy_parsing: bool = False,
+                 intern_cache: Optional[InternCache] = None):
         """
 
         :param token: Bot's token
-        :param connector: Connector object. If not specified, Bot will try AioHttpConnector
+        :param connector: Connector object. If not specified, Bot will try AioHttpConnector.
+                          Shared connector (see SharedConnector) is initialized and released by each bot
         :param router: Router object. If not specified, Bot will try Dispatcher
+        :param lazy_parsing: Parse incoming updates lazily, decoding fields on first access
+        :param intern_cache: Share instances of repeated users and chats of incoming updates through this cache
         """
         self.__token = token
+        self.__lazy_parsing = lazy_parsing
+        self.__intern_cache = intern_cache
 
         self.__name = None
         self.__user_id = int(self.__token.split(':')[0])
@@ -79,6 +87,18 @@ class Bot:
 
         return self.__user_id
 
+    @property
+    def lazy_parsing(self) -> bool:
+        """Whether incoming updates for this bot are parsed lazily."""
+
+        return self.__lazy_parsing
+
+    @property
+    def intern_cache(self) -> Optional[InternCache]:
+        """Cache used to intern objects of incoming updates for this bot."""
+
+        return self.__intern_cache
+
     @property
     def router(self) -> 'routers.Router':
         """Bot's router."""
@@ -107,7 +127,7 @@ class Bot:
         context.bot = self
         context.executor = executor
 
-        if self.__own_connector:
+        if self.__own_connector or self.__connector.SHARED:
             await self.connector.init()
 
         await self.router.init()
@@ -136,7 +156,7 @@ class Bot:
             if isawaitable(m):
                 await m
 
-        if self.__own_connector:
+        if self.__own_connector or self.__connector.SHARED:
             await self.connector.shutdown()
 
     async def process(self, executor: Optional['executors.Executor'], update: Update) -> Optional[Request]:
@@ -188,14 +208,26 @@ class Bot:
 
             logger.exception('Got exception during processing request:')
 
-    async def send(self, request: Request) -> Response:
+    async def send(self, request: Request, *, priority: Optional['connectors.RequestPriority'] = None) -> Response:
+        """\
+        Sends request to the telegram.
+
+        :param request: Request object
+        :param priority: Priority class of the request. Used by connectors that schedule requests,
+                         if not specified priority set by `request_priority` is used or connector decides itself
+        """
+
         try:
             for mw in self.__middlewares:
                 request = mw.before_request(request)
                 if isawaitable(request):
                     request = await request
 
-            response = await self.__connector.send(self.token, request)
+            if priority is None:
+                response = await self.__connector.send(self.token, request)
+            else:
+                with request_priority(priority):
+                    response = await self.__connector.send(self.token, request)
 
             for mw in reversed(self.__middlewares):
                 response = mw.after_request(request, response)
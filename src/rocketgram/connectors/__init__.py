@@ -6,6 +6,9 @@
 from contextlib import suppress
 
 with suppress(ImportError):
-    from .aiohttp import AioHttpConnector
+    from .aiohttp import AioHttpConnector, PoolStats
 
 from .connector import Connector
+from .priority import RequestPriority, current_priority, request_priority
+from .shared import SharedConnector, SharedStats, TokenStats
+from .throttled import ThrottledConnector, ThrottleStats
@@ -5,8 +5,9 @@
 
 import asyncio
 import logging
+from dataclasses import dataclass
 from json import JSONDecodeError
-from typing import Type
+from typing import Type, Optional
 
 import aiohttp
 
@@ -18,30 +19,135 @@ from ..json_adapters import BaseJsonAdapter, default_json_adapter
 logger = logging.getLogger('rocketgram.connectors.aiohttp')
 
 
+@dataclass(frozen=True)
+class PoolStats:
+    """\
+    Snapshot of the connection pool state.
+
+    in_flight: requests currently sent by the connector
+    in_use: requests holding or opening a connection
+    waiters: requests waiting for a free connection
+    created: total number of connections opened
+    reused: total number of requests served by keep-alive connections
+    """
+
+    limit: int
+    limit_per_host: int
+    in_flight: int
+    in_use: int
+    waiters: int
+    created: int
+    reused: int
+
+
+class _RequestTrace:
+    __slots__ = ('queued',)
+
+    def __init__(self):
+        self.queued = False
+
+
 class AioHttpConnector(Connector):
-    __slots__ = ('_api_url', '_api_file_url', '_session', '_timeout', '_dumps', '_loads')
+    """\
+    Connector based on aiohttp client.
+
+    Connection pool can be tuned:
+
+    limit: total number of simultaneous connections, 0 means unlimited
+    limit_per_host: number of simultaneous connections to one host, 0 means unlimited
+    keepalive_timeout: seconds to keep idle connection open, None means aiohttp default
+    use_dns_cache: cache resolved addresses
+    ttl_dns_cache: seconds to cache resolved addresses, None means forever
+
+    TCP_NODELAY is always enabled by aiohttp for its connections.
+    HTTP pipelining is not supported by aiohttp, requests are spread over pooled connections instead.
+
+    direct_encoding: encode requests with `Request.encode` instead of render() and dumps,
+                     gives the same body faster with the standard json adapter,
+                     makes no difference with orjson, see tools/benchmarks/encoding.py
+    """
+
+    __slots__ = ('_api_url', '_api_file_url', '_session', '_pool', '_pool_args', '_timeout', '_dumps', '_json_adapter',
+                 '_loads', '_direct_encoding', '_trace', '_in_flight', '_waiters', '_created', '_reused')
 
     def __init__(self, *, timeout: int = 35, api_url: str = Connector.API_URL,
                  api_file_url: str = Connector.API_FILE_URL,
-                 json_adapter: Type[BaseJsonAdapter] = default_json_adapter()):
+                 json_adapter: Type[BaseJsonAdapter] = default_json_adapter(),
+                 limit: int = 100, limit_per_host: int = 0, keepalive_timeout: Optional[float] = None,
+                 use_dns_cache: bool = True, ttl_dns_cache: Optional[int] = 10, direct_encoding: bool = False):
         super().__init__(timeout=timeout, api_url=api_url, api_file_url=api_file_url, json_adapter=json_adapter)
-        self._session = aiohttp.ClientSession(loop=asyncio.get_event_loop())
+
+        self._direct_encoding = direct_encoding
+
+        # Pool state is tracked with public aiohttp tracing signals instead of connector internals.
+        self._trace = aiohttp.TraceConfig()
+        self._trace.on_connection_queued_start.append(self._on_queued_start)
+        self._trace.on_connection_queued_end.append(self._on_queued_end)
+        self._trace.on_connection_create_end.append(self._on_create_end)
+        self._trace.on_connection_reuseconn.append(self._on_reuseconn)
+
+        self._in_flight = 0
+        self._waiters = 0
+        self._created = 0
+        self._reused = 0
+
+        self._pool_args = dict(limit=limit, limit_per_host=limit_per_host, use_dns_cache=use_dns_cache,
+                               ttl_dns_cache=ttl_dns_cache)
+        if keepalive_timeout is not None:
+            self._pool_args['keepalive_timeout'] = keepalive_timeout
+
+        self._open(asyncio.get_event_loop())
+
+    def _open(self, loop: asyncio.AbstractEventLoop):
+        self._pool = aiohttp.TCPConnector(**self._pool_args, loop=loop)
+        self._session = aiohttp.ClientSession(connector=self._pool, trace_configs=[self._trace], loop=loop)
+
+    def stats(self) -> PoolStats:
+        """Returns current state of the connection pool."""
+
+        return PoolStats(
+            limit=self._pool.limit,
+            limit_per_host=self._pool.limit_per_host,
+            in_flight=self._in_flight,
+            in_use=self._in_flight - self._waiters,
+            waiters=self._waiters,
+            created=self._created,
+            reused=self._reused,
+        )
+
+    async def _on_queued_start(self, session, ctx, params):
+        ctx.trace_request_ctx.queued = True
+        self._waiters += 1
+
+    async def _on_queued_end(self, session, ctx, params):
+        ctx.trace_request_ctx.queued = False
+        self._waiters -= 1
+
+    async def _on_create_end(self, session, ctx, params):
+        self._created += 1
+
+    async def _on_reuseconn(self, session, ctx, params):
+        self._reused += 1
 
     async def init(self):
-        pass
+        # connector can be initialized again after shutdown
+        if self._session.closed:
+            self._open(asyncio.get_running_loop())
 
     async def shutdown(self):
         await self._session.close()
 
     async def send(self, token: str, request: Request) -> Response:
+        trace = _RequestTrace()
+        self._in_flight += 1
+
         try:
             url = self._api_url % token + request.method
 
-            request_data = request.render()
-
             files = request.files()
 
             if len(files):
+                request_data = request.render()
                 data = aiohttp.FormData(quote_fields=False)
                 for name, field in request_data.items():
                     if isinstance(field, (dict, list, tuple)):
@@ -52,10 +158,16 @@ class AioHttpConnector(Connector):
                 for file in files:
                     data.add_field(file.file_name, file.data, filename=file.file_name, content_type=file.content_type)
 
-                response = await self._session.post(url, data=data, timeout=self._timeout)
+                response = await self._session.post(url, data=data, timeout=self._timeout, trace_request_ctx=trace)
             else:
-                response = await self._session.post(url, data=self._dumps(request_data), headers=self.HEADERS,
-                                                    timeout=self._timeout)
+                if self._direct_encoding:
+                    body = request.encode(self._json_adapter)
+                else:
+                    body = self._dumps(request.render())
+                    if isinstance(body, str):
+                        body = body.encode()
+                response = await self._session.post(url, data=body, headers=self.HEADERS, timeout=self._timeout,
+                                                    trace_request_ctx=trace)
 
             return Response.parse(self._loads(await response.read()), request)
         except JSONDecodeError as error:
@@ -66,3 +178,8 @@ class AioHttpConnector(Connector):
             raise RocketgramNetworkTimeoutError(error)
         except Exception as error:
             raise RocketgramNetworkError(error) from error
+        finally:
+            # aiohttp does not signal the end of waiting when waiting request is cancelled
+            if trace.queued:
+                self._waiters -= 1
+            self._in_flight -= 1
@@ -19,12 +19,16 @@ class Connector:
     API_URL = "https://api.telegram.org/bot%s/"
     API_FILE_URL = "https://api.telegram.org/file/bot%s/%s"
 
+    # Shared connectors are initialized and shut down by every bot that uses them.
+    SHARED = False
+
     def __init__(self, *, timeout: int = 35, api_url: str = API_URL, api_file_url: str = API_FILE_URL,
                  json_adapter: Type[BaseJsonAdapter] = default_json_adapter()):
         self._api_file_url = api_file_url
         self._api_url = api_url
         self._timeout = timeout
         self._dumps = json_adapter.dumps
+        self._json_adapter = json_adapter
         self._loads = json_adapter.loads
 
     async def init(self):
@@ -0,0 +1,48 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Iterator, Optional
+
+
+class RequestPriority(IntEnum):
+    """\
+    Priority class of outgoing request. Lower value is served first.
+
+    high: answers to callback and inline queries, user is waiting for them
+    interactive: replies made while processing an update
+    bulk: broadcasts and other background requests
+    """
+
+    high = 0
+    interactive = 1
+    bulk = 2
+
+
+_current_priority: ContextVar[Optional[RequestPriority]] = ContextVar('current_priority', default=None)
+
+
+def current_priority() -> Optional[RequestPriority]:
+    """Returns priority explicitly set for requests sent in the current context or None."""
+
+    return _current_priority.get()
+
+
+@contextmanager
+def request_priority(priority: Optional[RequestPriority]) -> Iterator[Optional[RequestPriority]]:
+    """\
+    Sets priority of requests sent inside the block.
+
+    Used by connectors that schedule requests, see `ThrottledConnector.priority_of`.
+    None lets connector decide itself.
+    """
+
+    token = _current_priority.set(priority)
+    try:
+        yield priority
+    finally:
+        _current_priority.reset(token)
@@ -0,0 +1,226 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+
+from .connector import Connector
+from ..api import Request, Response
+
+logger = logging.getLogger('rocketgram.connectors.shared')
+
+
+@dataclass(frozen=True)
+class TokenStats:
+    """\
+    Requests of one bot.
+
+    in_flight: requests being sent
+    queued: requests waiting for the limits
+    """
+
+    in_flight: int
+    queued: int
+
+
+@dataclass(frozen=True)
+class SharedStats:
+    """\
+    Snapshot of the SharedConnector state.
+
+    users: number of bots that initialized the connector
+    in_flight: requests being sent by all bots
+    queued: requests of all bots waiting for the limits
+    sent: total number of sent requests
+    bots: state of bots that have requests in work by bot id
+    """
+
+    users: int
+    in_flight: int
+    queued: int
+    sent: int
+    bots: Dict[int, TokenStats]
+
+
+class _Token:
+    # Requests of one token in work.
+
+    __slots__ = ('in_flight', 'waiters')
+
+    def __init__(self):
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+
+
+class SharedConnector(Connector):
+    """\
+    Connector that is shared by many bots.
+
+    All bots send requests through one inner connector, so they share its connection pool.
+    Bots initialize and shut down this connector themselves, inner connector is initialized
+    by the first bot and shut down after the last one.
+
+    Requests that exceed the limits wait in per-bot queues. Queues are served in round-robin order,
+    so bot that sends a lot of requests does not delay others.
+
+    connector: inner connector, AioHttpConnector is created on first init if not specified
+    max_in_flight: maximum number of requests sent at the same time by all bots
+    max_in_flight_per_bot: maximum number of requests sent at the same time by one bot
+    """
+
+    SHARED = True
+
+    def __init__(self, connector: Optional[Connector] = None, *, max_in_flight: Optional[int] = None,
+                 max_in_flight_per_bot: Optional[int] = None):
+        assert max_in_flight is None or max_in_flight > 0, "max_in_flight should be positive!"
+        assert max_in_flight_per_bot is None or max_in_flight_per_bot > 0, "max_in_flight_per_bot should be positive!"
+
+        super().__init__()
+
+        self._connector = connector
+        self._max_in_flight = max_in_flight
+        self._max_in_flight_per_bot = max_in_flight_per_bot
+
+        self._users = 0
+        self._in_flight = 0
+        self._sent = 0
+        self._tokens: Dict[str, _Token] = dict()
+        self._ready: 'OrderedDict[str, None]' = OrderedDict()
+
+    @property
+    def connector(self) -> Optional[Connector]:
+        """Inner connector."""
+
+        return self._connector
+
+    async def init(self):
+        self._users += 1
+        if self._users > 1:
+            return
+
+        if self._connector is None:
+            from .aiohttp import AioHttpConnector
+            self._connector = AioHttpConnector()
+
+        await self._connector.init()
+
+    async def shutdown(self):
+        assert self._users > 0, "Connector is not initialized!"
+
+        self._users -= 1
+        if self._users == 0:
+            await self._connector.shutdown()
+
+    def resolve_file_url(self, token: str, file_path: str) -> str:
+        return self._connector.resolve_file_url(token, file_path)
+
+    def stats(self) -> SharedStats:
+        """Returns current state of the connector."""
+
+        bots = {int(token.split(':', 1)[0]): TokenStats(state.in_flight, len(state.waiters))
+                for token, state in self._tokens.items()}
+
+        return SharedStats(
+            users=self._users,
+            in_flight=self._in_flight,
+            queued=sum(s.queued for s in bots.values()),
+            sent=self._sent,
+            bots=bots,
+        )
+
+    def _can_run(self, state: _Token) -> bool:
+        if self._max_in_flight is not None and self._in_flight >= self._max_in_flight:
+            return False
+        return self._max_in_flight_per_bot is None or state.in_flight < self._max_in_flight_per_bot
+
+    async def _acquire(self, token: str) -> _Token:
+        state = self._tokens.get(token)
+        if state is None:
+            state = self._tokens[token] = _Token()
+
+        if not state.waiters and self._can_run(state):
+            state.in_flight += 1
+            self._in_flight += 1
+            return state
+
+        waiter = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        self._ready[token] = None
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # slot was granted but will not be used
+                self._release(token, state)
+            else:
+                with suppress(ValueError):
+                    state.waiters.remove(waiter)
+                if not state.waiters:
+                    self._ready.pop(token, None)
+                self._forget(token, state)
+            raise
+
+        return state
+
+    def _release(self, token: str, state: _Token):
+        state.in_flight -= 1
+        self._in_flight -= 1
+        self._schedule()
+        self._forget(token, state)
+
+    def _forget(self, token: str, state: _Token):
+        if not state.in_flight and not state.waiters:
+            self._tokens.pop(token, None)
+
+    def _schedule(self):
+        # Grants free slots to waiting bots in round-robin order.
+
+        while self._ready:
+            granted = False
+
+            for token in list(self._ready):
+                if self._max_in_flight is not None and self._in_flight >= self._max_in_flight:
+                    return
+
+                state = self._tokens[token]
+
+                # skip cancelled requests
+                while state.waiters and state.waiters[0].done():
+                    state.waiters.popleft()
+
+                if not state.waiters:
+                    del self._ready[token]
+                    self._forget(token, state)
+                    continue
+
+                if not self._can_run(state):
+                    continue
+
+                waiter = state.waiters.popleft()
+                state.in_flight += 1
+                self._in_flight += 1
+                waiter.set_result(None)
+                granted = True
+
+                # bot goes to the end of the queue
+                del self._ready[token]
+                if state.waiters:
+                    self._ready[token] = None
+
+            if not granted:
+                return
+
+    async def send(self, token: str, request: Request) -> Response:
+        state = await self._acquire(token)
+        try:
+            return await self._connector.send(token, request)
+        finally:
+            self._sent += 1
+            self._release(token, state)
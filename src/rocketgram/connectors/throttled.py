@@ -0,0 +1,328 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+import heapq
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import count
+from typing import Dict, List, Optional, Union, Tuple
+
+from .connector import Connector
+from .priority import RequestPriority, current_priority
+from ..api import Request, Response
+from ..context import context
+
+logger = logging.getLogger('rocketgram.connectors.throttled')
+
+
+@dataclass(frozen=True)
+class ThrottleStats:
+    """\
+    Snapshot of the ThrottledConnector state.
+
+    global_queue: requests waiting for the global limits of all bots
+    priority_queue: requests waiting for the global limits of all bots by priority
+    chat_queue: requests waiting for the per-chat limits
+    chats: number of chats with tracked limits of all bots
+    retried: total number of requests retried after 429 error
+    """
+
+    global_queue: int
+    priority_queue: Dict[RequestPriority, int]
+    chat_queue: int
+    chats: int
+    retried: int
+
+
+class _ChatBucket:
+    # Per-chat token bucket working in reservation mode.
+    # Each call takes a token in advance and returns delay until the token is available,
+    # so requests to one chat are paced in order of arrival.
+
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate: float, burst: int, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def block(self, now: float, delay: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens = min(self.tokens, 1 - delay * self.rate)
+
+    def idle(self, now: float) -> bool:
+        return self.tokens + (now - self.updated) * self.rate >= self.burst
+
+
+class _GlobalPacer:
+    # Global token bucket. Requests that can't get a token immediately are queued
+    # and granted one by one by the pacing task. Queue is ordered by enqueue time
+    # shifted by priority * aging, so higher classes go first, but request
+    # of lower class waiting long enough overtakes fresh ones and bulk traffic never starves.
+
+    __slots__ = ('rate', 'burst', 'aging', 'tokens', 'updated', 'waiters', 'queued', 'counter', 'task')
+
+    def __init__(self, rate: float, burst: int, aging: float):
+        self.rate = rate
+        self.burst = burst
+        self.aging = aging
+        self.tokens = float(burst)
+        self.updated = None
+        self.waiters: List[Tuple[float, int, RequestPriority, asyncio.Future]] = list()
+        self.queued: Dict[RequestPriority, int] = {p: 0 for p in RequestPriority}
+        self.counter = count()
+        self.task: Optional[asyncio.Task] = None
+
+    def _refill(self, now: float):
+        if self.updated is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, priority: RequestPriority):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self._refill(now)
+
+        if not self.waiters and self.tokens >= 1:
+            self.tokens -= 1
+            return
+
+        waiter = loop.create_future()
+        heapq.heappush(self.waiters, (now + priority * self.aging, next(self.counter), priority, waiter))
+        self.queued[priority] += 1
+
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # token was granted but nobody will use it
+                self.tokens += 1
+            else:
+                # cancelled waiter stays in the heap and is skipped by pacing task
+                self.queued[priority] -= 1
+            raise
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self.waiters:
+                self._refill(loop.time())
+
+                if self.tokens < 1:
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+                    continue
+
+                _, _, priority, waiter = heapq.heappop(self.waiters)
+                if waiter.done():
+                    continue
+
+                self.queued[priority] -= 1
+                self.tokens -= 1
+                waiter.set_result(None)
+        finally:
+            self.task = None
+
+    def close(self):
+        if self.task is not None:
+            self.task.cancel()
+
+        waiters, self.waiters = self.waiters, list()
+        for _, _, _, waiter in waiters:
+            if not waiter.done():
+                waiter.cancel()
+
+
+class ThrottledConnector(Connector):
+    """\
+    Connector wrapper that paces outgoing requests according to the telegram flood limits.
+
+    Requests that send or edit messages (see `chat_of`) are limited
+    globally and per chat, other requests are passed as is.
+    Limits are separate for every bot token, so bots sharing this connector
+    don't throttle each other.
+
+    Requests waiting for the global limit are served by priority (see `priority_of`).
+    Priority can be set explicitly with `Bot.send(request, priority=...)` or `request_priority`.
+
+    connector: connector that really sends requests
+    global_rate: messages per second for all chats
+    private_rate: messages per second for one private chat
+    group_rate: messages per second for one group or channel
+    burst: number of messages that can be sent to one chat without pacing
+    max_retries: how many times to retry request after 429 error, respecting retry_after
+    aging: seconds of waiting that raise request by one priority class
+    max_chats: number of chat buckets to keep, least recently used idle buckets are pruned beyond it
+
+    Inner connector is initialized and released with this one. Since Bot does not initialize
+    connectors passed to it, call init() and shutdown() yourself.
+    """
+
+    THROTTLED_PREFIXES = ('Send', 'Forward', 'Copy', 'Edit', 'Stop')
+    HIGH_PRIORITY_METHODS = frozenset(('AnswerCallbackQuery', 'AnswerInlineQuery'))
+
+    def __init__(self, connector: Connector, *, global_rate: float = 30, private_rate: float = 1,
+                 group_rate: float = 20 / 60, burst: int = 1, max_retries: int = 3, aging: float = 5.0,
+                 max_chats: int = 10000):
+        super().__init__()
+
+        self._connector = connector
+        self._global_rate = global_rate
+        self._aging = aging
+        self._private_rate = private_rate
+        self._group_rate = group_rate
+        self._burst = burst
+        self._max_retries = max_retries
+        self._max_chats = max_chats
+
+        self._globals: Dict[str, _GlobalPacer] = dict()
+        self._chats: 'OrderedDict[Tuple[str, Union[int, str]], _ChatBucket]' = OrderedDict()
+        self._chat_queue = 0
+        self._retried = 0
+
+    @property
+    def connector(self) -> Connector:
+        """Inner connector."""
+
+        return self._connector
+
+    async def init(self):
+        await self._connector.init()
+
+    async def shutdown(self):
+        for pacer in self._globals.values():
+            pacer.close()
+        self._globals.clear()
+        await self._connector.shutdown()
+
+    def resolve_file_url(self, token: str, file_path: str) -> str:
+        return self._connector.resolve_file_url(token, file_path)
+
+    def chat_of(self, request: Request) -> Optional[Union[int, str]]:
+        """Returns chat the request is limited by, or None if request should not be throttled."""
+
+        if not request.method.startswith(self.THROTTLED_PREFIXES):
+            return None
+
+        return getattr(request, 'chat_id', None)
+
+    def priority_of(self, request: Request) -> RequestPriority:
+        """\
+        Returns priority of the request.
+
+        Explicitly given priority is used if any. Otherwise answers to queries are high,
+        requests made while processing an update are interactive, and others are bulk.
+        """
+
+        priority = current_priority()
+        if priority is not None:
+            return priority
+
+        if request.method in self.HIGH_PRIORITY_METHODS:
+            return RequestPriority.high
+
+        if context.update is not None:
+            return RequestPriority.interactive
+
+        return RequestPriority.bulk
+
+    def stats(self) -> ThrottleStats:
+        """Returns current state of the limiter."""
+
+        queued = {p: 0 for p in RequestPriority}
+        for pacer in self._globals.values():
+            for p, n in pacer.queued.items():
+                queued[p] += n
+
+        return ThrottleStats(
+            global_queue=sum(queued.values()),
+            priority_queue=queued,
+            chat_queue=self._chat_queue,
+            chats=len(self._chats),
+            retried=self._retried,
+        )
+
+    def _bucket(self, token: str, chat_id: Union[int, str], now: float) -> _ChatBucket:
+        chats = self._chats
+        key = (token, chat_id)
+
+        bucket = chats.get(key)
+        if bucket is not None:
+            chats.move_to_end(key)
+            return bucket
+
+        # Buckets are kept in order of use, so least recently used ones are checked first.
+        # Busy bucket stops pruning: it still limits its chat, and the ones after it were used later.
+        while len(chats) >= self._max_chats:
+            oldest = next(iter(chats.values()))
+            if not oldest.idle(now):
+                break
+            chats.popitem(last=False)
+
+        # positive ids are private chats, negative ids and @usernames are groups and channels
+        private = isinstance(chat_id, int) and chat_id > 0
+        bucket = _ChatBucket(self._private_rate if private else self._group_rate, self._burst, now)
+        chats[key] = bucket
+        return bucket
+
+    def _pacer(self, token: str) -> _GlobalPacer:
+        pacer = self._globals.get(token)
+        if pacer is None:
+            pacer = self._globals[token] = _GlobalPacer(self._global_rate, max(self._burst, 1), self._aging)
+        return pacer
+
+    async def _acquire(self, token: str, chat_id: Union[int, str], priority: RequestPriority):
+        loop = asyncio.get_running_loop()
+
+        delay = self._bucket(token, chat_id, loop.time()).reserve(loop.time())
+        if delay > 0:
+            self._chat_queue += 1
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._chat_queue -= 1
+
+        await self._pacer(token).acquire(priority)
+
+    async def send(self, token: str, request: Request) -> Response:
+        chat_id = self.chat_of(request)
+        priority = self.priority_of(request) if chat_id is not None else None
+
+        retries = 0
+        while True:
+            if chat_id is not None:
+                await self._acquire(token, chat_id, priority)
+
+            response = await self._connector.send(token, request)
+
+            if response.error_code != 429 or retries >= self._max_retries:
+                return response
+
+            retry_after = response.parameters.retry_after if response.parameters else None
+            if retry_after is None:
+                return response
+
+            retries += 1
+            self._retried += 1
+
+            logger.warning('Flood limit exceeded for `%s`, retry in %s seconds.', request.method, retry_after)
+
+            if chat_id is not None:
+                loop = asyncio.get_running_loop()
+                self._bucket(token, chat_id, loop.time()).block(loop.time(), retry_after)
+            else:
+                await asyncio.sleep(retry_after)
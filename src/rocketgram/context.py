@@ -4,7 +4,7 @@
 
 
 from contextvars import ContextVar
-from typing import List, Optional, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING
 
 from . import api
 
@@ -12,28 +12,104 @@ if TYPE_CHECKING:
     from .executors import Executor
     from .bot import Bot
 
-_current_executor = ContextVar('current_executor')
-_current_bot = ContextVar('current_bot')
-_current_webhook_requests = ContextVar('current_webhook_requests')
 
-_current_update = ContextVar('current_update')
-_current_message = ContextVar('current_message')
-_current_callback = ContextVar('current_callback')
-_current_inline = ContextVar('current_inline')
-_current_result = ContextVar('current_result')
-_current_shipping = ContextVar('current_shipping')
-_current_checkout = ContextVar('current_checkout')
-_current_poll = ContextVar('current_poll')
-_current_answer = ContextVar('current_answer')
-_current_member = ContextVar('current_member')
+class _State:
+    # State of the current request. Objects derived from the update (message, chat, user, ...)
+    # are resolved on first access. State is never changed in place except for this resolution,
+    # setters make a copy, so changes in one task do not leak to others sharing the state.
 
-_current_reaction = ContextVar('current_reaction')
-_current_reaction_count = ContextVar('current_reaction_count')
-_current_boost = ContextVar('current_boost')
-_current_removed_boost = ContextVar('current_removed_boost')
+    __slots__ = ('executor', 'bot', 'update', 'webhook_requests', 'fields', 'cache')
+
+    def __init__(self, executor: Optional['Executor'], bot: Optional['Bot'], update: Optional['api.Update'],
+                 webhook_requests: Optional[List['api.Request']], fields: Optional[Dict[str, Any]] = None,
+                 cache: Optional[Dict] = None):
+        self.executor = executor
+        self.bot = bot
+        self.update = update
+        self.webhook_requests = webhook_requests
+        self.fields = fields
+        self.cache = cache
+
+    def copy(self, **changes) -> '_State':
+        state = _State(self.executor, self.bot, self.update, self.webhook_requests, self.fields, self.cache)
+        for name, value in changes.items():
+            setattr(state, name, value)
+        return state
+
+
+_EMPTY = _State(None, None, None, None, dict())
+
+_current_state = ContextVar('current_state')
+
+
+def _fields(obj, name: str, chat: Optional[str] = 'chat', user: Optional[str] = 'user') -> Dict[str, Any]:
+    fields = {name: obj}
+    if chat is not None:
+        fields['chat'] = getattr(obj, chat)
+    if user is not None:
+        fields['user'] = getattr(obj, user)
+    return fields
+
+
+def _callback(callback: 'api.CallbackQuery') -> Dict[str, Any]:
+    message = callback.message
+    return {'callback': callback, 'message': message, 'chat': message.chat if message else None,
+            'user': callback.user}
+
+
+# Objects provided by context for each update type.
+# Keyed by value of UpdateType that is also the name of the update field.
+_RESOLVERS: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+    'message': lambda o: _fields(o, 'message'),
+    'edited_message': lambda o: _fields(o, 'message'),
+    'channel_post': lambda o: _fields(o, 'message'),
+    'edited_channel_post': lambda o: _fields(o, 'message'),
+    'message_reaction': lambda o: _fields(o, 'reaction'),
+    'message_reaction_count': lambda o: _fields(o, 'reaction_count', user=None),
+    'inline_query': lambda o: _fields(o, 'inline', chat=None),
+    'chosen_inline_result': lambda o: _fields(o, 'result', chat=None),
+    'callback_query': _callback,
+    'shipping_query': lambda o: _fields(o, 'shipping', chat=None),
+    'pre_checkout_query': lambda o: _fields(o, 'checkout', chat=None),
+    'poll': lambda o: _fields(o, 'poll', chat=None, user=None),
+    'poll_answer': lambda o: _fields(o, 'answer', chat=None),
+    'my_chat_member': lambda o: _fields(o, 'member'),
+    'chat_member': lambda o: _fields(o, 'member'),
+    'chat_boost': lambda o: _fields(o, 'boost', user=None),
+    'removed_chat_boost': lambda o: _fields(o, 'removed_boost', user=None),
+}
 
-_current_chat = ContextVar('current_chat')
-_current_user = ContextVar('current_user')
+
+def _resolve(state: _State) -> Dict[str, Any]:
+    fields = state.fields
+    if fields is None:
+        update = state.update
+        key = update.type.value if update is not None else None
+        resolver = _RESOLVERS.get(key)
+        fields = state.fields = resolver(getattr(update, key)) if resolver else dict()
+    return fields
+
+
+def _get(name: str):
+    return _resolve(_current_state.get(_EMPTY)).get(name)
+
+
+def _set(name: str, value):
+    state = _current_state.get(_EMPTY)
+    fields = dict(_resolve(state))
+    fields[name] = value
+    _current_state.set(state.copy(fields=fields))
+
+
+def _update_cache() -> Dict:
+    """Returns dict for caching values computed from the current update."""
+
+    state = _current_state.get(_EMPTY)
+    if state is _EMPTY:
+        return dict()
+    if state.cache is None:
+        state.cache = dict()
+    return state.cache
 
 
 class Context:
@@ -53,287 +129,204 @@ class Context:
     def executor(self) -> Optional['Executor']:
         """Returns Executor object for current request."""
 
-        return _current_executor.get(None)
+        return _current_state.get(_EMPTY).executor
 
     @executor.setter
     def executor(self, executor: 'Executor'):
-        _current_executor.set(executor)
+        _current_state.set(_current_state.get(_EMPTY).copy(executor=executor))
 
     @property
     def bot(self) -> Optional['Bot']:
         """Returns current Bot object."""
 
-        return _current_bot.get(None)
+        return _current_state.get(_EMPTY).bot
 
     @bot.setter
     def bot(self, bot: 'Bot'):
-        _current_bot.set(bot)
+        _current_state.set(_current_state.get(_EMPTY).copy(bot=bot))
 
     @property
     def update(self) -> Optional['api.Update']:
         """Returns Update object for current request."""
 
-        return _current_update.get(None)
+        return _current_state.get(_EMPTY).update
 
     @update.setter
     def update(self, update: 'api.Update'):
-        _current_update.set(update)
+        _current_state.set(_current_state.get(_EMPTY).copy(update=update, fields=None, cache=None))
 
     @property
     def message(self) -> Optional['api.Message']:
         """Returns Message object for current request."""
 
-        return _current_message.get(None)
+        return _get('message')
 
     @message.setter
     def message(self, update: 'api.Message'):
-        _current_message.set(update)
+        _set('message', update)
 
     @property
     def chat(self) -> Optional['api.Chat']:
         """Returns Chat object for current request."""
 
-        return _current_chat.get(None)
+        return _get('chat')
 
     @chat.setter
     def chat(self, chat: 'api.Chat'):
-        _current_chat.set(chat)
+        _set('chat', chat)
 
     @property
     def user(self) -> Optional['api.User']:
         """Returns User object for current request."""
 
-        return _current_user.get(None)
+        return _get('user')
 
     @user.setter
     def user(self, user: 'api.User'):
-        _current_user.set(user)
+        _set('user', user)
 
     @property
     def callback(self) -> Optional['api.CallbackQuery']:
         """Returns CallbackQuery object for current request."""
 
-        return _current_callback.get(None)
+        return _get('callback')
 
     @callback.setter
     def callback(self, callback: 'api.CallbackQuery'):
-        _current_callback.set(callback)
+        _set('callback', callback)
 
     @property
     def inline(self) -> Optional['api.InlineQuery']:
         """Returns InlineQuery object for current request."""
 
-        return _current_inline.get(None)
+        return _get('inline')
 
     @inline.setter
     def inline(self, inline: 'api.InlineQuery'):
-        _current_inline.set(inline)
+        _set('inline', inline)
 
     @property
     def result(self) -> Optional['api.ChosenInlineResult']:
         """Returns ChosenInlineResult object for current request."""
 
-        return _current_result.get(None)
+        return _get('result')
 
     @result.setter
     def result(self, result: 'api.ChosenInlineResult'):
-        _current_result.set(result)
+        _set('result', result)
 
     @property
     def shipping(self) -> Optional['api.ShippingQuery']:
         """Returns ShippingQuery object for current request."""
 
-        return _current_shipping.get(None)
+        return _get('shipping')
 
     @shipping.setter
     def shipping(self, shipping: 'api.ShippingQuery'):
-        _current_shipping.set(shipping)
+        _set('shipping', shipping)
 
     @property
     def checkout(self) -> Optional['api.PreCheckoutQuery']:
         """Returns PreCheckoutQuery object for current request."""
 
-        return _current_checkout.get(None)
+        return _get('checkout')
 
     @checkout.setter
     def checkout(self, checkout: 'api.PreCheckoutQuery'):
-        _current_checkout.set(checkout)
+        _set('checkout', checkout)
 
     @property
     def poll(self) -> Optional['api.Poll']:
         """Returns Poll object for current request."""
 
-        return _current_poll.get(None)
+        return _get('poll')
 
     @poll.setter
     def poll(self, poll: 'api.Poll'):
-        _current_poll.set(poll)
+        _set('poll', poll)
 
     @property
     def answer(self) -> Optional['api.PollAnswer']:
         """Returns PollAnswer object for current request."""
 
-        return _current_answer.get(None)
+        return _get('answer')
 
     @answer.setter
     def answer(self, answer: 'api.PollAnswer'):
-        _current_answer.set(answer)
+        _set('answer', answer)
 
     @property
     def member(self) -> Optional['api.ChatMemberUpdated']:
         """Returns ChatMemberUpdated object for current request."""
 
-        return _current_member.get(None)
+        return _get('member')
 
     @member.setter
     def member(self, member: 'api.ChatMemberUpdated'):
-        _current_member.set(member)
+        _set('member', member)
 
     @property
     def reaction(self) -> Optional['api.MessageReactionUpdated']:
         """Returns MessageReaction object for current request."""
 
-        return _current_reaction.get(None)
+        return _get('reaction')
 
     @reaction.setter
     def reaction(self, reaction: 'api.MessageReactionUpdated'):
-        _current_reaction.set(reaction)
+        _set('reaction', reaction)
 
     @property
     def reaction_count(self) -> Optional['api.MessageReactionCountUpdated']:
         """Returns MessageReactionCount object for current request."""
 
-        return _current_reaction_count.get(None)
+        return _get('reaction_count')
 
     @reaction_count.setter
     def reaction_count(self, reaction_count: 'api.MessageReactionCountUpdated'):
-        _current_reaction_count.set(reaction_count)
+        _set('reaction_count', reaction_count)
 
     @property
     def boost(self) -> Optional['api.ChatBoostUpdated']:
         """Returns ChatBoostUpdated object for current request."""
 
-        return _current_boost.get(None)
+        return _get('boost')
 
     @boost.setter
     def boost(self, boost: 'api.ChatBoostUpdated'):
-        _current_boost.set(boost)
+        _set('boost', boost)
 
     @property
     def removed_boost(self) -> Optional['api.ChatBoostRemoved']:
         """Returns ChatBoostRemoved object for current request."""
 
-        return _current_removed_boost.get(None)
+        return _get('removed_boost')
 
     @removed_boost.setter
     def removed_boost(self, removed_boost: 'api.ChatBoostRemoved'):
-        _current_removed_boost.set(removed_boost)
+        _set('removed_boost', removed_boost)
 
     @staticmethod
     def webhook(request: 'api.Request'):
         """Sets the Request object to be sent through the webhook-request mechanism."""
 
-        _current_webhook_requests.get().append(request)
+        _current_state.get().webhook_requests.append(request)
 
     @property
     def webhook_requests(self) -> List['api.Request']:
         """Returns list of current requests that awaits sent through webhook-request mechanism."""
 
-        return _current_webhook_requests.get()
+        return _current_state.get().webhook_requests
 
     @webhook_requests.setter
     def webhook_requests(self, webhook_requests):
         """Returns list of current requests that awaits sent through webhook-request mechanism."""
 
-        _current_webhook_requests.set(webhook_requests)
+        _current_state.set(_current_state.get(_EMPTY).copy(webhook_requests=webhook_requests))
 
     def assign(self, executor: 'Executor', bot: 'Bot', update: 'api.Update'):
+        """Sets context for processing of the update."""
 
-        self.executor = executor
-        self.bot = bot
-
-        self.webhook_requests = list()
-
-        self.update = update
-
-        self.message = None
-        self.callback = None
-        self.shipping = None
-        self.inline = None
-        self.result = None
-        self.checkout = None
-        self.poll = None
-        self.answer = None
-        self.member = None
-
-        self.reaction = None
-        self.reaction_count = None
-        self.boost = None
-        self.removed_boost = None
-
-        self.chat = None
-        self.user = None
-
-        if update.type is api.UpdateType.message:
-            self.message = update.message
-            self.chat = update.message.chat
-            self.user = update.message.user
-        elif update.type is api.UpdateType.edited_message:
-            self.message = update.edited_message
-            self.chat = update.edited_message.chat
-            self.user = update.edited_message.user
-        elif update.type is api.UpdateType.channel_post:
-            self.message = update.channel_post
-            self.chat = update.channel_post.chat
-            self.user = update.channel_post.user
-        elif update.type is api.UpdateType.edited_channel_post:
-            self.message = update.edited_channel_post
-            self.chat = update.edited_channel_post.chat
-            self.user = update.edited_channel_post.user
-        elif update.type is api.UpdateType.message_reaction:
-            self.reaction = update.message_reaction
-            self.chat = update.message_reaction.chat
-            self.user = update.message_reaction.user
-        elif update.type is api.UpdateType.message_reaction_count:
-            self.reaction_count = update.message_reaction_count
-            self.chat = update.message_reaction_count.chat
-        elif update.type is api.UpdateType.inline_query:
-            self.inline = update.inline_query
-            self.user = update.inline_query.user
-        elif update.type is api.UpdateType.chosen_inline_result:
-            self.result = update.chosen_inline_result
-            self.user = update.chosen_inline_result.user
-        elif update.type is api.UpdateType.callback_query:
-            self.callback = update.callback_query
-            self.message = update.callback_query.message
-            if update.callback_query.message:
-                self.chat = update.callback_query.message.chat
-            self.user = update.callback_query.user
-        elif update.type is api.UpdateType.shipping_query:
-            self.shipping = update.shipping_query
-            self.user = update.shipping_query.user
-        elif update.type is api.UpdateType.pre_checkout_query:
-            self.checkout = update.pre_checkout_query
-            self.user = update.pre_checkout_query.user
-        elif update.type is api.UpdateType.poll:
-            self.poll = update.poll
-        elif update.type is api.UpdateType.poll_answer:
-            self.answer = update.poll_answer
-            self.user = update.poll_answer.user
-        elif update.type is api.UpdateType.my_chat_member:
-            self.member = update.my_chat_member
-            self.chat = update.my_chat_member.chat
-            self.user = update.my_chat_member.user
-        elif update.type is api.UpdateType.chat_member:
-            self.member = update.chat_member
-            self.chat = update.chat_member.chat
-            self.user = update.chat_member.user
-        elif update.type is api.UpdateType.chat_boost:
-            self.boost = update.chat_boost
-            self.chat = update.chat_boost.chat
-        elif update.type is api.UpdateType.removed_chat_boost:
-            self.removed_boost = update.removed_chat_boost
-            self.chat = update.removed_chat_boost.chat
+        _current_state.set(_State(executor, bot, update, list()))
 
 
 context: Context = Context.instance()
@@ -6,8 +6,13 @@
 from contextlib import suppress
 
 from .executor import Executor
+from .ordering import Ordering, chat_key, user_key
+from .prefilter import PreFilter
+from .raw import raw_chat_id, raw_user_id
+from .registry import BotRegistry, BotEntry, hashed_suffix
 from .updates import UpdatesExecutor
 from .webhook import WebhookExecutor
+from .workers import WorkerPool, raw_chat_key
 
 with suppress(ImportError):
     from .aiohttp import AioHttpExecutor
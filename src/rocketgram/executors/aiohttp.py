@@ -5,12 +5,13 @@
 
 import asyncio
 import logging
+from functools import partial
 from secrets import compare_digest
 
 from aiohttp.web import Server, ServerRunner, BaseRequest, TCPSite, Response
 
 from .webhook import WebhookExecutor
-from ..api import Request, Update
+from ..api import Request, Update, interning
 
 logger = logging.getLogger('rocketgram.executors.aiohttp')
 
@@ -22,26 +23,58 @@ class AioHttpExecutor(WebhookExecutor):
         if request.method != 'POST':
             return Response(status=400, text="Bad request.", headers=self.HEADERS_ERROR)
 
-        bot = self._bots.get(request.path)
+        entry = self._bots.get(request.path)
 
-        if not bot:
+        if entry is None:
             logger.warning("Bot not found for request `%s`.", request.path)
             return Response(status=404, text="Not found.", headers=self.HEADERS_ERROR)
 
+        bot = entry.bot
+
         token = self._secret_tokens.get(bot)
 
         if token and not compare_digest(token, request.headers.get(self.HEADER_SECRET, '')):
             logger.warning("Wrong token was provided for the bot `%s`.", bot.name)
             return Response(status=403, text="Wrong token.", headers=self.HEADERS_ERROR)
 
+        if self._overloaded():
+            logger.warning("Too many updates in processing, update for the bot `%s` rejected.", bot.name)
+            return Response(status=503, text="Overloaded.",
+                            headers={**self.HEADERS_ERROR, "Retry-After": str(self.RETRY_AFTER)})
+
         try:
-            parsed = Update.parse(self._loads(await request.read()))
+            data = self._loads(await request.read())
+
+            prefilter = self._prefilters.get(bot)
+            if prefilter is not None and not prefilter(data):
+                return Response(status=200)
+
+            if not entry.initialized:
+                await self._activate(entry)
+            self._bots.touch(entry)
+
+            if self._workers is not None:
+                return await self.__process_in_worker(bot, data)
+
+            with interning(bot.intern_cache):
+                parsed = Update.parse(data, lazy=self._lazy_parsing or bot.lazy_parsing)
         except Exception:  # noqa
             logger.exception("Got exception while parsing update:")
             return Response(status=500, text="Server error.", headers=self.HEADERS_ERROR)
 
-        task = asyncio.create_task(bot.process(self, parsed))
-        self._tasks[bot].add(task)
+        if self._ordering is None:
+            task = asyncio.create_task(bot.process(self, parsed))
+        else:
+            task = self._ordering.create_task(parsed, partial(bot.process, self, parsed), bot)
+        self._track(bot, task)
+
+        if self._reply_deadline is not None:
+            if self._reply_deadline:
+                await asyncio.wait((task,), timeout=self._reply_deadline)
+            if not task.done():
+                # answer now, reply will be sent by the bot
+                task.add_done_callback(partial(self._send_late, bot))
+                return Response(status=200)
 
         try:
             response: Request = await task
@@ -50,10 +83,30 @@ class AioHttpExecutor(WebhookExecutor):
             return Response(status=500, text="Server error.", headers=self.HEADERS_ERROR)
 
         if response:
-            data = self._dumps(response.render(with_method=True))
+            data = response.encode(self._json_adapter, with_method=True)
             return Response(body=data, headers=self.HEADERS)
 
-        self._tasks[bot] = {t for t in self._tasks[bot] if not t.done()}
+        return Response(status=200)
+
+    async def __process_in_worker(self, bot, data) -> Response:
+        task = asyncio.create_task(self._workers.process(bot, data))
+        self._track(bot, task)
+
+        if self._reply_deadline is not None:
+            if self._reply_deadline:
+                await asyncio.wait((task,), timeout=self._reply_deadline)
+            if not task.done():
+                # workers don't return replies in this mode
+                return Response(status=200)
+
+        try:
+            reply = await task
+        except Exception:  # noqa
+            logger.exception("Got exception while processing update:")
+            return Response(status=500, text="Server error.", headers=self.HEADERS_ERROR)
+
+        if reply:
+            return Response(body=reply, headers=self.HEADERS)
 
         return Response(status=200)
 
@@ -65,9 +118,15 @@ class AioHttpExecutor(WebhookExecutor):
 
         logger.info("Starting with webhook...")
 
+        if self._workers is not None:
+            # replies that come after the answer can't be sent by the front process
+            await self._workers.start(webhook_replies=self._reply_deadline is None)
+
+        self._start_evictor()
+
         runner = ServerRunner(Server(self.__handler))
         await runner.setup()
-        self._srv = TCPSite(runner, self._host, self._port)
+        self._srv = TCPSite(runner, self._host, self._port, reuse_port=self._reuse_port or None)
 
         logger.info("Listening on http://%s:%s%s", self._host, self._port, self._base_path)
 
@@ -83,6 +142,8 @@ class AioHttpExecutor(WebhookExecutor):
 
         self._started = False
 
+        await self._stop_evictor()
+
         if self._srv:
             await self._srv.stop()
             self._srv = None
@@ -94,4 +155,7 @@ class AioHttpExecutor(WebhookExecutor):
 
         await self._wait_tasks(tasks)
 
+        if self._workers is not None:
+            await self._workers.stop()
+
         logger.info("Stopped.")
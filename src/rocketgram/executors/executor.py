@@ -5,10 +5,15 @@
 
 import asyncio
 import logging
+import multiprocessing
+import os
 import signal
 from contextlib import suppress
-from typing import TYPE_CHECKING, Callable, Union, List, Optional
+from multiprocessing.connection import wait
+from time import monotonic
+from typing import TYPE_CHECKING, Awaitable, Callable, Union, List, Optional, Set
 
+from .prefilter import PreFilter
 from ..api import Request, UpdateType
 
 if TYPE_CHECKING:
@@ -17,6 +22,36 @@ if TYPE_CHECKING:
 logger = logging.getLogger('rocketgram.executors.executor')
 
 
+# Minimal lifetime of worker process, workers that exit earlier are restarted after a delay.
+WORKER_RESTART_DELAY = 1.0
+
+
+def _block_signals(signals: tuple) -> Optional[Set[int]]:
+    # Blocks signals and returns previous mask, or None if masks are not supported.
+
+    if not hasattr(signal, 'pthread_sigmask'):
+        return None
+    return signal.pthread_sigmask(signal.SIG_BLOCK, signals)
+
+
+def _restore_signals(mask: Optional[Set[int]]):
+    if mask is not None:
+        signal.pthread_sigmask(signal.SIG_SETMASK, mask)
+
+
+def _run_worker(target: Callable[[], None], mask: Optional[Set[int]]):
+    # Entry point of the worker process. Worker is stopped by SIGTERM sent from the coordinator,
+    # so SIGINT from the terminal doesn't interrupt its graceful shutdown.
+    # Worker is started with signals blocked by the coordinator, they are unblocked
+    # only after handlers of the worker are set.
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    _restore_signals(mask)
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    target()
+
+
 class Executor:
     __slots__ = ()
 
@@ -32,7 +67,7 @@ class Executor:
         return False
 
     async def add_bot(self, bot: 'Bot', *, allowed_updates: Optional[List[UpdateType]] = None,
-                      drop_pending_updates: bool = False, **kwargs):
+                      drop_pending_updates: bool = False, prefilter: Optional[PreFilter] = None, **kwargs):
         raise NotImplementedError
 
     async def remove_bot(self, bot: 'Bot'):
@@ -97,3 +132,99 @@ class Executor:
             loop.run_until_complete(asyncio.gather(*pending))
 
         logger.info('Bye!')
+
+    @staticmethod
+    def _run_workers(target: Callable[[], None], workers: int, setup: Callable[[], Awaitable],
+                     teardown: Callable[[], Awaitable], signals: tuple = (signal.SIGINT, signal.SIGTERM),
+                     shutdown_wait: int = 10, start_method: Optional[str] = None):
+        """\
+        Runs `target` in several worker processes.
+
+        Coordinator calls `setup` before workers are started and `teardown` after all of them exited.
+        Signals received by coordinator are forwarded to workers as SIGTERM, so target should stop gracefully
+        on it. Workers that did not exit in `shutdown_wait` seconds after that are terminated.
+        Worker that fails before that (exits with non-zero code) is started again,
+        but not earlier than `WORKER_RESTART_DELAY` seconds after its previous start.
+        """
+
+        assert workers > 0, "Number of workers should be positive!"
+
+        asyncio.run(setup())
+
+        context = multiprocessing.get_context(start_method)
+        processes: List[Optional[multiprocessing.Process]] = [None] * workers
+        started = [0.0] * workers
+
+        deadline = None
+
+        def forward(*_):
+            nonlocal deadline
+            if deadline is not None:
+                return
+            logger.info('Stopping workers...')
+            deadline = monotonic() + shutdown_wait
+            for p in processes:
+                if p is not None and p.is_alive():
+                    with suppress(ProcessLookupError):
+                        os.kill(p.pid, signal.SIGTERM)
+
+        def spawn(index: int):
+            # Signals are blocked while process is started, so a signal can't be
+            # handled by the coordinator's handler in the child or missed by the coordinator.
+            mask = _block_signals(signals)
+            try:
+                if deadline is not None:
+                    return
+                p = context.Process(target=_run_worker, args=(target, mask), name=f'rocketgram-worker-{index}')
+                p.start()
+                processes[index] = p
+                started[index] = monotonic()
+            finally:
+                _restore_signals(mask)
+
+        # handlers are set before workers are started, so a signal received
+        # at any moment stops workers that are already started
+        handlers = {s: signal.signal(s, forward) for s in signals}
+
+        try:
+            for i in range(workers):
+                spawn(i)
+
+            logger.info('Started %s workers.', workers)
+
+            while True:
+                if deadline is None:
+                    for i, p in enumerate(processes):
+                        # exit code 0 means that target finished by itself
+                        if p is None or p.exitcode is None or p.exitcode == 0:
+                            continue
+                        if started[i] + WORKER_RESTART_DELAY > monotonic():
+                            # restarted on one of next iterations
+                            continue
+                        logger.error('Worker %s exited with code %s, restarting.', p.pid, p.exitcode)
+                        spawn(i)
+
+                # workers are not started if signal was received while starting them
+                alive = [p for p in processes if p is not None and p.exitcode is None]
+                crashed = deadline is None and any(p.exitcode for p in processes if p is not None)
+                if not alive and not crashed:
+                    break
+
+                if deadline is not None and monotonic() > deadline:
+                    for p in alive:
+                        logger.error('Worker %s did not stop in time, terminating.', p.pid)
+                        p.kill()
+                    for p in alive:
+                        p.join()
+                    break
+
+                wait([p.sentinel for p in alive], timeout=1)
+        finally:
+            for s, h in handlers.items():
+                signal.signal(s, h)
+
+        logger.info('Shutting down...')
+
+        asyncio.run(teardown())
+
+        logger.info('Bye!')
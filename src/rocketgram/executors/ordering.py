@@ -0,0 +1,81 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from .raw import raw_chat_id, raw_user_id
+from ..api import Update
+
+KeyFunc = Callable[[Update], Optional[Hashable]]
+
+
+def chat_key(update: Update) -> Optional[int]:
+    """Orders updates by chat. Uses raw data, so lazily parsed updates are not decoded."""
+
+    return raw_chat_id(update.type, update.raw)
+
+
+def user_key(update: Update) -> Optional[int]:
+    """Orders updates by user. Uses raw data, so lazily parsed updates are not decoded."""
+
+    return raw_user_id(update.type, update.raw)
+
+
+class Ordering:
+    """\
+    Processes updates with the same key one after another
+    while updates with different keys are processed in parallel.
+
+    Each update task waits for the previous task of the same key. Only the last task
+    of each key is kept, so keys without updates in work take no memory.
+    Updates with None key are not ordered.
+
+    key: function that returns key of the update, for example chat_key or user_key
+    """
+
+    __slots__ = ('__key', '__tails')
+
+    def __init__(self, key: KeyFunc = chat_key):
+        self.__key = key
+        self.__tails: Dict[Hashable, asyncio.Task] = dict()
+
+    @property
+    def active_keys(self) -> int:
+        """Number of keys that have updates in work."""
+
+        return len(self.__tails)
+
+    def create_task(self, update: Update, process: Callable[[], Awaitable], scope: Hashable = None) -> asyncio.Task:
+        """\
+        Creates task that runs process() after all earlier tasks for the same key are done.
+
+        Scope separates keys, for example of different bots.
+        """
+
+        key = self.__key(update)
+        if key is None:
+            return asyncio.create_task(process())
+
+        key = (scope, key)
+        previous = self.__tails.get(key)
+
+        task = asyncio.create_task(self.__chain(previous, process))
+        self.__tails[key] = task
+        task.add_done_callback(lambda t: self.__release(key, t))
+
+        return task
+
+    @staticmethod
+    async def __chain(previous: Optional[asyncio.Task], process: Callable[[], Awaitable]) -> Any:
+        if previous is not None and not previous.done():
+            # errors and cancellation of the previous task do not affect this one
+            await asyncio.wait((previous,))
+
+        return await process()
+
+    def __release(self, key: Hashable, task: asyncio.Task):
+        if self.__tails.get(key) is task:
+            del self.__tails[key]
@@ -0,0 +1,77 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from .raw import raw_chat_id
+from ..api import UpdateType, MessageType
+
+_MESSAGE_UPDATES = frozenset((UpdateType.message, UpdateType.edited_message,
+                              UpdateType.channel_post, UpdateType.edited_channel_post))
+
+
+class PreFilter:
+    """\
+    Declarative filter for raw updates.
+
+    Executor checks raw update dicts with this filter and drops rejected updates
+    before they are parsed and processed. All conditions are optional
+    and update should satisfy all given ones.
+
+    Note: updates of unwanted types are better not to be received at all.
+    Use `allowed_updates` for that and `update_types` only for fine-tuning.
+    """
+
+    __slots__ = ('__update_types', '__message_types', '__chat_ids', '__exclude_chat_ids', '__commands')
+
+    def __init__(self, *, update_types: Optional[Iterable[UpdateType]] = None,
+                 message_types: Optional[Iterable[MessageType]] = None,
+                 chat_ids: Optional[Iterable[int]] = None,
+                 exclude_chat_ids: Optional[Iterable[int]] = None,
+                 commands: Optional[Iterable[str]] = None):
+        """
+
+        :param update_types: Pass only updates of these types
+        :param message_types: Pass only messages of these types. Does not affect updates without messages
+        :param chat_ids: Pass only updates from these chats. Does not affect updates without chat
+        :param exclude_chat_ids: Drop updates from these chats
+        :param commands: Pass only text messages that starts with one of these prefixes (case-sensitive).
+                         Does not affect other updates
+        """
+
+        self.__update_types = frozenset(update_types) if update_types is not None else None
+        self.__message_types = frozenset(message_types) if message_types is not None else None
+        self.__chat_ids = frozenset(chat_ids) if chat_ids is not None else None
+        self.__exclude_chat_ids = frozenset(exclude_chat_ids) if exclude_chat_ids is not None else None
+        self.__commands: Optional[Tuple[str, ...]] = tuple(commands) if commands is not None else None
+
+    def __call__(self, data: Dict) -> bool:
+        """Returns True if the raw update should be processed."""
+
+        update_type = UpdateType.detect(data)
+
+        if self.__update_types is not None and update_type not in self.__update_types:
+            return False
+
+        if self.__chat_ids is not None or self.__exclude_chat_ids is not None:
+            chat_id = raw_chat_id(update_type, data)
+            if chat_id is not None:
+                if self.__chat_ids is not None and chat_id not in self.__chat_ids:
+                    return False
+                if self.__exclude_chat_ids is not None and chat_id in self.__exclude_chat_ids:
+                    return False
+
+        if update_type not in _MESSAGE_UPDATES:
+            return True
+
+        message = data[update_type.value]
+
+        if self.__message_types is not None and MessageType.detect(message) not in self.__message_types:
+            return False
+
+        if self.__commands is not None and 'text' in message:
+            return message['text'].startswith(self.__commands)
+
+        return True
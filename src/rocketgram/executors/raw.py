@@ -0,0 +1,35 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+from typing import Dict, Optional
+
+from ..api import UpdateType
+
+
+def raw_chat_id(update_type: UpdateType, data: Dict) -> Optional[int]:
+    """Returns id of the chat of raw update if it exists."""
+
+    if update_type is UpdateType.unknown:
+        return None
+
+    obj = data[update_type.value]
+    chat = obj.get('chat')
+
+    if chat is None and update_type is UpdateType.callback_query:
+        chat = obj.get('message', {}).get('chat')
+
+    return chat['id'] if chat else None
+
+
+def raw_user_id(update_type: UpdateType, data: Dict) -> Optional[int]:
+    """Returns id of the user of raw update if it exists."""
+
+    if update_type is UpdateType.unknown:
+        return None
+
+    obj = data[update_type.value]
+    user = obj.get('from') or obj.get('user')
+
+    return user['id'] if user else None
@@ -0,0 +1,134 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from time import monotonic
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from ..bot import Bot
+
+
+def hashed_suffix(token: str) -> str:
+    """\
+    Returns webhook path suffix for the bot that does not contain its token.
+
+    Suffix consists of bot id and hash of the token, so it is stable and unique for the bot.
+    Use secret token to authenticate requests, path is not a secret.
+    """
+
+    bot_id = token.split(':', 1)[0]
+    digest = hashlib.sha256(token.encode()).hexdigest()[:32]
+    return f'{bot_id}/{digest}'
+
+
+class BotEntry:
+    """Bot registered in the executor."""
+
+    __slots__ = ('bot', 'path', 'initialized', 'last_seen', '_lock')
+
+    def __init__(self, bot: 'Bot', path: str, initialized: bool):
+        self.bot = bot
+        self.path = path
+        self.initialized = initialized
+        self.last_seen = monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        """Lock that serializes initialization and eviction of the bot."""
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+
+class BotRegistry:
+    """\
+    Registry of bots by webhook path.
+
+    Adding, removing and looking up bots take O(1). Initialized bots are kept
+    in order of their last use, so idle ones are found without scanning all bots.
+    """
+
+    __slots__ = ('__paths', '__entries', '__active')
+
+    def __init__(self):
+        self.__paths: Dict[str, BotEntry] = dict()
+        self.__entries: Dict['Bot', BotEntry] = dict()
+        self.__active: 'OrderedDict[Bot, BotEntry]' = OrderedDict()
+
+    @property
+    def bots(self) -> List['Bot']:
+        return list(self.__entries.keys())
+
+    @property
+    def active(self) -> int:
+        """Number of initialized bots."""
+
+        return len(self.__active)
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, bot: 'Bot') -> bool:
+        return bot in self.__entries
+
+    def add(self, path: str, bot: 'Bot', initialized: bool = True) -> BotEntry:
+        if bot in self.__entries:
+            raise ValueError('Bot already added.')
+        if path in self.__paths:
+            raise ValueError(f'Path `{path}` is already used by another bot.')
+
+        entry = BotEntry(bot, path, initialized)
+        self.__paths[path] = entry
+        self.__entries[bot] = entry
+        if initialized:
+            self.__active[bot] = entry
+
+        return entry
+
+    def remove(self, bot: 'Bot') -> BotEntry:
+        entry = self.__entries.pop(bot, None)
+        if entry is None:
+            raise ValueError('Bot was not found.')
+
+        del self.__paths[entry.path]
+        self.__active.pop(bot, None)
+
+        return entry
+
+    def get(self, path: str) -> Optional[BotEntry]:
+        """Returns entry of the bot for the webhook path."""
+
+        return self.__paths.get(path)
+
+    def entry(self, bot: 'Bot') -> Optional[BotEntry]:
+        return self.__entries.get(bot)
+
+    def touch(self, entry: BotEntry):
+        """Marks bot as used now."""
+
+        entry.last_seen = monotonic()
+        if entry.initialized:
+            self.__active[entry.bot] = entry
+            self.__active.move_to_end(entry.bot)
+
+    def deactivate(self, entry: BotEntry):
+        entry.initialized = False
+        self.__active.pop(entry.bot, None)
+
+    def idle(self, timeout: float) -> List[BotEntry]:
+        """Returns initialized bots that were not used for `timeout` seconds."""
+
+        before = monotonic() - timeout
+        result = list()
+        for entry in self.__active.values():
+            if entry.last_seen > before:
+                break
+            result.append(entry)
+        return result
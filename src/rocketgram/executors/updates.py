@@ -6,10 +6,15 @@
 import asyncio
 import logging
 import signal
+from dataclasses import dataclass
+from functools import partial
 from typing import TYPE_CHECKING, Union, Optional, Dict, List, Set
 
 from .executor import Executor
-from ..api import GetMe, GetUpdates, DeleteWebhook, UpdateType
+from .ordering import Ordering
+from .prefilter import PreFilter
+from .workers import WorkerPool
+from ..api import GetMe, GetUpdates, DeleteWebhook, Update, UpdateType, interning
 from ..errors import RocketgramNetworkError, RocketgramNetworkTimeoutError
 
 if TYPE_CHECKING:
@@ -18,13 +23,91 @@ if TYPE_CHECKING:
 logger = logging.getLogger('rocketgram.executors.updates')
 
 
+@dataclass(frozen=True)
+class _GetRawUpdates(GetUpdates):
+    """\
+    GetUpdates request that leaves updates unparsed,
+    so the executor can decide how to parse them.
+    """
+
+    @property
+    def method(self) -> str:
+        return GetUpdates.__name__
+
+    def parse_result(self, data) -> List[Dict]:
+        assert isinstance(data, list), "Should be list."
+        return data
+
+
+# Maximum number of updates telegram returns at once.
+GET_UPDATES_LIMIT = 100
+
+
+class _Capacity:
+    # Counter of updates being processed. Unlimited if limit is None.
+
+    __slots__ = ('limit', 'used', '_freed')
+
+    def __init__(self, limit: Optional[int]):
+        self.limit = limit
+        self.used = 0
+        self._freed: Optional[asyncio.Event] = None
+
+    def free(self) -> int:
+        return GET_UPDATES_LIMIT if self.limit is None else self.limit - self.used
+
+    async def wait(self):
+        while self.limit is not None and self.used >= self.limit:
+            if self._freed is None:
+                self._freed = asyncio.Event()
+            self._freed.clear()
+            await self._freed.wait()
+
+    def acquire(self):
+        self.used += 1
+
+    def release(self, *_):
+        self.used -= 1
+        if self._freed is not None:
+            self._freed.set()
+
+
 class UpdatesExecutor(Executor):
-    __slots__ = ('_timeout', '_bots', '_started')
+    """\
+    Executor that receives updates with long polling.
+
+    request_timeout: long polling timeout
+    lazy_parsing: parse incoming updates lazily
+    max_in_flight: maximum number of updates processed at the same time by each bot
+    max_in_flight_total: maximum number of updates processed at the same time by all bots
+    ordering: process updates with the same key (e.g. chat) one after another
+    workers: pool of worker processes that process updates instead of this process,
+             can't be used with ordering, updates are ordered by WorkerPool in workers
+
+    When the limit is reached, next updates are not requested until some of processing are done,
+    and GetUpdates asks only for the number of updates that can be processed right away.
+    """
+
+    __slots__ = ('_timeout', '_bots', '_prefilters', '_started', '_lazy_parsing', '_max_in_flight', '_capacities',
+                 '_total', '_ordering', '_workers')
+
+    def __init__(self, request_timeout=30, *, lazy_parsing: bool = False, max_in_flight: Optional[int] = None,
+                 max_in_flight_total: Optional[int] = None, ordering: Optional[Ordering] = None,
+                 workers: Optional[WorkerPool] = None):
+        assert max_in_flight is None or max_in_flight > 0, "max_in_flight should be positive!"
+        assert max_in_flight_total is None or max_in_flight_total > 0, "max_in_flight_total should be positive!"
+        assert ordering is None or workers is None, "ordering is not used with workers, pass it to WorkerPool!"
 
-    def __init__(self, request_timeout=30):
         self._timeout = request_timeout
+        self._lazy_parsing = lazy_parsing
+        self._max_in_flight = max_in_flight
+        self._ordering = ordering
+        self._workers = workers
 
         self._bots: Dict['Bot', Optional[asyncio.Task]] = dict()
+        self._prefilters: Dict['Bot', Optional[PreFilter]] = dict()
+        self._capacities: Dict['Bot', _Capacity] = dict()
+        self._total = _Capacity(max_in_flight_total)
         self._started = False
 
     @property
@@ -35,8 +118,17 @@ class UpdatesExecutor(Executor):
     def running(self) -> bool:
         return self._started
 
+    def in_flight(self, bot: Optional['Bot'] = None) -> int:
+        """Returns number of updates being processed by the bot or by all bots."""
+
+        if bot is None:
+            return self._total.used
+
+        capacity = self._capacities.get(bot)
+        return capacity.used if capacity else 0
+
     async def add_bot(self, bot: 'Bot', *, allowed_updates: Optional[List[UpdateType]] = None,
-                      drop_pending_updates: bool = False, **kwargs):
+                      drop_pending_updates: bool = False, prefilter: Optional[PreFilter] = None, **kwargs):
 
         assert not len(kwargs), "This method does not accept additional parameters!"
 
@@ -53,6 +145,8 @@ class UpdatesExecutor(Executor):
         logger.info('Added bot @%s', bot.name)
 
         self._bots[bot] = None
+        self._prefilters[bot] = prefilter
+        self._capacities[bot] = _Capacity(self._max_in_flight)
 
         await bot.send(DeleteWebhook(drop_pending_updates=drop_pending_updates))
 
@@ -68,6 +162,8 @@ class UpdatesExecutor(Executor):
 
         tasks = self._bots[bot]
         del self._bots[bot]
+        del self._prefilters[bot]
+        del self._capacities[bot]
 
         if tasks:
             await self._wait_tasks({tasks})
@@ -79,15 +175,62 @@ class UpdatesExecutor(Executor):
     async def _runner(self, bot: 'Bot', allowed_updates: Optional[List[UpdateType]] = None) -> Set[asyncio.Task]:
         offset = 0
         pending = set()
+        lazy = self._lazy_parsing or bot.lazy_parsing
+        prefilter = self._prefilters.get(bot)
+        capacity = self._capacities[bot]
+        total = self._total
+        ordering = self._ordering
+        workers = self._workers
         while True:
             try:
-                resp = await bot.send(GetUpdates(offset + 1, allowed_updates=allowed_updates, timeout=self._timeout))
-                for update in resp.result:
-                    if offset < update.update_id:
-                        offset = update.update_id
-
-                    task = asyncio.create_task(bot.process(self, update))
-                    task.done()
+                # backpressure: do not ask for updates until some can be processed
+                await capacity.wait()
+                await total.wait()
+
+                limit = min(capacity.free(), total.free(), GET_UPDATES_LIMIT)
+
+                request = _GetRawUpdates(offset + 1, limit=limit if limit < GET_UPDATES_LIMIT else None,
+                                         allowed_updates=allowed_updates, timeout=self._timeout)
+                resp = await bot.send(request)
+                for data in resp.result:
+                    if offset < data['update_id']:
+                        offset = data['update_id']
+
+                    if prefilter is not None and not prefilter(data):
+                        continue
+
+                    update = None
+                    if workers is None:
+                        try:
+                            with interning(bot.intern_cache):
+                                update = Update.parse(data, lazy=lazy)
+                        except Exception:  # noqa
+                            logger.exception('Got exception while parsing update `%s`:', data.get('update_id'))
+                            continue
+
+                    # other bots may take global capacity while this one was polling
+                    await total.wait()
+
+                    capacity.acquire()
+                    total.acquire()
+
+                    try:
+                        if workers is not None:
+                            # update is parsed and processed by the worker
+                            task = asyncio.create_task(workers.process(bot, data))
+                        elif ordering is None:
+                            task = asyncio.create_task(bot.process(self, update))
+                        else:
+                            task = ordering.create_task(update, partial(bot.process, self, update), bot)
+                    except Exception:  # noqa
+                        capacity.release()
+                        total.release()
+                        logger.exception('Got exception while starting processing of update `%s`:',
+                                         data.get('update_id'))
+                        continue
+
+                    task.add_done_callback(capacity.release)
+                    task.add_done_callback(total.release)
                     pending.add(task)
 
                 pending = {t for t in pending if not t.done()}
@@ -114,6 +257,9 @@ class UpdatesExecutor(Executor):
 
         logger.info("Starting with updates...")
 
+        if self._workers is not None:
+            await self._workers.start()
+
         for bot in self._bots:
             self._start_bot(bot)
 
@@ -147,17 +293,25 @@ class UpdatesExecutor(Executor):
 
         await self._wait_tasks(tasks)
 
+        if self._workers is not None:
+            await self._workers.stop()
+
         logger.info("Stopped.")
 
     @classmethod
     def run(cls, bots: Union['Bot', List['Bot']], *, allowed_updates: Optional[List[UpdateType]] = None,
             drop_pending_updates: bool = False, signals: tuple = (signal.SIGINT, signal.SIGTERM),
-            request_timeout: int = 30, shutdown_wait: int = 10):
+            request_timeout: int = 30, shutdown_wait: int = 10, lazy_parsing: bool = False,
+            prefilter: Optional[PreFilter] = None, max_in_flight: Optional[int] = None,
+            max_in_flight_total: Optional[int] = None, ordering: Optional[Ordering] = None,
+            workers: Optional[WorkerPool] = None):
 
-        executor = cls(request_timeout=request_timeout)
+        executor = cls(request_timeout=request_timeout, lazy_parsing=lazy_parsing, max_in_flight=max_in_flight,
+                       max_in_flight_total=max_in_flight_total, ordering=ordering, workers=workers)
 
         def add(bot: 'Bot'):
-            return executor.add_bot(bot, allowed_updates=allowed_updates, drop_pending_updates=drop_pending_updates)
+            return executor.add_bot(bot, allowed_updates=allowed_updates, drop_pending_updates=drop_pending_updates,
+                                    prefilter=prefilter)
 
         def remove(bot: 'Bot'):
             return executor.remove_bot(bot)
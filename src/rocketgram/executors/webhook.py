@@ -5,13 +5,21 @@
 
 import asyncio
 import logging
+import os
 import signal
+from contextlib import suppress
+from functools import partial
 from secrets import token_urlsafe
-from typing import TYPE_CHECKING, Union, Dict, List, Set, Optional, Type, Tuple
+from time import monotonic
+from typing import TYPE_CHECKING, Callable, Union, Dict, List, Set, Optional, Type, Tuple
 
 from .executor import Executor
+from .ordering import Ordering
+from .prefilter import PreFilter
+from .registry import BotRegistry, BotEntry, hashed_suffix
+from .workers import WorkerPool
 from ..api import Request, GetMe, SetWebhook, DeleteWebhook
-from ..api import UpdateType, InputFile
+from ..api import UpdateType, InputFile, Response
 from ..errors import RocketgramRequestError
 from ..json_adapters import BaseJsonAdapter, default_json_adapter
 from ..version import version
@@ -23,76 +31,169 @@ logger = logging.getLogger('rocketgram.executors.webhook')
 
 
 class WebhookExecutor(Executor):
+    """\
+    Base class for executors that receive updates with webhook.
+
+    reply_deadline: how long to wait for the update to be processed before answering to telegram.
+                    None waits until processing is done, so one request can be sent as webhook reply.
+                    0 answers right after the update is accepted, requests are always sent by the bot.
+                    Positive value waits up to this number of seconds, if processing is not done
+                    in time the answer is sent and webhook reply is sent by the bot later.
+    max_pending: maximum number of updates in processing, new updates are answered with 503 and
+                 Retry-After header when this limit is reached, so telegram redelivers them later
+    reuse_port: bind listening socket with SO_REUSEPORT
+    hashed_paths: use bot id and hash of the token as default webhook path instead of the token itself
+    lazy_init: initialize bots on the first update instead of when they are added
+    idle_timeout: shut down bots that did not receive updates for this number of seconds,
+                  they are initialized again on the next update
+    """
+
     HEADERS = {"Server": f"Rocketgram/{version()}", "Content-Type": "application/json"}
     HEADERS_ERROR = {"Server": f"Rocketgram/{version()}", "Content-Type": "text/plain"}
     HEADER_SECRET = "X-Telegram-Bot-Api-Secret-Token"
+    RETRY_AFTER = 1
 
     __slots__ = ('_base_url', '_base_path', '_host', '_port', '_bots', '_srv',
-                 '_started', '_tasks', '_dumps', '_loads', '_secret_token', '_secret_tokens')
+                 '_started', '_tasks', '_dumps', '_json_adapter', '_loads', '_secret_token', '_secret_tokens',
+                 '_prefilters', '_lazy_parsing', '_ordering', '_workers', '_reuse_port', '_reply_deadline',
+                 '_max_pending', '_pending', '_hashed_paths', '_lazy_init', '_idle_timeout', '_evictor')
 
     def __init__(self, base_url: str, base_path: str, *, host: str = 'localhost', port: int = 8080,
                  secret_token: Union[bool, str] = False,
-                 json_adapter: Type[BaseJsonAdapter] = default_json_adapter()):
+                 json_adapter: Type[BaseJsonAdapter] = default_json_adapter(), lazy_parsing: bool = False,
+                 ordering: Optional[Ordering] = None, workers: Optional[WorkerPool] = None,
+                 reuse_port: bool = False, reply_deadline: Optional[float] = None,
+                 max_pending: Optional[int] = None, hashed_paths: bool = False, lazy_init: bool = False,
+                 idle_timeout: Optional[float] = None):
+        assert idle_timeout is None or idle_timeout > 0, "idle_timeout should be positive!"
+        assert reply_deadline is None or reply_deadline >= 0, "reply_deadline should not be negative!"
+        assert max_pending is None or max_pending > 0, "max_pending should be positive!"
+        assert ordering is None or workers is None, "ordering is not used with workers, pass it to WorkerPool!"
 
         self._base_url = base_url
         self._base_path = base_path
         self._host = host
         self._port = port
+        self._reuse_port = reuse_port
 
         self._secret_token = secret_token
 
-        self._bots: Dict[str, 'Bot'] = dict()
+        self._bots = BotRegistry()
         self._secret_tokens: Dict['Bot', Optional[str]] = dict()
+        self._prefilters: Dict['Bot', Optional[PreFilter]] = dict()
 
         self._srv = None
         self._started = False
 
         self._loads = json_adapter.loads
         self._dumps = json_adapter.dumps
+        self._json_adapter = json_adapter
+
+        self._lazy_parsing = lazy_parsing
+        self._ordering = ordering
+        self._workers = workers
+
+        self._reply_deadline = reply_deadline
+        self._max_pending = max_pending
+        self._pending = 0
+
+        self._hashed_paths = hashed_paths
+        self._lazy_init = lazy_init
+        self._idle_timeout = idle_timeout
+        self._evictor: Optional[asyncio.Task] = None
 
         self._tasks: Dict['Bot', Set[asyncio.Task]] = dict()
 
     @property
     def bots(self) -> List['Bot']:
-        return list(self._bots.values())
+        return self._bots.bots
+
+    @property
+    def registry(self) -> BotRegistry:
+        """Registry of added bots."""
+
+        return self._bots
 
     @property
     def running(self) -> bool:
         return self._started
 
+    @property
+    def pending(self) -> int:
+        """Number of updates in processing."""
+
+        return self._pending
+
     def can_process_webhook_request(self, request: Request) -> bool:
-        return len(request.files()) == 0
+        return self._reply_deadline != 0 and len(request.files()) == 0
+
+    def _overloaded(self) -> bool:
+        return self._max_pending is not None and self._pending >= self._max_pending
+
+    def _track(self, bot: 'Bot', task: asyncio.Task):
+        # Counts task as pending until it is done.
+
+        self._pending += 1
+        self._tasks[bot].add(task)
+        task.add_done_callback(partial(self._untrack, bot))
+
+    def _untrack(self, bot: 'Bot', task: asyncio.Task):
+        self._pending -= 1
+        tasks = self._tasks.get(bot)
+        if tasks is not None:
+            tasks.discard(task)
+
+    def _send_late(self, bot: 'Bot', task: asyncio.Task):
+        # Sends webhook reply that was not ready before the deadline.
+
+        if task.cancelled() or task.exception() is not None or task.result() is None:
+            return
+
+        if bot not in self._tasks:
+            logger.error('Bot @%s was removed, late webhook reply dropped.', bot.name)
+            return
+
+        self._track(bot, asyncio.create_task(self.__send_late(bot, task.result())))
+
+    @staticmethod
+    async def __send_late(bot: 'Bot', request: Request):
+        try:
+            await bot.send(request)
+        except Exception:  # noqa
+            logger.exception('Got exception while sending late webhook reply:')
 
     async def add_bot(self, bot: 'Bot', *, allowed_updates: Optional[List[UpdateType]] = None,
                       drop_pending_updates: bool = False, certificate: Optional[InputFile] = None,
                       ip_address: Optional[str] = None, suffix: str = None, set_webhook: bool = True,
-                      secret_token: Optional[Union[bool, str]] = None, max_connections: int = None):
+                      secret_token: Optional[Union[bool, str]] = None, max_connections: int = None,
+                      prefilter: Optional[PreFilter] = None):
 
-        if bot in self._bots.values():
+        if bot in self._bots:
             raise ValueError('Bot already added.')
 
         if not suffix:
-            suffix = bot.token
+            suffix = hashed_suffix(bot.token) if self._hashed_paths else bot.token
 
         full_path = self._base_path + suffix
         full_url = self._base_url + suffix
 
-        if bot.name is None:
-            response = await bot.send(GetMe())
-            bot.name = response.result.username
-            logger.info('Bot authorized as @%s', response.result.username)
+        set_secret_token, secret_token = self._gen_secret_token(secret_token)
+        need_webhook = set_webhook or drop_pending_updates or set_secret_token
 
-        await bot.init(self)
+        # bot that sets webhook is initialized now anyway to send the request
+        initialize = not self._lazy_init or need_webhook
 
-        set_secret_token, secret_token = self._gen_secret_token(secret_token)
+        if initialize:
+            await self._init_bot(bot)
 
-        self._bots[full_path] = bot
+        self._bots.add(full_path, bot, initialized=initialize)
         self._secret_tokens[bot] = secret_token
+        self._prefilters[bot] = prefilter
         self._tasks[bot] = set()
 
-        logger.info('Added bot @%s', bot.name)
+        logger.info('Added bot @%s', bot.name or bot.token.split(':', 1)[0])
 
-        if set_webhook or drop_pending_updates or set_secret_token:
+        if need_webhook:
             swh = SetWebhook(full_url, certificate=certificate, ip_address=ip_address, allowed_updates=allowed_updates,
                              drop_pending_updates=drop_pending_updates, secret_token=secret_token,
                              max_connections=max_connections)
@@ -103,24 +204,30 @@ class WebhookExecutor(Executor):
             logger.debug('Updates dropped for @%s', bot.name)
 
     async def remove_bot(self, bot: 'Bot', delete_webhook: bool = True):
-        if bot not in self._bots.values():
-            raise ValueError('Bot was not found.')
-
-        self._bots = {k: v for k, v in self._bots.items() if v != bot}
+        entry = self._bots.remove(bot)
         del self._secret_tokens[bot]
+        del self._prefilters[bot]
 
         if bot in self._tasks:
             tasks = self._tasks[bot]
             del self._tasks[bot]
             await self._wait_tasks(tasks)
 
-        if delete_webhook:
-            try:
-                await bot.send(DeleteWebhook())
-            except RocketgramRequestError:
-                logger.error('Error while removing webhook for %s.' % bot.name)
+        async with entry.lock:
+            initialized = entry.initialized
 
-        await bot.shutdown(self)
+            if delete_webhook:
+                if not initialized:
+                    await self._init_bot(bot)
+                    initialized = True
+                try:
+                    await bot.send(DeleteWebhook())
+                except RocketgramRequestError:
+                    logger.error('Error while removing webhook for %s.' % bot.name)
+
+            if initialized:
+                await bot.shutdown(self)
+            entry.initialized = False
 
         logger.info('Removed bot @%s', bot.name)
 
@@ -132,6 +239,59 @@ class WebhookExecutor(Executor):
 
         return (True, token_urlsafe()) if secret_token is True else (False, secret_token)
 
+    async def _init_bot(self, bot: 'Bot'):
+        if bot.name is None:
+            response = await bot.send(GetMe())
+            bot.name = response.result.username
+            logger.info('Bot authorized as @%s', response.result.username)
+
+        await bot.init(self)
+
+    async def _activate(self, entry: BotEntry):
+        # Initializes lazily added or evicted bot before processing its update.
+
+        async with entry.lock:
+            if not entry.initialized and entry.bot in self._bots:
+                await self._init_bot(entry.bot)
+                entry.initialized = True
+                self._bots.touch(entry)
+                logger.debug('Bot @%s initialized.', entry.bot.name)
+
+    def _start_evictor(self):
+        if self._idle_timeout is not None and self._evictor is None:
+            self._evictor = asyncio.create_task(self.__evict())
+
+    async def _stop_evictor(self):
+        if self._evictor is not None:
+            self._evictor.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._evictor
+            self._evictor = None
+
+    async def __evict(self):
+        # Shuts down bots that were idle for idle_timeout. Cost depends on number of idle bots only.
+
+        timeout = self._idle_timeout
+
+        while True:
+            await asyncio.sleep(timeout / 2)
+
+            for entry in self._bots.idle(timeout):
+                if self._tasks.get(entry.bot):
+                    continue
+
+                async with entry.lock:
+                    if not entry.initialized or self._tasks.get(entry.bot) or \
+                            entry.last_seen > monotonic() - timeout:
+                        continue
+                    self._bots.deactivate(entry)
+                    try:
+                        await entry.bot.shutdown(self)
+                    except Exception:  # noqa
+                        logger.exception('Got exception while shutting down idle bot @%s:', entry.bot.name)
+
+                logger.debug('Idle bot @%s was shut down.', entry.bot.name)
+
     async def start(self):
         raise NotImplementedError
 
@@ -150,14 +310,21 @@ class WebhookExecutor(Executor):
             certificate: Optional[InputFile] = None, ip_address: Optional[str] = None,
             allowed_updates: Optional[List[UpdateType]] = None, drop_pending_updates: bool = False,
             signals: tuple = (signal.SIGINT, signal.SIGTERM), shutdown_wait: int = 10,
-            secret_token: Union[bool, str] = False, json_adapter: Type[BaseJsonAdapter] = default_json_adapter()):
+            secret_token: Union[bool, str] = False, json_adapter: Type[BaseJsonAdapter] = default_json_adapter(),
+            lazy_parsing: bool = False, prefilter: Optional[PreFilter] = None, ordering: Optional[Ordering] = None,
+            workers: Optional[WorkerPool] = None, reply_deadline: Optional[float] = None,
+            max_pending: Optional[int] = None, hashed_paths: bool = False, lazy_init: bool = False,
+            idle_timeout: Optional[float] = None):
 
-        executor = cls(base_url, base_path, host=host, port=port, secret_token=secret_token, json_adapter=json_adapter)
+        executor = cls(base_url, base_path, host=host, port=port, secret_token=secret_token, json_adapter=json_adapter,
+                       lazy_parsing=lazy_parsing, ordering=ordering, workers=workers, reply_deadline=reply_deadline,
+                       max_pending=max_pending, hashed_paths=hashed_paths, lazy_init=lazy_init,
+                       idle_timeout=idle_timeout)
 
         def add(bot: 'Bot'):
             return executor.add_bot(bot, certificate=certificate, ip_address=ip_address,
                                     allowed_updates=allowed_updates, drop_pending_updates=drop_pending_updates,
-                                    set_webhook=webhook_setup)
+                                    set_webhook=webhook_setup, prefilter=prefilter)
 
         def remove(bot: 'Bot'):
             return executor.remove_bot(bot, delete_webhook=webhook_remove)
@@ -167,3 +334,95 @@ class WebhookExecutor(Executor):
         logger.debug('Using base path: %s', base_path)
 
         cls._run(executor, add, remove, bots, signals, shutdown_wait=shutdown_wait)
+
+    @staticmethod
+    async def _send_once(bots: List['Bot'], request: Callable[['Bot'], Request]):
+        # Sends request for each bot through its connector without initializing bots themselves.
+
+        for bot in bots:
+            await bot.connector.init()
+            try:
+                req = request(bot)
+                response: Response = await bot.connector.send(bot.token, req)
+                if not response.ok:
+                    raise RocketgramRequestError.get_exception(req, response)
+            finally:
+                await bot.connector.shutdown()
+
+    @classmethod
+    def _run_worker(cls, factory: Callable[[], Union['Bot', List['Bot']]], base_url: str, base_path: str,
+                    options: dict, prefilter: Optional[PreFilter], shutdown_wait: int):
+
+        executor = cls(base_url, base_path, reuse_port=True, **options)
+
+        def add(bot: 'Bot'):
+            return executor.add_bot(bot, set_webhook=False, prefilter=prefilter)
+
+        def remove(bot: 'Bot'):
+            return executor.remove_bot(bot, delete_webhook=False)
+
+        logger.info('Starting webhook worker %s...', os.getpid())
+
+        cls._run(executor, add, remove, factory(), (signal.SIGTERM,), shutdown_wait=shutdown_wait)
+
+    @classmethod
+    def run_workers(cls, factory: Callable[[], Union['Bot', List['Bot']]], base_url: str, base_path: str, *,
+                    processes: Optional[int] = None, host: str = 'localhost', port: int = 8080,
+                    webhook_setup: bool = True, webhook_remove: bool = True, certificate: Optional[InputFile] = None,
+                    ip_address: Optional[str] = None, allowed_updates: Optional[List[UpdateType]] = None,
+                    drop_pending_updates: bool = False, signals: tuple = (signal.SIGINT, signal.SIGTERM),
+                    shutdown_wait: int = 10, secret_token: Union[bool, str] = False,
+                    json_adapter: Type[BaseJsonAdapter] = default_json_adapter(), lazy_parsing: bool = False,
+                    prefilter: Optional[PreFilter] = None, ordering: Optional[Ordering] = None,
+                    max_connections: Optional[int] = None, start_method: Optional[str] = None,
+                    reply_deadline: Optional[float] = None, max_pending: Optional[int] = None,
+                    hashed_paths: bool = False, lazy_init: bool = False, idle_timeout: Optional[float] = None):
+        """\
+        Runs bots in several processes that listen on the same host and port with SO_REUSEPORT.
+
+        Each process calls `factory()` to create its own bots. Webhooks are set and removed
+        once by the coordinating process, workers only serve incoming requests.
+        Workers that fail are started again. With `spawn` start method factory should be picklable.
+        """
+
+        processes = processes if processes is not None else os.cpu_count() or 1
+
+        # all workers should check the same secret token
+        if secret_token is True:
+            secret_token = token_urlsafe()
+
+        options = dict(host=host, port=port, secret_token=secret_token, json_adapter=json_adapter,
+                       lazy_parsing=lazy_parsing, ordering=ordering, reply_deadline=reply_deadline,
+                       max_pending=max_pending, hashed_paths=hashed_paths, lazy_init=lazy_init,
+                       idle_timeout=idle_timeout)
+
+        def bots() -> List['Bot']:
+            b = factory()
+            return list(b) if isinstance(b, (list, tuple)) else [b]
+
+        def set_webhook(bot: 'Bot') -> Request:
+            suffix = hashed_suffix(bot.token) if hashed_paths else bot.token
+            return SetWebhook(base_url + suffix, certificate=certificate, ip_address=ip_address,
+                              allowed_updates=allowed_updates, drop_pending_updates=drop_pending_updates,
+                              secret_token=secret_token or None, max_connections=max_connections)
+
+        async def setup():
+            if webhook_setup or drop_pending_updates or secret_token:
+                await cls._send_once(bots(), set_webhook)
+                logger.debug('Webhook setup done.')
+
+        async def teardown():
+            if webhook_remove:
+                try:
+                    await cls._send_once(bots(), lambda bot: DeleteWebhook())
+                except RocketgramRequestError:
+                    logger.error('Error while removing webhook.')
+
+        logger.info('Starting webhook executor with %s workers...', processes)
+        logger.debug('Using base url: %s', base_url)
+        logger.debug('Using base path: %s', base_path)
+
+        target = partial(cls._run_worker, factory, base_url, base_path, options, prefilter, shutdown_wait)
+
+        cls._run_workers(target, processes, setup, teardown, signals, shutdown_wait=shutdown_wait,
+                         start_method=start_method)
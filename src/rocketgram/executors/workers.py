@@ -0,0 +1,378 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import count
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Set, Type
+
+from .executor import Executor
+from .ordering import KeyFunc, Ordering, chat_key
+from .raw import raw_chat_id
+from ..api import Request, Update, UpdateType, interning
+from ..json_adapters import BaseJsonAdapter, default_json_adapter
+
+if TYPE_CHECKING:
+    from ..bot import Bot
+
+logger = logging.getLogger('rocketgram.executors.workers')
+
+RawKeyFunc = Callable[[Dict], Optional[Hashable]]
+
+_UPDATE = 'update'
+_DONE = 'done'
+_STOP = 'stop'
+
+
+def raw_chat_key(data: Dict) -> Optional[int]:
+    """Shards raw updates by chat."""
+
+    return raw_chat_id(UpdateType.detect(data), data)
+
+
+def _reader(conn, loop: asyncio.AbstractEventLoop, receive: Callable, closed: Callable):
+    # Reads messages from the pipe in a dedicated thread and passes them to the loop.
+
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            loop.call_soon_threadsafe(receive, message)
+
+        loop.call_soon_threadsafe(closed)
+    except RuntimeError:
+        # loop is already closed
+        pass
+
+
+class _WorkerExecutor(Executor):
+    # Executor seen by bots in the worker process.
+
+    __slots__ = ('_bots', '_replies')
+
+    def __init__(self, replies: bool):
+        self._bots: Dict[str, 'Bot'] = dict()
+        self._replies = replies
+
+    @property
+    def bots(self) -> List['Bot']:
+        return list(self._bots.values())
+
+    @property
+    def running(self) -> bool:
+        return True
+
+    def can_process_webhook_request(self, request: Request) -> bool:
+        return self._replies and len(request.files()) == 0
+
+
+async def _serve(conn, factory: Callable[[str], 'Bot'], ordering_key: Optional[KeyFunc], lazy_parsing: bool,
+                 json_adapter: Type[BaseJsonAdapter], replies: bool):
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    thread = threading.Thread(target=_reader, args=(conn, loop, queue.put_nowait, partial(queue.put_nowait, None)),
+                              daemon=True)
+    thread.start()
+
+    executor = _WorkerExecutor(replies)
+    ordering = Ordering(ordering_key) if ordering_key is not None else None
+    tasks: Set[asyncio.Task] = set()
+
+    def done(seq: int, task: asyncio.Task):
+        tasks.discard(task)
+
+        reply = None
+        if not task.cancelled() and task.exception() is None and task.result() is not None:
+            try:
+                reply = task.result().encode(json_adapter, with_method=True)
+            except Exception:  # noqa
+                logger.exception('Got exception while encoding webhook reply:')
+
+        try:
+            conn.send((_DONE, seq, reply))
+        except (BrokenPipeError, OSError):
+            logger.error('Front process is gone, reply dropped.')
+
+    while True:
+        message = await queue.get()
+        if message is None or message[0] == _STOP:
+            break
+
+        _, seq, token, name, data = message
+
+        try:
+            bot = executor._bots.get(token)
+            if bot is None:
+                bot = factory(token)
+                if bot.name is None:
+                    bot.name = name
+                await bot.init(executor)
+                executor._bots[token] = bot
+
+            with interning(bot.intern_cache):
+                update = Update.parse(data, lazy=lazy_parsing or bot.lazy_parsing)
+        except Exception:  # noqa
+            logger.exception('Got exception while parsing update:')
+            try:
+                conn.send((_DONE, seq, None))
+            except (BrokenPipeError, OSError):
+                logger.error('Front process is gone, reply dropped.')
+            continue
+
+        if ordering is None:
+            task = asyncio.create_task(bot.process(executor, update))
+        else:
+            task = ordering.create_task(update, partial(bot.process, executor, update), bot)
+        task.add_done_callback(partial(done, seq))
+        tasks.add(task)
+
+    if tasks:
+        await asyncio.wait(tasks)
+
+    for bot in executor.bots:
+        await bot.shutdown(executor)
+
+    conn.close()
+
+
+def _worker_main(conn, factory: Callable[[str], 'Bot'], ordering_key: Optional[KeyFunc], lazy_parsing: bool,
+                 json_adapter: Type[BaseJsonAdapter], replies: bool):
+    # Entry point of the worker process. Signals are handled by the front process that stops workers.
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    asyncio.run(_serve(conn, factory, ordering_key, lazy_parsing, json_adapter, replies))
+
+
+class _Worker:
+    # Front side of the worker process.
+
+    __slots__ = ('process', 'conn', 'sender', 'reader', 'futures', 'alive')
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.sender = ThreadPoolExecutor(max_workers=1)
+        self.reader: Optional[threading.Thread] = None
+        self.futures: Dict[int, asyncio.Future] = dict()
+        self.alive = True
+
+    def receive(self, message: Any):
+        _, seq, reply = message
+        future = self.futures.pop(seq, None)
+        if future is not None and not future.done():
+            future.set_result(reply)
+
+    def closed(self):
+        self.alive = False
+        futures, self.futures = self.futures, dict()
+        for future in futures.values():
+            if not future.done():
+                future.set_exception(ConnectionError('Worker process exited.'))
+
+
+class WorkerPool:
+    """\
+    Pool of worker processes that process updates received by the front executor.
+
+    Raw updates are sent to workers over pipes without parsing. Updates of the same chat
+    (see `key`) always go to the same worker, so conversations and ordering are kept.
+    Each worker runs its own bots created by `factory(token)` and sends requests
+    to telegram by itself. Webhook replies are encoded in the worker and returned to the front.
+
+    factory: picklable function that creates bot with its dispatcher for the given token
+    workers: number of worker processes, number of CPUs by default
+    key: function that returns sharding key of the raw update, updates without key are spread evenly
+    ordering: key function for ordering of updates inside worker, or None to process without ordering
+    lazy_parsing: parse updates lazily in workers
+    json_adapter: json adapter used to encode webhook replies
+    start_method: multiprocessing start method
+
+    Worker that exits unexpectedly is started again. Updates that were in work
+    or sent to the worker before it is restarted fail with ConnectionError.
+
+    Pass the pool to `UpdatesExecutor` or webhook executor as `workers`. Bots added to the front
+    executor are used only to receive updates, their routers do not process anything.
+    """
+
+    __slots__ = ('__factory', '__size', '__key', '__ordering', '__lazy_parsing', '__json_adapter', '__context',
+                 '__workers', '__counter', '__started', '__replies', '__restarts')
+
+    def __init__(self, factory: Callable[[str], 'Bot'], workers: Optional[int] = None, *,
+                 key: RawKeyFunc = raw_chat_key, ordering: Optional[KeyFunc] = chat_key, lazy_parsing: bool = False,
+                 json_adapter: Type[BaseJsonAdapter] = default_json_adapter(), start_method: str = 'spawn'):
+        size = workers if workers is not None else os.cpu_count() or 1
+        assert size > 0, "Number of workers should be positive!"
+
+        self.__factory = factory
+        self.__size = size
+        self.__key = key
+        self.__ordering = ordering
+        self.__lazy_parsing = lazy_parsing
+        self.__json_adapter = json_adapter
+        self.__context = multiprocessing.get_context(start_method)
+
+        self.__workers: List[_Worker] = list()
+        self.__counter = count()
+        self.__started = False
+        self.__replies = False
+        self.__restarts: Set[asyncio.Task] = set()
+
+    @property
+    def size(self) -> int:
+        """Number of worker processes."""
+
+        return self.__size
+
+    @property
+    def running(self) -> bool:
+        return self.__started
+
+    def pending(self) -> List[int]:
+        """Returns number of updates in work for each worker."""
+
+        return [len(w.futures) for w in self.__workers]
+
+    def shard(self, data: Dict, seq: int = 0) -> int:
+        """Returns index of the worker for the raw update."""
+
+        key = self.__key(data)
+        if key is None:
+            return seq % self.__size
+        return hash(key) % self.__size
+
+    async def start(self, *, webhook_replies: bool = False):
+        """\
+        Starts worker processes.
+
+        webhook_replies: workers may return one request as reply to the webhook
+        """
+
+        if self.__started:
+            return
+        self.__started = True
+        self.__replies = webhook_replies
+
+        loop = asyncio.get_running_loop()
+
+        for index in range(self.__size):
+            self.__workers.append(self.__spawn(loop, index))
+
+        logger.info('Started %s workers.', self.__size)
+
+    def __spawn(self, loop: asyncio.AbstractEventLoop, index: int) -> _Worker:
+        front, back = self.__context.Pipe()
+        process = self.__context.Process(target=_worker_main, daemon=True,
+                                         args=(back, self.__factory, self.__ordering, self.__lazy_parsing,
+                                               self.__json_adapter, self.__replies))
+        process.start()
+        back.close()
+
+        worker = _Worker(process, front)
+        worker.reader = threading.Thread(target=_reader,
+                                         args=(front, loop, worker.receive, partial(self.__closed, index, worker)),
+                                         daemon=True)
+        worker.reader.start()
+        return worker
+
+    def __closed(self, index: int, worker: _Worker):
+        # Called in the loop when pipe of the worker is closed.
+
+        worker.closed()
+
+        if not self.__started or index >= len(self.__workers) or self.__workers[index] is not worker:
+            return
+
+        task = asyncio.ensure_future(self.__restart(index, worker))
+        self.__restarts.add(task)
+        task.add_done_callback(self.__restarts.discard)
+
+    async def __restart(self, index: int, worker: _Worker):
+        loop = asyncio.get_running_loop()
+
+        await loop.run_in_executor(None, worker.process.join)
+        worker.conn.close()
+        worker.sender.shutdown(wait=False)
+
+        logger.error('Worker %s (pid %s) exited unexpectedly with code %s.', index, worker.process.pid,
+                     worker.process.exitcode)
+
+        if not self.__started or self.__workers[index] is not worker:
+            return
+
+        # starting process blocks, so it is done in a thread
+        self.__workers[index] = await loop.run_in_executor(None, self.__spawn, loop, index)
+        logger.info('Worker %s restarted as %s.', index, self.__workers[index].process.pid)
+
+    async def process(self, bot: 'Bot', data: Dict) -> Optional[bytes]:
+        """\
+        Sends raw update to the worker and waits until it is processed.
+
+        Returns encoded webhook reply if any.
+        """
+
+        assert self.__started, "Pool is not started!"
+
+        seq = next(self.__counter)
+        index = self.shard(data, seq)
+        worker = self.__workers[index]
+
+        if not worker.alive:
+            raise ConnectionError(f'Worker {index} is not running.')
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        worker.futures[seq] = future
+
+        try:
+            # single sender thread keeps order of updates sent to the worker
+            await loop.run_in_executor(worker.sender, worker.conn.send, (_UPDATE, seq, bot.token, bot.name, data))
+        except BaseException:
+            worker.futures.pop(seq, None)
+            raise
+
+        return await future
+
+    async def stop(self, timeout: float = 10):
+        """Stops workers after they finish updates in work."""
+
+        if not self.__started:
+            return
+        self.__started = False
+
+        loop = asyncio.get_running_loop()
+
+        if self.__restarts:
+            await asyncio.wait(set(self.__restarts))
+
+        workers, self.__workers = self.__workers, list()
+
+        for worker in workers:
+            try:
+                await loop.run_in_executor(worker.sender, worker.conn.send, (_STOP,))
+            except (BrokenPipeError, OSError):
+                pass
+
+        for worker in workers:
+            await loop.run_in_executor(None, worker.process.join, timeout)
+            if worker.process.is_alive():
+                logger.error('Worker %s did not stop in time, terminating.', worker.process.pid)
+                worker.process.terminate()
+                await loop.run_in_executor(None, worker.process.join)
+
+            worker.conn.close()
+            worker.sender.shutdown(wait=False)
+            worker.closed()
+
+        logger.info('Workers stopped.')
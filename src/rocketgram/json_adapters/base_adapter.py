@@ -3,7 +3,7 @@
 # Rocketgram is released under the MIT License (see LICENSE).
 
 
-from typing import Union, Any
+from typing import Union, Any, Callable
 
 
 class BaseJsonAdapter:
@@ -14,3 +14,13 @@ class BaseJsonAdapter:
     @staticmethod
     def loads(s: Union[str, bytes, bytearray], **kwargs) -> Any:
         raise NotImplementedError
+
+    @staticmethod
+    def encoder(default: Callable[[Any], Any]) -> Callable[[Any], bytes]:
+        """\
+        Returns function that serializes object directly to utf-8 encoded bytes.
+
+        Objects unknown to the serializer, including dataclasses, are passed to default.
+        """
+
+        raise NotImplementedError
@@ -3,6 +3,8 @@
 # Rocketgram is released under the MIT License (see LICENSE).
 
 
+from functools import partial
+
 import orjson
 
 from .base_adapter import BaseJsonAdapter
@@ -11,3 +13,8 @@ from .base_adapter import BaseJsonAdapter
 class OrJsonJsonAdapter(BaseJsonAdapter):
     dumps = staticmethod(orjson.dumps)
     loads = staticmethod(orjson.loads)
+
+    @staticmethod
+    def encoder(default):
+        return partial(orjson.dumps, default=default,
+                       option=orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME)
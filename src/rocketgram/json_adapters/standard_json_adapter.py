@@ -11,3 +11,8 @@ from .base_adapter import BaseJsonAdapter
 class StandardJsonAdapter(BaseJsonAdapter):
     dumps = staticmethod(json.dumps)
     loads = staticmethod(json.loads)
+
+    @staticmethod
+    def encoder(default):
+        encode = json.JSONEncoder(default=default, ensure_ascii=False, separators=(',', ':')).encode
+        return lambda obj: encode(obj).encode()
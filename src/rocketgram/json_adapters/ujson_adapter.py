@@ -3,6 +3,8 @@
 # Rocketgram is released under the MIT License (see LICENSE).
 
 
+from functools import partial
+
 import ujson
 
 from .base_adapter import BaseJsonAdapter
@@ -11,3 +13,8 @@ from .base_adapter import BaseJsonAdapter
 class UJsonJsonAdapter(BaseJsonAdapter):
     dumps = staticmethod(ujson.dumps)
     loads = staticmethod(ujson.loads)
+
+    @staticmethod
+    def encoder(default):
+        dumps = partial(ujson.dumps, default=default, ensure_ascii=False)
+        return lambda obj: dumps(obj).encode()
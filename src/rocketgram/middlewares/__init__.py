@@ -4,5 +4,5 @@
 
 
 from .defaultvalues import DefaultValuesMiddleware
-from .limiter import LimiterMiddleware
+from .limiter import LimiterMiddleware, LimitAction
 from .middleware import Middleware, EmptyMiddleware
@@ -3,39 +3,188 @@
 # Rocketgram is released under the MIT License (see LICENSE).
 
 
+import asyncio
+from collections import OrderedDict, deque
+from enum import Enum
 from time import monotonic
+from typing import Callable, Deque, Dict, Hashable, Optional, Tuple, Union
 
 from .middleware import EmptyMiddleware
 from ..context import context
 from ..errors import RocketgramStopRequest
 
+LimiterKeyFunc = Callable[[], Optional[Hashable]]
+
+
+class LimitAction(Enum):
+    """\
+    What to do with update that exceeds the limit.
+
+    drop: drop update
+    delay: process update when it fits the limit, drop it if it should wait longer than `max_delay`
+    queue: process update when it fits the limit, drop it if `max_queue` updates of the key already wait
+    """
+
+    drop = 'drop'
+    delay = 'delay'
+    queue = 'queue'
+
+
+def _chat_key() -> Optional[int]:
+    chat = context.chat
+    return chat.id if chat is not None else None
+
+
+def _user_key() -> Optional[int]:
+    user = context.user
+    return user.id if user is not None else None
+
+
+_KEYS: Dict[str, LimiterKeyFunc] = {
+    'bot': lambda: 0,
+    'chat': _chat_key,
+    'user': _user_key,
+}
+
+
+class _Window:
+    # Times of updates passed in the last period in ascending order.
+    # Delayed updates are recorded with the time they will be processed at.
+
+    __slots__ = ('times', 'waiting')
+
+    def __init__(self):
+        self.times: Deque[float] = deque()
+        self.waiting = 0
+
 
 class LimiterMiddleware(EmptyMiddleware):
     """\
-    This middleware pass no more than `quantity` messages per `period` seconds.
+    This middleware pass no more than `quantity` updates per `period` seconds.
+
+    Updates are counted in a sliding window separately for every key, so checking
+    the limit takes O(1) amortized time. Keys are scoped to the bot.
+
+    quantity: maximum number of updates in period
+    period: period in seconds
+    key: `bot`, `chat`, `user` or function that returns key of the current update,
+         updates without key (e.g. inline queries for `chat`) are not limited
+    action: what to do with update that exceeds the limit, see LimitAction
+    max_keys: maximum number of tracked keys, least recently used keys are forgotten
+    max_delay: maximum wait time for `delay` action, None for unlimited
+    max_queue: maximum number of waiting updates per key for `queue` action
     """
 
-    __slots__ = ('__quantity', '__period', '__values')
+    __slots__ = ('__quantity', '__period', '__key', '__action', '__max_keys', '__max_delay', '__max_queue',
+                 '__windows')
+
+    def __init__(self, quantity: int, period: float, *, key: Union[str, LimiterKeyFunc] = 'bot',
+                 action: Union[str, LimitAction] = LimitAction.drop, max_keys: int = 10000,
+                 max_delay: Optional[float] = None, max_queue: int = 100):
+        assert quantity > 0, "quantity should be positive!"
+        assert period > 0, "period should be positive!"
+        assert max_keys > 0, "max_keys should be positive!"
+        assert callable(key) or key in _KEYS, f"key should be callable or one of: {', '.join(_KEYS)}"
 
-    def __init__(self, quantity: int, period: float):
         self.__quantity = quantity
         self.__period = period
-        self.__values = dict()
+        self.__key = key if callable(key) else _KEYS[key]
+        self.__action = LimitAction(action)
+        self.__max_keys = max_keys
+        self.__max_delay = max_delay
+        self.__max_queue = max_queue
+
+        self.__windows: 'OrderedDict[Tuple[int, Hashable], _Window]' = OrderedDict()
+
+    @property
+    def quantity(self) -> int:
+        return self.__quantity
+
+    @property
+    def period(self) -> float:
+        return self.__period
+
+    @property
+    def action(self) -> LimitAction:
+        return self.__action
+
+    def __len__(self) -> int:
+        """Number of tracked keys."""
+
+        return len(self.__windows)
 
     def shutdown(self):
         bot_id = id(context.bot)
-        if bot_id in self.__values:
-            del self.__values[bot_id]
+        for k in [k for k in self.__windows if k[0] == bot_id]:
+            del self.__windows[k]
 
     def before_process(self):
-        bot_id = id(context.bot)
+        k = self.__key()
+        if k is None:
+            return None
+
         current = monotonic()
-        d = current - self.__period
+        windows = self.__windows
+        k = (id(context.bot), k)
+
+        window = windows.get(k)
+        if window is None:
+            self.__forget(current)
+            window = windows[k] = _Window()
+        else:
+            windows.move_to_end(k)
+
+        times = window.times
+        start = current - self.__period
+        while times and times[0] <= start:
+            times.popleft()
+
+        if len(times) < self.__quantity:
+            times.append(current)
+            return None
+
+        # time when the oldest update leaves the window,
+        # delayed update takes its place
+        at = times[0] + self.__period
+        wait = at - current
+
+        if self.__action is LimitAction.delay:
+            if self.__max_delay is not None and wait > self.__max_delay:
+                self.__drop()
+        elif self.__action is LimitAction.queue:
+            if window.waiting >= self.__max_queue:
+                self.__drop()
+        else:
+            self.__drop()
+
+        times.popleft()
+        times.append(at)
+        return self.__wait(window, wait)
+
+    @staticmethod
+    async def __wait(window: _Window, wait: float):
+        window.waiting += 1
+        try:
+            await asyncio.sleep(wait)
+        finally:
+            window.waiting -= 1
+
+    def __drop(self):
+        raise RocketgramStopRequest(f'Update `{context.update.update_id}` was dropped due to '
+                                    f'rate exceed `{self.__quantity}` msg per `{self.__period}` secs.')
+
+    def __forget(self, current: float):
+        # Removes least recently used keys that are idle or over the limit
+        # to make room for the new key.
 
-        self.__values[bot_id] = [v for v in self.__values.get(bot_id, list()) if v > d]
+        windows = self.__windows
+        start = current - self.__period
 
-        if len(self.__values[bot_id]) >= self.__quantity:
-            raise RocketgramStopRequest(f'Update `{context.update.update_id}` was dropped due to '
-                                        f'rate exceed `{self.__quantity}` msg per `{self.__period}` secs.')
+        while len(windows) >= self.__max_keys:
+            windows.popitem(last=False)
 
-        self.__values[bot_id].append(current)
+        while windows:
+            window = next(iter(windows.values()))
+            if window.waiting or (window.times and window.times[-1] > start):
+                break
+            windows.popitem(last=False)
@@ -8,4 +8,6 @@ from . import commonwaiters
 from .base import BaseDispatcher
 from .dispatcher import Dispatcher
 from .filters import make_filter, priority
+from .stepstore import StepStore, MemoryStepStore, SqliteStepStore, StepState, StepStoreStats
 from .waiters import make_waiter
+from .waiterstore import WaiterStore, MemoryWaiterStore, WaiterState, WaiterStoreStats
@@ -6,11 +6,13 @@
 import asyncio
 import logging
 from dataclasses import dataclass
-from inspect import isclass
-from typing import Callable, Coroutine, AsyncGenerator, Union, List
+from functools import partial
+from inspect import isawaitable, isclass, iscoroutinefunction
+from typing import Callable, Coroutine, AsyncGenerator, Union, List, Optional
 
 from .filters import FILTERS_ATTR, PRIORITY_ATTR, WAITER_ASSIGNED_ATTR, HANDLER_ASSIGNED_ATTR
 from .filters import FilterParams, _check_sig
+from .index import HandlerIndex
 from ..router import Router
 
 logger = logging.getLogger('rocketgram.dispatcher')
@@ -21,6 +23,7 @@ class Handler:
     priority: int
     handler: Union[Callable, Coroutine, AsyncGenerator]
     filters: List[FilterParams]
+    check: Optional[Callable[[], bool]] = None
 
 
 DEFAULT_PRIORITY = 1024
@@ -35,6 +38,49 @@ def _get_function(handler):
     return instance
 
 
+async def _finish_filters(result, checks: List[Callable]) -> bool:
+    # Continues compiled chain after filter declared as synchronous returned awaitable.
+
+    if not await result:
+        return False
+
+    for c in checks:
+        r = c()
+        if isawaitable(r):
+            r = await r
+        if not r:
+            return False
+
+    return True
+
+
+def _compile_filters(filters: List[FilterParams]) -> Optional[Callable[[], bool]]:
+    # Compiles chain of synchronous filters into one callable.
+    # Returns None if any filter is asynchronous, so the chain should be awaited.
+    # Filter that is not declared async may still return awaitable (e.g. instance
+    # with async __call__), in this case compiled check returns awaitable that
+    # finishes the chain, so caller should await it.
+
+    checks = [f.check if f.check is not None else partial(f.func, *f.args, **f.kwargs) for f in filters]
+
+    if any(iscoroutinefunction(c) for c in checks):
+        return None
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def check() -> bool:
+        for i, c in enumerate(checks):
+            r = c()
+            if r.__class__ is not bool and isawaitable(r):
+                return _finish_filters(r, checks[i + 1:])  # noqa
+            if not r:
+                return False
+        return True
+
+    return check
+
+
 async def _call_or_await(func, *args, **kwargs):
     r = func(*args, **kwargs)
     if asyncio.iscoroutine(r):
@@ -43,9 +89,9 @@ async def _call_or_await(func, *args, **kwargs):
 
 
 class BaseDispatcher(Router):
-    __slots__ = ('_init', '_shutdown', '_handlers', '_pre', '_post', '_default_priority', '_bots')
+    __slots__ = ('_init', '_shutdown', '_handlers', '_pre', '_post', '_default_priority', '_bots', '_index', '_debug')
 
-    def __init__(self, *, default_priority=DEFAULT_PRIORITY):
+    def __init__(self, *, default_priority=DEFAULT_PRIORITY, debug: bool = False):
         self._init = list()
         self._shutdown = list()
         self._handlers: List[Handler] = list()
@@ -53,17 +99,34 @@ class BaseDispatcher(Router):
         self._post: List[Handler] = list()
         self._default_priority = default_priority
         self._bots: int = 0
+        self._index: Optional[HandlerIndex] = None
+        self._debug = debug
 
     @property
     def default_priority(self):
         return self._default_priority
 
+    @property
+    def debug(self) -> bool:
+        """In debug mode filters are always awaited and checked to return bool."""
+
+        return self._debug
+
     def _resort_handlers(self):
         # sorting handlers by priority
         self._handlers = sorted(self._handlers, key=lambda handler: handler.priority)
         self._pre = sorted(self._pre, key=lambda handler: handler.priority)
         self._post = sorted(self._post, key=lambda handler: handler.priority)
 
+        # rebuilding handlers index
+        self._index = HandlerIndex(self._handlers)
+
+    @property
+    def index(self) -> HandlerIndex:
+        if self._index is None:
+            self._index = HandlerIndex(self._handlers)
+        return self._index
+
     @property
     def inits(self):
         return self._init
@@ -90,6 +153,7 @@ class BaseDispatcher(Router):
         self._handlers.extend(dispatcher.handlers)
         self._pre.extend(dispatcher.befores)
         self._post.extend(dispatcher.afters)
+        self._index = None
 
         # if handler added in runtime - resort handlers
         if self._bots:
@@ -144,9 +208,13 @@ class BaseDispatcher(Router):
         assert isinstance(filters, list), 'Handler function has wrong filters!'
         assert len(filters), 'Handler must have at least one filter!'
 
-        what.append(Handler(priority, function, filters))
+        # in debug mode filters are always run through the checking path
+        check = None if self._debug else _compile_filters(filters)
+
+        what.append(Handler(priority, function, filters, check))
 
         setattr(function, HANDLER_ASSIGNED_ATTR, True)
+        self._index = None
 
         # if handler added in runtime - resort handlers
         if self._bots:
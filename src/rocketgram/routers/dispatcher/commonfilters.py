@@ -3,12 +3,54 @@
 # Rocketgram is released under the MIT License (see LICENSE).
 
 
+from typing import Dict, Iterable, Tuple
+
 from .filters import make_filter
 from ...api import UpdateType, MessageType, ChatType
-from ...context import context
+from ...context import context, _update_cache
 
 
-@make_filter
+def _first_token(text: str, separator: str) -> Tuple[str, str]:
+    """Returns first token of the text as is and lowercased.
+    Tokens are cached for the current update, so all filters split the text once."""
+
+    cache = _update_cache()
+
+    key = ('token', text, separator)
+    token = cache.get(key)
+    if token is None:
+        raw = text.split(sep=separator, maxsplit=1)[0]
+        token = cache[key] = (raw, raw.lower())
+    return token
+
+
+class _PrefixTrie:
+    """Checks if text starts with one of the prefixes in O(len(prefix))."""
+
+    __slots__ = ('__root',)
+
+    def __init__(self, prefixes: Iterable[str]):
+        self.__root: Dict = dict()
+        for prefix in prefixes:
+            node = self.__root
+            for char in prefix:
+                node = node.setdefault(char, dict())
+            node[None] = True
+
+    def match(self, text: str) -> bool:
+        node = self.__root
+        if None in node:
+            return True
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                return False
+            if None in node:
+                return True
+        return False
+
+
+@make_filter(compiled=True)
 def command(*commands: str, case_sensitive: bool = False, separator: str = ' '):
     """Filters messages begin with one of the commands.
     Filters commands for other bots in groups.
@@ -21,29 +63,33 @@ def command(*commands: str, case_sensitive: bool = False, separator: str = ' '):
     :return: True or False
     """
 
-    if context.update.type is not UpdateType.message:
-        return False
+    commands = frozenset(commands if case_sensitive else (cmd.lower() for cmd in commands))
 
-    msg = context.message
-    if not msg:
-        return False
-    if msg.type is not MessageType.text:
-        return False
+    def check():
+        if context.update.type is not UpdateType.message:
+            return False
 
-    split = msg.text.split(sep=separator)
-    text = split[0] if case_sensitive else split[0].lower()
-    bot_name = context.bot.name if case_sensitive else context.bot.name.lower()
+        msg = context.message
+        if not msg:
+            return False
+        if msg.type is not MessageType.text:
+            return False
 
-    for cmd in commands:
-        if not case_sensitive:
-            cmd = cmd.lower()
-        if text == cmd or text == cmd + '@' + bot_name:
+        raw, lower = _first_token(msg.text, separator)
+        text = raw if case_sensitive else lower
+
+        if text in commands:
             return True
 
-    return False
+        bot_name = context.bot.name if case_sensitive else context.bot.name.lower()
+        cmd, at, name = text.rpartition('@')
 
+        return bool(at) and name == bot_name and cmd in commands
 
-@make_filter
+    return check
+
+
+@make_filter(compiled=True)
 def deeplink(*commands: str, case_sensitive: bool = False):
     """Filters deep links parameters passed to /start command.
     If no commands were present, then all deep links will be cached.
@@ -56,43 +102,37 @@ def deeplink(*commands: str, case_sensitive: bool = False):
     :return: True or False
     """
 
-    if context.update.type is not UpdateType.message:
-        return False
-
-    msg = context.message
-    if not msg:
-        return False
-    if msg.type is not MessageType.text:
-        return False
+    prefixes = _PrefixTrie(commands if case_sensitive else (cmd.lower() for cmd in commands)) if commands else None
 
-    text = msg.text
-    text_lw = msg.text.lower()
-    lw = '/start@%s ' % context.bot.name.lower()
+    def check():
+        if context.update.type is not UpdateType.message:
+            return False
 
-    if not (text.startswith('/start ') or text_lw.startswith(lw)):
-        return False
+        msg = context.message
+        if not msg:
+            return False
+        if msg.type is not MessageType.text:
+            return False
 
-    if not len(commands):
-        return True
+        text = msg.text
 
-    if not case_sensitive:
-        text = text_lw
+        if text.startswith('/start '):
+            param = text[7:]
+        else:
+            lw = '/start@%s ' % context.bot.name.lower()
+            if text[:len(lw)].lower() != lw:
+                return False
+            param = text[len(lw):]
 
-    if text.lower().startswith(lw):
-        text = msg.text[7 + len(lw):]
-    else:
-        text = msg.text[7:]
-
-    for cmd in commands:
-        if not case_sensitive:
-            cmd = cmd.lower()
-        if text.startswith(cmd):
+        if prefixes is None:
             return True
 
-    return False
+        return prefixes.match(param if case_sensitive else param.lower())
 
+    return check
 
-@make_filter
+
+@make_filter(compiled=True)
 def callback(*commands: str, case_sensitive: bool = False, separator=' '):
     """Filters a callback query begin with one of the commands.
     Assumes update_type == callback_query.
@@ -104,27 +144,24 @@ def callback(*commands: str, case_sensitive: bool = False, separator=' '):
     :return: True or False
     """
 
-    if context.update.type is not UpdateType.callback_query:
-        return False
+    commands = frozenset(commands if case_sensitive else (cmd.lower() for cmd in commands))
 
-    if context.update.callback_query.data is None:
-        return False
+    def check():
+        if context.update.type is not UpdateType.callback_query:
+            return False
 
-    split = context.update.callback_query.data.split(sep=separator)
-    text = split[0]
-    if not case_sensitive:
-        text = text.lower()
+        data = context.update.callback_query.data
+        if data is None:
+            return False
 
-    for cmd in commands:
-        if not case_sensitive:
-            cmd = cmd.lower()
-        if text == cmd:
-            return True
+        raw, lower = _first_token(data, separator)
 
-    return False
+        return (raw if case_sensitive else lower) in commands
 
+    return check
 
-@make_filter
+
+@make_filter(compiled=True)
 def game(*names: str, case_sensitive: bool = False):
     """Filters callback query if it is a game with one of certain names.
     Assumes update_type == callback_query.
@@ -135,23 +172,20 @@ def game(*names: str, case_sensitive: bool = False):
     :return: True or False
     """
 
-    if context.update.type is not UpdateType.callback_query:
-        return False
+    names = frozenset(names if case_sensitive else (name.lower() for name in names))
 
-    if context.update.callback_query.game_short_name is None:
-        return False
+    def check():
+        if context.update.type is not UpdateType.callback_query:
+            return False
 
-    text = context.update.callback_query.game_short_name.strip()
-    if not case_sensitive:
-        text = text.lower()
+        if context.update.callback_query.game_short_name is None:
+            return False
 
-    for name in names:
-        if not case_sensitive:
-            name = name.lower()
-        if text == name:
-            return True
+        text = context.update.callback_query.game_short_name.strip()
+
+        return (text if case_sensitive else text.lower()) in names
 
-    return False
+    return check
 
 
 @make_filter
@@ -171,7 +205,7 @@ def inline_callback():
     return True
 
 
-@make_filter
+@make_filter(compiled=True)
 def inline(*commands: str, case_sensitive: bool = False):
     """Filters inline_query begin with one of the commands.
     Assumes update_type is inline_query.
@@ -181,24 +215,20 @@ def inline(*commands: str, case_sensitive: bool = False):
     :return: True or False
     """
 
-    if context.update.type is not UpdateType.inline_query:
-        return False
+    prefixes = _PrefixTrie(commands if case_sensitive else (cmd.lower() for cmd in commands))
 
-    text = context.update.inline_query.query
+    def check():
+        if context.update.type is not UpdateType.inline_query:
+            return False
 
-    if not case_sensitive:
-        text = text.lower()
+        text = context.update.inline_query.query
 
-    for cmd in commands:
-        if not case_sensitive:
-            cmd = cmd.lower()
-        if text.startswith(cmd):
-            return True
+        return prefixes.match(text if case_sensitive else text.lower())
 
-    return False
+    return check
 
 
-@make_filter
+@make_filter(compiled=True)
 def chosen(*commands: str, case_sensitive: bool = False):
     """Filters chosen_inline_result with a query begins with one of the commands.
     Assumes update_type is chosen_inline_result.
@@ -209,24 +239,20 @@ def chosen(*commands: str, case_sensitive: bool = False):
     :return: True or False
     """
 
-    if context.update.type is not UpdateType.chosen_inline_result:
-        return False
+    prefixes = _PrefixTrie(commands if case_sensitive else (cmd.lower() for cmd in commands))
 
-    text = context.update.chosen_inline_result.query
+    def check():
+        if context.update.type is not UpdateType.chosen_inline_result:
+            return False
 
-    if not case_sensitive:
-        text = text.lower()
+        text = context.update.chosen_inline_result.query
 
-    for cmd in commands:
-        if not case_sensitive:
-            cmd = cmd.lower()
-        if text.startswith(cmd):
-            return True
+        return prefixes.match(text if case_sensitive else text.lower())
 
-    return False
+    return check
 
 
-@make_filter
+@make_filter(compiled=True)
 def update_type(*types: UpdateType):
     """Filters updates with selected types.
 
@@ -235,10 +261,15 @@ def update_type(*types: UpdateType):
     :return: True or False
     """
 
-    return context.update.type in types
+    types = frozenset(types)
 
+    def check():
+        return context.update.type in types
 
-@make_filter
+    return check
+
+
+@make_filter(compiled=True)
 def message_type(*types: MessageType):
     """Filters massage_type with one of selected types.
     Assumes update_type one of message, edited_message, channel_post, edited_channel_post.
@@ -247,15 +278,20 @@ def message_type(*types: MessageType):
     :return: True or False
     """
 
-    msg = context.message
+    types = frozenset(types)
 
-    if not msg:
-        return False
+    def check():
+        msg = context.message
 
-    return msg.type in types
+        if not msg:
+            return False
 
+        return msg.type in types
 
-@make_filter
+    return check
+
+
+@make_filter(compiled=True)
 def chat_type(*types: ChatType):
     """Filters chat_type with one of the selected types.
     Assumes update_type one of messages, edited_message, channel_post, edited_channel_post, callback_query.
@@ -266,12 +302,17 @@ def chat_type(*types: ChatType):
     :return: True or False
     """
 
-    ch = context.chat
+    types = frozenset(types)
 
-    if not ch:
-        return False
+    def check():
+        ch = context.chat
+
+        if not ch:
+            return False
+
+        return ch.type in types
 
-    return ch.type in types
+    return check
 
 
 @make_filter
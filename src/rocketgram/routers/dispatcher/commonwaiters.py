@@ -3,8 +3,11 @@
 # Rocketgram is released under the MIT License (see LICENSE).
 
 
+from typing import Any, Callable, Union
+
 from . import commonfilters
-from .waiters import make_waiter, DropWaiter
+from .filters import STEP_NAME_ATTR
+from .waiters import make_waiter, DropWaiter, NextStep, WaitNext
 from ...api import UpdateType, MessageType
 from ...context import context
 
@@ -36,3 +39,25 @@ def drop_waiter() -> DropWaiter:
     """
 
     return DropWaiter()
+
+
+def next_step(step: Union[str, Callable], wait: WaitNext, data: Any = None) -> NextStep:
+    """\
+    Continues conversation with the step when waiter passes.
+
+    Return it from a handler or a step. Unlike async generators, the state
+    of the step is plain data and is kept in the step store of dispatcher,
+    so conversation can be resumed by another process.
+
+    :param step: Step function registered with `Dispatcher.step` or its name.
+    :param wait: Waiter, e.g. `next_message()`.
+    :param data: Payload passed to the step, should be serializable by the step store.
+
+    :return: NextStep instance
+    """
+
+    if callable(step):
+        assert hasattr(step, STEP_NAME_ATTR), f'Function `{step.__name__}` is not registered as step!'
+        step = getattr(step, STEP_NAME_ATTR)
+
+    return NextStep(step, wait, data)
@@ -8,13 +8,17 @@ import logging
 import typing
 from contextlib import suppress
 from dataclasses import dataclass, replace
+from functools import partial
+from importlib import import_module
 from inspect import isawaitable, isasyncgenfunction, isasyncgen
 from time import time
 from typing import Tuple, List, Dict, Callable, Coroutine, AsyncGenerator, Union
 
 from .base import BaseDispatcher, DEFAULT_PRIORITY, _call_or_await
-from .filters import FilterParams, WAITER_ASSIGNED_ATTR
-from .waiters import WaitNext, DropWaiter
+from .filters import FilterParams, WAITER_ASSIGNED_ATTR, STEP_NAME_ATTR, _check_sig
+from .stepstore import StepStore, StepState, MemoryStepStore
+from .waiters import WaitNext, DropWaiter, NextStep
+from .waiterstore import WaiterStore, MemoryWaiterStore, _ref
 from ...api import UpdateType
 from ...context import context
 
@@ -22,6 +26,7 @@ logger = logging.getLogger('rocketgram.dispatcher')
 
 DEFAULT_WATIRES_LIFETIME = 60 * 60 * 24  # 1 day
 DEFAULT_WATIRES_LIFETIME_CHECK = 60 * 30  # 30 minutes
+DEFAULT_WATIRES_EXPIRE_BATCH = 100
 
 
 class HandlerNotFoundError(Exception):
@@ -41,21 +46,36 @@ class Waiter:
 def _user_scope():
     """Finds user scope for waits.
 
-    Valid user scope can be only for message or callback query in chats and groups."""
+    Valid user scope can be only for message or callback query in chats and groups.
+    Scope is the same in every process, so stored steps can be resumed by another one."""
 
     if context.update.type == UpdateType.message:
-        return f"{id(context.bot)}-{context.chat.id}-{context.user.id}"
+        return f"{context.bot.user_id}-{context.chat.id}-{context.user.id}"
     if context.update.type == UpdateType.callback_query:
         if context.message is None:
             return None
-        return f"{id(context.bot)}-{context.chat.id}-{context.user.id}"
+        return f"{context.bot.user_id}-{context.chat.id}-{context.user.id}"
 
 
-async def _run_filters(filters):
+def _resolve(ref: str):
+    # Imports object by `module:qualname` reference.
+
+    module, _, qualname = ref.partition(':')
+    obj = import_module(module)
+    for name in qualname.split('.'):
+        obj = getattr(obj, name)
+    return obj
+
+
+async def _run_filters(filters, debug: bool = False):
     for f in filters:
-        fr = await _call_or_await(f.func, *f.args, **f.kwargs)
-        assert isinstance(fr, bool), \
-            f'Filter `{f.func.__name__}` returns `{type(fr)}` while `bool` is expected!'
+        if f.check is not None:
+            fr = await _call_or_await(f.check)
+        else:
+            fr = await _call_or_await(f.func, *f.args, **f.kwargs)
+        if debug:
+            assert isinstance(fr, bool), \
+                f'Filter `{f.func.__name__}` returns `{type(fr)}` while `bool` is expected!'
         if not fr:
             return False
 
@@ -63,30 +83,150 @@ async def _run_filters(filters):
 
 
 class Dispatcher(BaseDispatcher):
-    __slots__ = ('__waiters', '__watires_lifetime', '__watires_lifetime_check', '__last_waiters_check')
+    __slots__ = ('__waiters', '__watires_lifetime_check', '__watires_expire_batch', '__expire_task',
+                 '__step_store', '__steps', '__step_waiters')
 
     def __init__(self, *, default_priority=DEFAULT_PRIORITY,
                  watires_lifetime=DEFAULT_WATIRES_LIFETIME,
-                 watires_lifetime_check=DEFAULT_WATIRES_LIFETIME_CHECK):
-        super().__init__(default_priority=default_priority)
-
-        self.__waiters: typing.Dict[str, Waiter] = dict()
-        self.__watires_lifetime = watires_lifetime
+                 watires_lifetime_check=DEFAULT_WATIRES_LIFETIME_CHECK, debug: bool = False,
+                 waiter_store: typing.Optional[WaiterStore] = None,
+                 watires_expire_batch: int = DEFAULT_WATIRES_EXPIRE_BATCH,
+                 step_store: typing.Optional[StepStore] = None):
+        super().__init__(default_priority=default_priority, debug=debug)
+
+        self.__waiters = waiter_store if waiter_store is not None else MemoryWaiterStore(watires_lifetime)
+        self.__step_store = step_store if step_store is not None else MemoryStepStore(watires_lifetime)
+        self.__steps: Dict[str, Callable] = dict()
+        self.__step_waiters: Dict[str, Callable] = dict()
         self.__watires_lifetime_check = watires_lifetime_check
-        self.__last_waiters_check = int(time())
+        self.__watires_expire_batch = watires_expire_batch
+        self.__expire_task: typing.Optional[asyncio.Task] = None
 
-    async def __find_waiter(self, scope):
-        if scope not in self.__waiters:
+    @property
+    def waiters(self) -> WaiterStore:
+        """Store of waiting async generators."""
+
+        return self.__waiters
+
+    @property
+    def steps(self) -> StepStore:
+        """Store of conversation steps."""
+
+        return self.__step_store
+
+    @property
+    def step_handlers(self) -> Dict[str, Callable]:
+        """Registered steps by name."""
+
+        return self.__steps
+
+    def from_dispatcher(self, dispatcher: 'BaseDispatcher'):
+        super().from_dispatcher(dispatcher)
+
+        if isinstance(dispatcher, Dispatcher):
+            for name, func in dispatcher.step_handlers.items():
+                assert self.__steps.get(name, func) is func, f'Step `{name}` already registered!'
+                self.__steps[name] = func
+
+    def step(self, name: Union[str, Callable]):
+        """\
+        Registers step of the conversation
+
+        Step is a function that takes payload passed to `commonwaiters.next_step`
+        and may return next step to continue conversation. Steps are found by name,
+        so every process that resumes conversations should register the same steps.
+
+        Can be used as `@dispatcher.step` with name `module:qualname` or `@dispatcher.step('name')`.
+        """
+
+        if callable(name):
+            return self.__register_step(_ref(name), name)
+
+        return partial(self.__register_step, name)
+
+    def __register_step(self, name: str, func: Callable):
+        assert _check_sig(func, None), f'Step `{name}` must take one argument!'
+        assert name not in self.__steps, f'Step `{name}` already registered!'
+        assert not hasattr(func, STEP_NAME_ATTR), 'Already registered as step!'
+
+        self.__steps[name] = func
+        setattr(func, STEP_NAME_ATTR, name)
+        return func
+
+    def __step_waiter(self, ref: str) -> Callable:
+        waiter = self.__step_waiters.get(ref)
+        if waiter is None:
+            waiter = self.__step_waiters[ref] = _resolve(ref)
+        return waiter
+
+    async def __find_step(self, scope) -> typing.Optional[StepState]:
+        state = self.__step_store.get(scope)
+        if state is None:
+            return
+
+        if state.step not in self.__steps:
+            logger.warning('Step `%s` is not registered, dropping it for scope `%s`.', state.step, scope)
+            self.__step_store.pop(scope)
             return
 
-        waiter = self.__waiters[scope]
+        wait = self.__step_waiter(state.waiter)(*state.args, **state.kwargs)
 
-        if not await _run_filters(waiter.filters):
+        if not await _run_filters(wait.filters, self._debug):
+            return
+        wr = await _call_or_await(wait.waiter, *wait.args, **wait.kwargs)
+
+        if self._debug:
+            assert isinstance(wr, bool), \
+                f'Waiter `{wait.waiter.__name__}` returns `{type(wr)}` while `bool` is expected!'
+
+        if not wr:
+            return
+
+        return state
+
+    async def __set_step(self, step: NextStep, scope):
+        assert step.step in self.__steps, f'Step `{step.step}` is not registered!'
+        assert isinstance(step.wait, WaitNext), \
+            f'Step `{step.step}` waits `{type(step.wait)}` while WaitNext is expected!'
+
+        ref = _ref(step.wait.waiter)
+        assert getattr(self.__step_waiter(ref), '__wrapped__', None) is step.wait.waiter, \
+            f'Waiter `{ref}` of step `{step.step}` can\'t be imported by reference!'
+
+        # step replaces running generator
+        old = self.__waiters.pop(scope)
+        if old is not None:
+            with suppress(StopAsyncIteration):
+                await old.handler.aclose()
+
+        self.__step_store.set(scope, step.step, ref, step.wait.args, step.wait.kwargs, step.data)
+
+    async def __run_step(self, state: StepState, scope):
+        try:
+            r = self.__steps[state.step](state.data)
+            if isawaitable(r):
+                r = await r
+        except BaseException:
+            self.__step_store.pop(scope)
+            raise
+
+        if isinstance(r, NextStep):
+            await self.__set_step(r, scope)
+        else:
+            self.__step_store.pop(scope)
+
+    async def __find_waiter(self, scope):
+        waiter = self.__waiters.get(scope)
+        if waiter is None:
+            return
+
+        if not await _run_filters(waiter.filters, self._debug):
             return
         wr = await _call_or_await(waiter.waiter, *waiter.args, **waiter.kwargs)
 
-        assert isinstance(wr, bool), \
-            f'Waiter `{waiter.waiter.__name__}` returns `{type(wr)}` while `bool` is expected!'
+        if self._debug:
+            assert isinstance(wr, bool), \
+                f'Waiter `{waiter.waiter.__name__}` returns `{type(wr)}` while `bool` is expected!'
 
         if not wr:
             return
@@ -107,10 +247,10 @@ class Dispatcher(BaseDispatcher):
 
         if isinstance(wait, DropWaiter):
             # drop current waiter
-            if scope in self.__waiters:
+            old = self.__waiters.pop(scope)
+            if old is not None:
                 with suppress(StopAsyncIteration):
-                    await self.__waiters[scope].handler.aclose()
-                del self.__waiters[scope]
+                    await old.handler.aclose()
 
             # re-run generator again
             await self.__run_generator(True, Waiter(int(time()), gen, lambda: True, (), {}, []), scope)
@@ -120,51 +260,65 @@ class Dispatcher(BaseDispatcher):
             f'Handler `{handler.handler.__name__}` sends waiting function not registered as waiter!'
 
         # Check if another waiter for scope already exists
-        if scope in self.__waiters and self.__waiters[scope].handler != gen:
+        old = self.__waiters.pop(scope)
+        if old is not None and old.handler != gen:
             logger.warning('Overriding old wait in `%s` by `%s` handler for update %s.',
-                           self.__waiters[scope].handler.__name__, gen.__name__, context.update.update_id)
+                           old.handler.__name__, gen.__name__, context.update.update_id)
             with suppress(StopAsyncIteration):
-                await self.__waiters[scope].handler.aclose()
+                await old.handler.aclose()
 
-        # If new wait exists set it for the scope, otherwise remove the scope from waiters
+        # If new wait exists set it for the scope
         if wait is not None:
-            self.__waiters[scope] = Waiter(int(time()), gen, wait.waiter, wait.args, wait.kwargs, wait.filters)
-        elif scope in self.__waiters:
-            del self.__waiters[scope]
+            self.__step_store.pop(scope)
+            self.__waiters.set(scope, Waiter(int(time()), gen, wait.waiter, wait.args, wait.kwargs, wait.filters))
 
     async def process(self):
         """Process new request."""
 
+        debug = self._debug
+
         try:
             # Run preprocessors...
             for pre in self._pre:
-                if await _run_filters(pre.filters):
+                r = pre.check() if pre.check is not None else await _run_filters(pre.filters, debug)
+                if r.__class__ is not bool and isawaitable(r):
+                    r = await r
+                if r:
                     await _call_or_await(pre.handler)
 
             a_next = False
             scope = _user_scope()
             handler = None
+            step = None
 
             # if it has user scope, try to find a handler that waits to continue
-            # processing through the async generators mechanism.
+            # processing through the async generators mechanism or a stored step.
             if scope:
                 handler = await self.__find_waiter(scope)
+                if not handler:
+                    step = await self.__find_step(scope)
             if handler:
                 a_next = True
 
             # Find a handler from the handlers list.
-            if not handler:
-                for h in self._handlers:
-                    if await _run_filters(h.filters):
+            if not handler and not step:
+                for h in self.index.candidates():
+                    r = h.check() if h.check is not None else await _run_filters(h.filters, debug)
+                    if r.__class__ is not bool and isawaitable(r):
+                        r = await r
+                    if r:
                         handler = h
                         break
 
             # No handlers found. Exiting.
-            if not handler:
+            if not handler and not step:
                 raise HandlerNotFoundError
 
             # Run handler...
-            if isasyncgenfunction(handler.handler) or isasyncgen(handler.handler):
+            if step:
+                # continue conversation from the stored step
+                await self.__run_step(step, scope)
+            elif isasyncgenfunction(handler.handler) or isasyncgen(handler.handler):
                 # handler is async generator...
                 if not scope:
                     msg = f'Found async generator `{handler.handler.__name__}` but user_scope' \
@@ -175,29 +329,70 @@ class Dispatcher(BaseDispatcher):
                 # This is a normal handler.
                 r = handler.handler()
                 if isawaitable(r):
-                    await r
+                    r = await r
+
+                # handler starts conversation with steps
+                if isinstance(r, NextStep):
+                    if not scope:
+                        msg = f'Handler `{handler.handler.__name__}` returns step but user_scope ' \
+                              f'is undefined for update `{context.update.update_id}`'
+                        raise TypeError(msg)
+                    await self.__set_step(r, scope)
 
             # Run postprocessors...
             for post in self._post:
-                if await _run_filters(post.filters):
+                r = post.check() if post.check is not None else await _run_filters(post.filters, debug)
+                if r.__class__ is not bool and isawaitable(r):
+                    r = await r
+                if r:
                     await _call_or_await(post.handler)
 
-            # Cleanup waiters:
-            current = int(time())
-            if current > self.__last_waiters_check + self.__watires_lifetime_check:
-                self.__last_waiters_check = current
-                _ = asyncio.create_task(self.__waiters_cleanup(current))
-
         except HandlerNotFoundError:
             logger.warning('Handler not found for update:\n%s', replace(context.update, raw=dict()))
 
-    async def __waiters_cleanup(self, current: int):
-        closes = list()
-        for k in list(self.__waiters.keys()):
-            wtr = self.__waiters[k]
-            if current - wtr.created > self.__watires_lifetime:
-                del self.__waiters[k]
-                closes.append(wtr)
-        for cl in closes:
-            with suppress(StopAsyncIteration):
-                await cl.handler.aclose()
+    async def init(self):
+        await super().init()
+
+        # first bot starts expiration of waiters
+        if self.__expire_task is None:
+            self.__expire_task = asyncio.create_task(self.__expire_waiters())
+
+    async def shutdown(self):
+        await super().shutdown()
+
+        # last bot stops expiration of waiters
+        if not self._bots and self.__expire_task is not None:
+            self.__expire_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.__expire_task
+            self.__expire_task = None
+            self.__step_store.close()
+
+    async def __expire_waiters(self):
+        # Closes expired waiters in bounded batches, yielding to other tasks between them,
+        # and sleeps until the nearest expiration. Cost depends only on number of expired waiters.
+
+        batch = self.__watires_expire_batch
+
+        while True:
+            expired = self.__waiters.pop_expired(limit=batch)
+            steps = self.__step_store.pop_expired(limit=batch)
+
+            for waiter in expired:
+                try:
+                    await waiter.handler.aclose()
+                except StopAsyncIteration:
+                    pass
+                except Exception:
+                    logger.exception('Error while closing expired waiter `%s`.', waiter.handler.__name__)
+
+            if len(expired) >= batch or steps >= batch:
+                await asyncio.sleep(0)
+                continue
+
+            delay = self.__watires_lifetime_check
+            for nearest in (self.__waiters.next_expiry(), self.__step_store.next_expiry()):
+                if nearest is not None:
+                    delay = min(delay, max(nearest - time(), 0))
+
+            await asyncio.sleep(delay)
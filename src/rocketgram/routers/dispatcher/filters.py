@@ -4,14 +4,15 @@
 
 
 from dataclasses import dataclass
-from functools import wraps
+from functools import wraps, partial
 from inspect import signature
-from typing import Union, Callable, Coroutine, Tuple, Dict
+from typing import Union, Callable, Coroutine, Tuple, Dict, Optional
 
 FILTERS_ATTR = 'rocketgram_dispatcher_filters'
 PRIORITY_ATTR = 'rocketgram_dispatcher_handler_priority'
 HANDLER_ASSIGNED_ATTR = 'rocketgram_dispatcher_handler_assigned'
 WAITER_ASSIGNED_ATTR = 'rocketgram_dispatcher_waiter_assigned'
+STEP_NAME_ATTR = 'rocketgram_dispatcher_step_name'
 
 
 @dataclass(frozen=True)
@@ -19,6 +20,7 @@ class FilterParams:
     func: Union[Callable, Coroutine]
     args: Tuple
     kwargs: Dict
+    check: Optional[Callable] = None
 
 
 def _check_sig(func, *args, **kwargs) -> bool:
@@ -30,8 +32,20 @@ def _check_sig(func, *args, **kwargs) -> bool:
         return False
 
 
-def make_filter(filter_func: Callable[..., bool]) -> Callable:
-    """Makes filter"""
+def make_filter(filter_func: Optional[Callable[..., bool]] = None, *, compiled: bool = False) -> Callable:
+    """\
+    Makes filter
+
+    Filters defined with `async def` are awaited, others are called synchronously
+    and handlers with only synchronous filters are checked without awaiting.
+
+    Compiled filters are called once when handler is decorated with arguments
+    passed to the filter and should return function without arguments
+    that checks current update. This allows to prepare arguments only once.
+    """
+
+    if filter_func is None:
+        return partial(make_filter, compiled=compiled)
 
     @wraps(filter_func)
     def outer(*args, **kwargs) -> Callable:
@@ -46,10 +60,13 @@ def make_filter(filter_func: Callable[..., bool]) -> Callable:
             assert _check_sig(filter_func, *args, **kwargs), \
                 f'Wrong arguments passed to filter `{filter_func.__name__}`!'
 
+            check = filter_func(*args, **kwargs) if compiled else partial(filter_func, *args, **kwargs)
+            assert callable(check), f'Compiled filter `{filter_func.__name__}` must return callable!'
+
             # Set property to handler function.
             params = getattr(handler_func, FILTERS_ATTR, list())
             assert isinstance(params, list), 'Handler function has wrong filters!'
-            params.insert(0, FilterParams(filter_func, args, kwargs))
+            params.insert(0, FilterParams(filter_func, args, kwargs, check))
             setattr(handler_func, FILTERS_ATTR, params)
 
             return handler_func
@@ -0,0 +1,165 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+from heapq import merge
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, FrozenSet
+
+from . import commonfilters
+from .filters import FilterParams
+from ...api import UpdateType, MessageType
+from ...context import context
+
+if TYPE_CHECKING:
+    from .base import Handler
+
+_Entry = Tuple[int, 'Handler']
+_Key = Tuple[UpdateType, Optional[MessageType]]
+
+# Requirements of the known filters. Filter can be matched only if update type
+# and type of message in context are in these sets. None means any.
+_TEXT = frozenset((MessageType.text,))
+_STATIC: Dict[Callable, Callable[[FilterParams], Tuple[Optional[FrozenSet], Optional[FrozenSet]]]] = {
+    commonfilters.command.__wrapped__: lambda f: (frozenset((UpdateType.message,)), _TEXT),
+    commonfilters.deeplink.__wrapped__: lambda f: (frozenset((UpdateType.message,)), _TEXT),
+    commonfilters.callback.__wrapped__: lambda f: (frozenset((UpdateType.callback_query,)), None),
+    commonfilters.game.__wrapped__: lambda f: (frozenset((UpdateType.callback_query,)), None),
+    commonfilters.inline_callback.__wrapped__: lambda f: (frozenset((UpdateType.callback_query,)), None),
+    commonfilters.inline.__wrapped__: lambda f: (frozenset((UpdateType.inline_query,)), None),
+    commonfilters.chosen.__wrapped__: lambda f: (frozenset((UpdateType.chosen_inline_result,)), None),
+    commonfilters.update_type.__wrapped__: lambda f: (frozenset(f.args), None),
+    commonfilters.message_type.__wrapped__: lambda f: (None, frozenset(f.args)),
+}
+
+# Filters that compare the first token of message text or callback data with the list of commands.
+_TOKENS = frozenset((commonfilters.command.__wrapped__, commonfilters.callback.__wrapped__))
+
+
+def _requirements(filters: List[FilterParams]) -> Tuple[Optional[FrozenSet], Optional[FrozenSet]]:
+    # Intersects requirements of all known filters of the handler.
+
+    update_types = message_types = None
+    for f in filters:
+        static = _STATIC.get(f.func)
+        if static is None:
+            continue
+        ut, mt = static(f)
+        if ut is not None:
+            update_types = ut if update_types is None else update_types & ut
+        if mt is not None:
+            message_types = mt if message_types is None else message_types & mt
+    return update_types, message_types
+
+
+def _tokens(filters: List[FilterParams]) -> Optional[Tuple[str, FrozenSet[str]]]:
+    # Returns separator and lowercased commands if handler has command or callback filter.
+
+    for f in filters:
+        if f.func in _TOKENS:
+            return f.kwargs.get('separator', ' '), frozenset(c.lower() for c in f.args)
+    return None
+
+
+class _Bucket:
+    # Candidates for the (update type, message type) pair.
+    # Handlers that has command or callback filter are additionally indexed by the token.
+
+    __slots__ = ('plain', 'tokens', 'separators', 'handlers')
+
+    def __init__(self):
+        self.plain: List[_Entry] = list()
+        self.tokens: Dict[Tuple[str, str], List[_Entry]] = dict()
+        self.separators: Tuple[str, ...] = ()
+        self.handlers: List['Handler'] = list()
+
+    def add(self, entry: _Entry, tokens: Optional[Tuple[str, FrozenSet[str]]]):
+        if tokens is None:
+            self.plain.append(entry)
+            return
+
+        separator, commands = tokens
+        if separator not in self.separators:
+            self.separators += (separator,)
+        for command in commands:
+            self.tokens.setdefault((separator, command), list()).append(entry)
+
+    def candidates(self, text: Optional[str]) -> List['Handler']:
+        if not self.tokens:
+            return self.handlers
+
+        if text is None:
+            return [h for _, h in self.plain]
+
+        bot_suffix = '@' + context.bot.name.lower() if context.bot and context.bot.name else None
+
+        lists = [self.plain]
+        for separator in self.separators:
+            _, token = commonfilters._first_token(text, separator)
+            if bot_suffix and token.endswith(bot_suffix):
+                lists.append(self.tokens.get((separator, token[:-len(bot_suffix)]), ()))
+            lists.append(self.tokens.get((separator, token), ()))
+
+        lists = [lst for lst in lists if lst]
+        if len(lists) == 1:
+            return [h for _, h in lists[0]]
+
+        # merge keeping priority order and skipping duplicates
+        result = list()
+        last = -1
+        for idx, h in merge(*lists, key=lambda e: e[0]):
+            if idx != last:
+                result.append(h)
+                last = idx
+        return result
+
+
+class HandlerIndex:
+    """\
+    Index of handlers by update type, message type and command or callback token.
+
+    Built from well known common filters. Handlers with other filters are
+    treated as matching anything, so candidates always keep all handlers
+    that may match in their priority order. Filters are still run for candidates.
+    """
+
+    __slots__ = ('__handlers', '__requirements', '__buckets')
+
+    def __init__(self, handlers: List['Handler']):
+        self.__handlers = handlers
+        self.__requirements = [(_requirements(h.filters), _tokens(h.filters)) for h in handlers]
+        self.__buckets: Dict[_Key, _Bucket] = dict()
+
+    def __bucket(self, key: _Key) -> _Bucket:
+        update_type, message_type = key
+        bucket = _Bucket()
+
+        for idx, (handler, ((update_types, message_types), tokens)) in enumerate(
+                zip(self.__handlers, self.__requirements)):
+            if update_types is not None and update_type not in update_types:
+                continue
+            if message_types is not None and message_type not in message_types:
+                continue
+            bucket.add((idx, handler), tokens)
+
+        bucket.handlers = [h for _, h in bucket.plain]
+        self.__buckets[key] = bucket
+        return bucket
+
+    def candidates(self) -> List['Handler']:
+        """Returns handlers that may match current update in the priority order."""
+
+        update = context.update
+        message = context.message
+
+        key = (update.type, message.type if message is not None else None)
+        bucket = self.__buckets.get(key) or self.__bucket(key)
+
+        text = None
+        if bucket.tokens:
+            if update.type is UpdateType.message:
+                text = message.text
+            elif update.type is UpdateType.callback_query:
+                text = update.callback_query.data
+
+        return bucket.candidates(text)
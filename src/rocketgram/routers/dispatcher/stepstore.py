@@ -0,0 +1,316 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import heapq
+import os
+import pickle
+import sqlite3
+from dataclasses import dataclass
+from itertools import count
+from time import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class StepState:
+    """\
+    State of the conversation that waits for the next step.
+
+    Unlike running generators this state is plain data,
+    so it can be persisted and resumed by another process.
+
+    scope: user scope of the conversation
+    step: name of the step registered in dispatcher
+    waiter: reference of the waiter as `module:qualname`
+    args: waiter arguments
+    kwargs: waiter keyword arguments
+    data: payload passed to the step
+    created: unix time when step was set
+    expires: unix time when step expires
+    """
+
+    scope: str
+    step: str
+    waiter: str
+    args: Tuple
+    kwargs: Dict[str, Any]
+    data: Any
+    created: float
+    expires: float
+
+
+@dataclass(frozen=True)
+class StepStoreStats:
+    """\
+    Snapshot of the step store state.
+
+    steps: number of stored steps
+    expired: total number of expired steps removed by this store instance
+    size: total size of serialized states in bytes
+    next_expiry: unix time of the nearest expiration or None
+    """
+
+    steps: int
+    expired: int
+    size: int
+    next_expiry: Optional[float]
+
+
+class StepStore:
+    """\
+    Base class for step stores.
+
+    States are serialized with `dumps` and restored with `loads`,
+    so payload and waiter arguments should be serializable by them.
+
+    lifetime: seconds after which step expires
+    dumps: function that serializes state to bytes, pickle by default
+    loads: function that restores state from bytes, pickle by default
+    """
+
+    __slots__ = ('_lifetime', '_dumps', '_loads')
+
+    def __init__(self, lifetime: float, *, dumps: Callable[[Any], bytes] = pickle.dumps,
+                 loads: Callable[[bytes], Any] = pickle.loads):
+        self._lifetime = lifetime
+        self._dumps = dumps
+        self._loads = loads
+
+    @property
+    def lifetime(self) -> float:
+        return self._lifetime
+
+    def _encode(self, state: StepState) -> bytes:
+        return self._dumps((state.step, state.waiter, state.args, state.kwargs, state.data))
+
+    def _decode(self, scope: str, raw: bytes, created: float, expires: float) -> StepState:
+        step, waiter, args, kwargs, data = self._loads(raw)
+        return StepState(scope, step, waiter, tuple(args), dict(kwargs), data, created, expires)
+
+    def get(self, scope: str) -> Optional[StepState]:
+        """Returns not expired step for the scope."""
+
+        raise NotImplementedError
+
+    def set(self, scope: str, step: str, waiter: str, args: Tuple, kwargs: Dict[str, Any], data: Any,
+            created: Optional[float] = None) -> StepState:
+        """Sets step for the scope replacing existing one and returns its state."""
+
+        raise NotImplementedError
+
+    def pop(self, scope: str) -> Optional[StepState]:
+        """Removes step for the scope and returns its state."""
+
+        raise NotImplementedError
+
+    def pop_expired(self, now: Optional[float] = None, limit: Optional[int] = None) -> int:
+        """Removes at most `limit` expired steps and returns their number."""
+
+        raise NotImplementedError
+
+    def next_expiry(self) -> Optional[float]:
+        """Returns unix time of the nearest expiration."""
+
+        raise NotImplementedError
+
+    def stats(self) -> StepStoreStats:
+        raise NotImplementedError
+
+    def close(self):
+        """Releases resources of the store."""
+
+        pass
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryStepStore(StepStore):
+    """\
+    In-memory step store.
+
+    States are kept serialized, so they behave the same way as in persistent stores.
+    Expiration times are kept in a min-heap like in MemoryWaiterStore.
+    """
+
+    __slots__ = ('__steps', '__heap', '__counter', '__expired', '__size')
+
+    def __init__(self, lifetime: float, *, dumps: Callable[[Any], bytes] = pickle.dumps,
+                 loads: Callable[[bytes], Any] = pickle.loads):
+        super().__init__(lifetime, dumps=dumps, loads=loads)
+
+        self.__steps: Dict[str, Tuple[bytes, float, float, int]] = dict()
+        self.__heap: List[Tuple[float, int, str]] = list()
+        self.__counter = count()
+        self.__expired = 0
+        self.__size = 0
+
+    def get(self, scope: str) -> Optional[StepState]:
+        entry = self.__steps.get(scope)
+        if entry is None or entry[2] <= time():
+            return None
+        return self._decode(scope, *entry[:3])
+
+    def set(self, scope: str, step: str, waiter: str, args: Tuple, kwargs: Dict[str, Any], data: Any,
+            created: Optional[float] = None) -> StepState:
+        created = time() if created is None else created
+        state = StepState(scope, step, waiter, args, kwargs, data, created, created + self._lifetime)
+        raw = self._encode(state)
+
+        self.__remove(scope)
+        seq = next(self.__counter)
+        self.__steps[scope] = (raw, state.created, state.expires, seq)
+        self.__size += len(raw)
+        heapq.heappush(self.__heap, (state.expires, seq, scope))
+
+        if len(self.__heap) > 2 * len(self.__steps) + 64:
+            self.__heap = [(expires, seq, scope) for scope, (_, _, expires, seq) in self.__steps.items()]
+            heapq.heapify(self.__heap)
+
+        return state
+
+    def pop(self, scope: str) -> Optional[StepState]:
+        entry = self.__remove(scope)
+        return self._decode(scope, *entry[:3]) if entry else None
+
+    def pop_expired(self, now: Optional[float] = None, limit: Optional[int] = None) -> int:
+        now = time() if now is None else now
+        heap = self.__heap
+        steps = self.__steps
+        removed = 0
+
+        while heap and heap[0][0] <= now and (limit is None or removed < limit):
+            _, seq, scope = heapq.heappop(heap)
+            entry = steps.get(scope)
+            if entry is None or entry[3] != seq:
+                # outdated heap entry
+                continue
+            self.__remove(scope)
+            removed += 1
+
+        self.__expired += removed
+        return removed
+
+    def next_expiry(self) -> Optional[float]:
+        heap = self.__heap
+        steps = self.__steps
+
+        # drop outdated entries from the top
+        while heap:
+            _, seq, scope = heap[0]
+            entry = steps.get(scope)
+            if entry is not None and entry[3] == seq:
+                return heap[0][0]
+            heapq.heappop(heap)
+
+        return None
+
+    def stats(self) -> StepStoreStats:
+        return StepStoreStats(len(self.__steps), self.__expired, self.__size, self.next_expiry())
+
+    def __len__(self) -> int:
+        return len(self.__steps)
+
+    def __remove(self, scope: str) -> Optional[Tuple[bytes, float, float, int]]:
+        entry = self.__steps.pop(scope, None)
+        if entry is not None:
+            self.__size -= len(entry[0])
+        return entry
+
+
+class SqliteStepStore(StepStore):
+    """\
+    Step store persisted in SQLite database.
+
+    Conversations survive restarts and can be resumed by any process
+    that uses the same database file and registers the same steps,
+    e.g. workers started by `run_workers`. Every process opens
+    its own connection on first use.
+
+    path: path to the database file
+    table: name of the table, created if not exists
+    """
+
+    __slots__ = ('__path', '__table', '__conn', '__pid', '__expired')
+
+    def __init__(self, path: str, lifetime: float, *, table: str = 'rocketgram_steps',
+                 dumps: Callable[[Any], bytes] = pickle.dumps, loads: Callable[[bytes], Any] = pickle.loads):
+        assert table.isidentifier(), "table should be valid identifier!"
+
+        super().__init__(lifetime, dumps=dumps, loads=loads)
+
+        self.__path = path
+        self.__table = table
+        self.__conn: Optional[sqlite3.Connection] = None
+        self.__pid: Optional[int] = None
+        self.__expired = 0
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def __db(self) -> sqlite3.Connection:
+        # Connection can't be shared with forked processes, so it is reopened in the child.
+        if self.__conn is None or self.__pid != os.getpid():
+            conn = sqlite3.connect(self.__path, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(f'CREATE TABLE IF NOT EXISTS {self.__table} '
+                         f'(scope TEXT PRIMARY KEY, state BLOB NOT NULL, created REAL NOT NULL, expires REAL NOT NULL)')
+            conn.execute(f'CREATE INDEX IF NOT EXISTS {self.__table}_expires ON {self.__table} (expires)')
+            self.__conn = conn
+            self.__pid = os.getpid()
+        return self.__conn
+
+    def get(self, scope: str) -> Optional[StepState]:
+        row = self.__db().execute(f'SELECT state, created, expires FROM {self.__table} '
+                                  f'WHERE scope = ? AND expires > ?', (scope, time())).fetchone()
+        return self._decode(scope, *row) if row else None
+
+    def set(self, scope: str, step: str, waiter: str, args: Tuple, kwargs: Dict[str, Any], data: Any,
+            created: Optional[float] = None) -> StepState:
+        created = time() if created is None else created
+        state = StepState(scope, step, waiter, args, kwargs, data, created, created + self._lifetime)
+
+        self.__db().execute(f'INSERT OR REPLACE INTO {self.__table} (scope, state, created, expires) '
+                            f'VALUES (?, ?, ?, ?)', (scope, self._encode(state), state.created, state.expires))
+        return state
+
+    def pop(self, scope: str) -> Optional[StepState]:
+        db = self.__db()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            row = db.execute(f'SELECT state, created, expires FROM {self.__table} WHERE scope = ?',
+                             (scope,)).fetchone()
+            if row:
+                db.execute(f'DELETE FROM {self.__table} WHERE scope = ?', (scope,))
+        finally:
+            db.execute('COMMIT')
+
+        return self._decode(scope, *row) if row else None
+
+    def pop_expired(self, now: Optional[float] = None, limit: Optional[int] = None) -> int:
+        now = time() if now is None else now
+        cursor = self.__db().execute(f'DELETE FROM {self.__table} WHERE scope IN '
+                                     f'(SELECT scope FROM {self.__table} WHERE expires <= ? '
+                                     f'ORDER BY expires LIMIT ?)', (now, -1 if limit is None else limit))
+        self.__expired += cursor.rowcount
+        return cursor.rowcount
+
+    def next_expiry(self) -> Optional[float]:
+        return self.__db().execute(f'SELECT MIN(expires) FROM {self.__table}').fetchone()[0]
+
+    def stats(self) -> StepStoreStats:
+        steps, size, nearest = self.__db().execute(f'SELECT COUNT(*), TOTAL(LENGTH(state)), MIN(expires) '
+                                                   f'FROM {self.__table}').fetchone()
+        return StepStoreStats(steps, self.__expired, int(size), nearest)
+
+    def close(self):
+        if self.__conn is not None and self.__pid == os.getpid():
+            self.__conn.close()
+        self.__conn = None
+        self.__pid = None
+
+    def __len__(self) -> int:
+        return self.__db().execute(f'SELECT COUNT(*) FROM {self.__table}').fetchone()[0]
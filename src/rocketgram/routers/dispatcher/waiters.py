@@ -5,7 +5,7 @@
 
 from dataclasses import dataclass
 from functools import wraps
-from typing import List, Union, Callable, Coroutine, Tuple, Dict
+from typing import Any, List, Union, Callable, Coroutine, Tuple, Dict
 
 from .filters import FILTERS_ATTR, PRIORITY_ATTR, HANDLER_ASSIGNED_ATTR, WAITER_ASSIGNED_ATTR
 from .filters import _check_sig, FilterParams
@@ -24,6 +24,13 @@ class DropWaiter:
     pass
 
 
+@dataclass(frozen=True)
+class NextStep:
+    step: str
+    wait: WaitNext
+    data: Any
+
+
 def make_waiter(waiter_func: Callable[..., bool]) -> Callable:
     """Make waiter"""
 
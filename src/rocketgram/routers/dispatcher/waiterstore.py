@@ -0,0 +1,222 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import heapq
+from dataclasses import dataclass
+from itertools import count
+from sys import getsizeof
+from time import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Any
+
+if TYPE_CHECKING:
+    from .dispatcher import Waiter
+
+
+def _ref(func) -> str:
+    # Returns importable reference of the function.
+
+    return f'{getattr(func, "__module__", "?")}:{getattr(func, "__qualname__", repr(func))}'
+
+
+@dataclass(frozen=True)
+class WaiterState:
+    """\
+    Serializable description of the waiter.
+
+    Running generator can't be serialized, so this state is for inspecting
+    conversations: which handler waits for what and till when. Conversations
+    that should be resumed by another process are built with steps, see StepStore.
+
+    scope: user scope of the conversation
+    handler: reference of the handler as `module:qualname`
+    waiter: reference of the waiter as `module:qualname`
+    args: waiter arguments
+    kwargs: waiter keyword arguments
+    created: unix time when waiter was set
+    expires: unix time when waiter expires
+    """
+
+    scope: str
+    handler: str
+    waiter: str
+    args: Tuple
+    kwargs: Dict[str, Any]
+    created: float
+    expires: float
+
+
+@dataclass(frozen=True)
+class WaiterStoreStats:
+    """\
+    Snapshot of the waiter store state.
+
+    waiters: number of active waiters
+    heap: number of entries in the expiry heap including outdated ones
+    expired: total number of expired waiters
+    next_expiry: unix time of the nearest expiration or None
+    memory: approximate size in bytes of the store with its entries and waiters,
+            objects referenced by generators are not counted
+    """
+
+    waiters: int
+    heap: int
+    expired: int
+    next_expiry: Optional[float]
+    memory: int
+
+
+class WaiterStore:
+    """Base class for waiter stores."""
+
+    __slots__ = ()
+
+    def get(self, scope: str) -> Optional['Waiter']:
+        """Returns not expired waiter for the scope."""
+
+        raise NotImplementedError
+
+    def set(self, scope: str, waiter: 'Waiter'):
+        """Sets waiter for the scope replacing existing one."""
+
+        raise NotImplementedError
+
+    def pop(self, scope: str) -> Optional['Waiter']:
+        """Removes waiter for the scope and returns it."""
+
+        raise NotImplementedError
+
+    def pop_expired(self, now: Optional[float] = None, limit: Optional[int] = None) -> List['Waiter']:
+        """Removes at most `limit` expired waiters and returns them."""
+
+        raise NotImplementedError
+
+    def next_expiry(self) -> Optional[float]:
+        """Returns unix time of the nearest expiration."""
+
+        raise NotImplementedError
+
+    def state(self, scope: str) -> Optional[WaiterState]:
+        """Returns serializable state of the waiter for the scope."""
+
+        raise NotImplementedError
+
+    def states(self) -> List[WaiterState]:
+        """Returns serializable states of all waiters."""
+
+        raise NotImplementedError
+
+    def stats(self) -> WaiterStoreStats:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryWaiterStore(WaiterStore):
+    """\
+    In-memory waiter store with exact expiration.
+
+    Expiration times are kept in a min-heap, so setting a waiter and
+    removing expired ones takes O(log n). Replaced and removed waiters
+    leave outdated heap entries that are skipped and compacted
+    when they outnumber active waiters.
+
+    lifetime: seconds after which waiter expires
+    """
+
+    __slots__ = ('__lifetime', '__waiters', '__heap', '__counter', '__expired')
+
+    def __init__(self, lifetime: float):
+        self.__lifetime = lifetime
+        self.__waiters: Dict[str, Tuple['Waiter', float, int]] = dict()
+        self.__heap: List[Tuple[float, int, str]] = list()
+        self.__counter = count()
+        self.__expired = 0
+
+    @property
+    def lifetime(self) -> float:
+        return self.__lifetime
+
+    def get(self, scope: str) -> Optional['Waiter']:
+        entry = self.__waiters.get(scope)
+        if entry is None or entry[1] <= time():
+            return None
+        return entry[0]
+
+    def set(self, scope: str, waiter: 'Waiter'):
+        expires = waiter.created + self.__lifetime
+        seq = next(self.__counter)
+        self.__waiters[scope] = (waiter, expires, seq)
+        heapq.heappush(self.__heap, (expires, seq, scope))
+
+        if len(self.__heap) > 2 * len(self.__waiters) + 64:
+            self.__compact()
+
+    def pop(self, scope: str) -> Optional['Waiter']:
+        entry = self.__waiters.pop(scope, None)
+        return entry[0] if entry else None
+
+    def pop_expired(self, now: Optional[float] = None, limit: Optional[int] = None) -> List['Waiter']:
+        now = time() if now is None else now
+        heap = self.__heap
+        waiters = self.__waiters
+        result = list()
+
+        while heap and heap[0][0] <= now and (limit is None or len(result) < limit):
+            _, seq, scope = heapq.heappop(heap)
+            entry = waiters.get(scope)
+            if entry is None or entry[2] != seq:
+                # outdated heap entry
+                continue
+            del waiters[scope]
+            result.append(entry[0])
+
+        self.__expired += len(result)
+        return result
+
+    def next_expiry(self) -> Optional[float]:
+        heap = self.__heap
+        waiters = self.__waiters
+
+        # drop outdated entries from the top
+        while heap:
+            _, seq, scope = heap[0]
+            entry = waiters.get(scope)
+            if entry is not None and entry[2] == seq:
+                return heap[0][0]
+            heapq.heappop(heap)
+
+        return None
+
+    def state(self, scope: str) -> Optional[WaiterState]:
+        entry = self.__waiters.get(scope)
+        if entry is None:
+            return None
+
+        waiter, expires, _ = entry
+        return WaiterState(scope, _ref(waiter.handler), _ref(waiter.waiter), waiter.args, waiter.kwargs,
+                           waiter.created, expires)
+
+    def states(self) -> List[WaiterState]:
+        return [self.state(scope) for scope in self.__waiters]
+
+    def stats(self) -> WaiterStoreStats:
+        # Memory is summed over all entries, so it takes O(n).
+        nearest = self.next_expiry()
+
+        memory = getsizeof(self.__waiters) + getsizeof(self.__heap)
+        memory += sum(getsizeof(e) for e in self.__heap)
+        for entry in self.__waiters.values():
+            waiter = entry[0]
+            memory += getsizeof(entry) + getsizeof(waiter) + getsizeof(waiter.handler)
+
+        return WaiterStoreStats(len(self.__waiters), len(self.__heap), self.__expired, nearest, memory)
+
+    def __len__(self) -> int:
+        return len(self.__waiters)
+
+    def __compact(self):
+        self.__heap = [(expires, seq, scope) for scope, (_, expires, seq) in self.__waiters.items()]
+        heapq.heapify(self.__heap)
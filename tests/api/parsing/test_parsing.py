@@ -102,6 +102,63 @@ def parsing_test(request):
 
 
 @pytest.mark.api
-def test_parsing(parsing_test: ParsingTest):
+@pytest.mark.parametrize('lazy', (False, True))
+def test_parsing(parsing_test: ParsingTest, lazy: bool):
     logger.debug("Parsing test: %s", parsing_test.name)
-    parsing_test.compare(Update.parse(parsing_test.input))
+    parsing_test.compare(Update.parse(parsing_test.input, lazy=lazy))
+
+
+def decoded(obj, name: str) -> bool:
+    try:
+        object.__getattribute__(obj, name)
+    except AttributeError:
+        return False
+    return True
+
+
+@pytest.mark.api
+def test_lazy_parsing(parsing_test: ParsingTest):
+    lazy = Update.parse(parsing_test.input, lazy=True)
+
+    assert not decoded(lazy, 'message'), "Fields should not be decoded before access"
+    assert lazy == Update.parse(parsing_test.input)
+    assert decoded(lazy, 'message'), "Decoded fields should be cached"
+
+
+NESTED = {
+    "update_id": 2,
+    "message": {
+        "message_id": 2,
+        "from": {"id": 123456789, "is_bot": False, "first_name": "User"},
+        "chat": {"id": -100123, "title": "Group", "type": "supergroup", "active_usernames": ["group"],
+                 "emoji_status_expiration_date": 1691234000,
+                 "pinned_message": {"message_id": 1, "chat": {"id": -100123, "type": "supergroup"},
+                                    "date": 1691234000, "text": "Pinned"}},
+        "date": 1691234567,
+        "edit_date": 1691234600,
+        "reply_to_message": {"message_id": 1, "chat": {"id": -100123, "type": "supergroup"}, "date": 1691234000,
+                             "photo": [{"file_id": "a", "file_unique_id": "b", "width": 1, "height": 1}]},
+        "animation": {"file_id": "c", "file_unique_id": "d", "width": 1, "height": 1, "duration": 1},
+        "document": {"file_id": "c", "file_unique_id": "d"},
+        "caption": "Caption",
+        "caption_entities": [{"type": "bold", "offset": 0, "length": 7}],
+        "new_chat_members": [{"id": 1, "is_bot": True, "first_name": "Bot"}]
+    }
+}
+
+
+@pytest.mark.api
+def test_lazy_nested_parsing():
+    eager = Update.parse(NESTED)
+    lazy = Update.parse(NESTED, lazy=True)
+
+    assert lazy == eager
+    assert lazy.message.chat.pinned_message == eager.message.chat.pinned_message
+    assert lazy.message.chat.pinned_message.text == 'Pinned'
+    assert lazy.message.chat.emoji_status_expiration_date == datetime.fromtimestamp(1691234000).astimezone()
+    assert lazy.message.document is None and eager.message.document is None
+
+    # nested objects of lazily parsed objects are parsed lazily too
+    reply = Update.parse(NESTED, lazy=True).message.reply_to_message
+    assert not decoded(reply, 'photo')
+    assert reply.photo[0].file_id == 'a'
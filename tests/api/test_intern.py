@@ -0,0 +1,112 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import pickle
+
+import pytest
+
+from rocketgram import Update, User, Chat, InternCache, interning, current_intern_cache
+
+
+def make_data(update_id: int, user_id: int, first_name: str = 'User') -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "from": {"id": user_id, "is_bot": False, "first_name": first_name},
+            "chat": {"id": -100123, "title": "Group", "type": "supergroup"},
+            "date": 1691234567,
+            "text": "Hello"
+        }
+    }
+
+
+@pytest.fixture
+def cache():
+    cache = InternCache(3)
+    with interning(cache):
+        yield cache
+
+
+@pytest.mark.api
+@pytest.mark.parametrize('lazy', (False, True))
+def test_shared_instances(cache, lazy: bool):
+    first = Update.parse(make_data(1, 1), lazy=lazy)
+    second = Update.parse(make_data(2, 1), lazy=lazy)
+
+    assert first.message.user is second.message.user
+    assert first.message.chat is second.message.chat
+
+    changed = Update.parse(make_data(3, 1, 'Renamed'), lazy=lazy)
+    assert changed.message.user is not first.message.user
+    assert changed.message.user.first_name == 'Renamed'
+    assert changed.message.chat is first.message.chat
+
+    stats = cache.stats()
+    assert (stats.size, stats.hits, stats.misses, stats.changed) == (2, 3, 3, 1)
+    assert stats.hit_rate == pytest.approx(1 / 2)
+
+
+@pytest.mark.api
+def test_lazy_fields_use_parsing_cache():
+    cache = InternCache()
+
+    with interning(cache):
+        first = Update.parse(make_data(1, 1), lazy=True)
+        second = Update.parse(make_data(2, 1), lazy=True)
+
+    # fields are decoded outside of the block
+    assert current_intern_cache() is None
+    assert first.message.user is second.message.user
+    assert cache.stats().hits == 1
+
+    restored = pickle.loads(pickle.dumps(Update.parse(make_data(3, 1), lazy=True)))
+    assert restored.message.user == first.message.user
+
+
+@pytest.mark.api
+def test_lru_eviction(cache):
+    a = User.parse({"id": 1, "is_bot": False, "first_name": "A"})
+    User.parse({"id": 2, "is_bot": False, "first_name": "B"})
+    User.parse({"id": 3, "is_bot": False, "first_name": "C"})
+    assert User.parse({"id": 1, "is_bot": False, "first_name": "A"}) is a
+
+    User.parse({"id": 4, "is_bot": False, "first_name": "D"})
+
+    assert cache.stats().evictions == 1
+    assert User.parse({"id": 1, "is_bot": False, "first_name": "A"}) is a
+    assert (cache.stats().hits, cache.stats().misses) == (2, 4)
+
+
+@pytest.mark.api
+def test_nested_data_cached(cache):
+    data = {"id": 1, "type": "supergroup", "active_usernames": ["group"], "permissions": {"can_send_messages": True}}
+    chat = Chat.parse(data)
+
+    assert Chat.parse(dict(data, active_usernames=["group"])) is chat
+
+    changed = Chat.parse(dict(data, active_usernames=["renamed"]))
+    assert changed is not chat
+    assert changed.active_usernames == ["renamed"]
+
+    stats = cache.stats()
+    assert (stats.size, stats.hits, stats.changed) == (1, 1, 1)
+
+
+@pytest.mark.api
+def test_types_cached_separately(cache):
+    user = User.parse({"id": 1, "is_bot": False, "first_name": "A"})
+    chat = Chat.parse({"id": 1, "type": "private", "first_name": "A"})
+
+    assert User.parse({"id": 1, "is_bot": False, "first_name": "A"}) is user
+    assert Chat.parse({"id": 1, "type": "private", "first_name": "A"}) is chat
+    assert len(cache) == 2
+
+
+@pytest.mark.api
+def test_disabled_by_default():
+    data = {"id": 1, "is_bot": False, "first_name": "A"}
+    assert current_intern_cache() is None
+    assert User.parse(data) is not User.parse(data)
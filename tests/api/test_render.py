@@ -0,0 +1,98 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+from contextlib import suppress
+from datetime import datetime, timezone
+from io import BytesIO
+
+import pytest
+
+from rocketgram import SendMessage, SendPhoto, EditMessageText, AnswerCallbackQuery, BanChatMember, GetUpdates
+from rocketgram import InlineKeyboard, InputFile, MessageEntity, EntityType, ParseModeType, ReplyParameters
+from rocketgram import StandardJsonAdapter, UpdateType
+
+ADAPTERS = [StandardJsonAdapter]
+
+with suppress(ImportError):
+    from rocketgram import OrJsonJsonAdapter
+
+    ADAPTERS.append(OrJsonJsonAdapter)
+
+
+@pytest.mark.api
+def test_render_drops_none():
+    request = AnswerCallbackQuery('123', text='text')
+
+    assert request.render() == {'callback_query_id': '123', 'text': 'text'}
+    assert request.render(with_method=True) == {'callback_query_id': '123', 'text': 'text',
+                                                'method': 'AnswerCallbackQuery'}
+
+
+@pytest.mark.api
+def test_render_nested():
+    kb = InlineKeyboard()
+    kb.callback('Yes', 'yes').callback('No', 'no').arrange_simple(1)
+
+    request = SendMessage(123, 'Hello world', parse_mode=ParseModeType.html,
+                          entities=[MessageEntity(EntityType.bold, 0, 5, None, None, None, None)],
+                          reply_parameters=ReplyParameters(456), reply_markup=kb)
+
+    assert request.render() == {
+        'chat_id': 123,
+        'text': 'Hello world',
+        'parse_mode': 'html',
+        'entities': [{'type': 'bold', 'offset': 0, 'length': 5}],
+        'reply_parameters': {'message_id': 456},
+        'reply_markup': {'inline_keyboard': [[{'text': 'Yes', 'callback_data': 'yes'}],
+                                             [{'text': 'No', 'callback_data': 'no'}]]}
+    }
+
+
+@pytest.mark.api
+def test_render_tuples():
+    request = EditMessageText('text', 123, 456,
+                              entities=(MessageEntity(EntityType.italic, 0, 4, None, None, None, None),))
+
+    assert request.render() == {'text': 'text', 'chat_id': 123, 'message_id': 456,
+                                'entities': [{'type': 'italic', 'offset': 0, 'length': 4}]}
+
+
+@pytest.mark.api
+def test_render_special_values():
+    photo = InputFile('photo.jpg', 'image/jpeg', BytesIO(b''))
+    until = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    assert SendPhoto(123, photo).render() == {'chat_id': 123, 'photo': 'attach://photo.jpg'}
+    assert BanChatMember(123, 456, until).render() == {'chat_id': 123, 'user_id': 456,
+                                                       'until_date': int(until.timestamp())}
+
+
+@pytest.mark.api
+@pytest.mark.parametrize('adapter', ADAPTERS)
+def test_encode(adapter):
+    kb = InlineKeyboard()
+    kb.callback('Да', 'yes').callback('No', 'no').arrange_simple(1)
+
+    photo = InputFile('photo.jpg', 'image/jpeg', BytesIO(b''))
+    until = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    requests = [
+        AnswerCallbackQuery('123', text='text'),
+        SendMessage(123, 'Привет', parse_mode=ParseModeType.html,
+                    entities=[MessageEntity(EntityType.bold, 0, 5, None, None, None, None)],
+                    reply_parameters=ReplyParameters(456), reply_markup=kb),
+        EditMessageText('text', 123, 456, entities=(MessageEntity(EntityType.italic, 0, 4, None, None, None, None),)),
+        SendPhoto(123, photo),
+        BanChatMember(123, 456, until),
+        GetUpdates(offset=1, allowed_updates=[UpdateType.message, None, UpdateType.callback_query]),
+    ]
+
+    for request in requests:
+        encoded = request.encode(adapter)
+        assert isinstance(encoded, bytes)
+        assert adapter.loads(encoded) == request.render()
+
+        encoded = request.encode(adapter, with_method=True)
+        assert adapter.loads(encoded) == request.render(with_method=True)
@@ -0,0 +1,115 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import copy
+import pickle
+import weakref
+from dataclasses import FrozenInstanceError, replace
+from datetime import datetime, timezone
+
+import pytest
+
+from rocketgram import Update, User, InlineKeyboardButton
+
+DATA = {
+    "update_id": 1,
+    "message": {
+        "message_id": 1,
+        "from": {"id": 123456789, "is_bot": False, "first_name": "User"},
+        "chat": {"id": 123456789, "first_name": "User", "type": "private"},
+        "date": 1691234567,
+        "text": "Hello"
+    }
+}
+
+
+@pytest.mark.api
+def test_no_dict():
+    update = Update.parse(DATA)
+
+    for obj in (update, update.message, update.message.chat, update.message.user):
+        assert not hasattr(obj, '__dict__'), f'{obj.__class__.__name__} should be slotted'
+
+    with pytest.raises(FrozenInstanceError):
+        update.message.user.id = 1  # noqa
+
+
+@pytest.mark.api
+def test_frozen():
+    user = User.parse(DATA['message']['from'])
+
+    with pytest.raises(FrozenInstanceError):
+        user.unknown = 1  # noqa
+
+    with pytest.raises(FrozenInstanceError):
+        del user.first_name
+
+    with pytest.raises(FrozenInstanceError):
+        del user.unknown
+
+
+@pytest.mark.api
+@pytest.mark.parametrize('lazy', (False, True))
+def test_weakref(lazy: bool):
+    update = Update.parse(DATA, lazy=lazy)
+
+    ref = weakref.ref(update.message)
+    assert ref() is update.message
+    assert weakref.ref(update) is not None
+
+    assert pickle.loads(pickle.dumps(update)) == update
+
+
+@pytest.mark.api
+def test_defaults():
+    button = InlineKeyboardButton('Button')
+    assert button.text == 'Button'
+    assert button.callback_data is None
+
+    button = InlineKeyboardButton('Button', callback_data='data')
+    assert button.callback_data == 'data'
+    assert replace(button, text='Other') == InlineKeyboardButton('Other', callback_data='data')
+
+
+@pytest.mark.api
+@pytest.mark.parametrize('lazy', (False, True))
+def test_pickle(lazy: bool):
+    update = Update.parse(DATA, lazy=lazy)
+
+    restored = pickle.loads(pickle.dumps(update))
+    assert restored == Update.parse(DATA)
+    assert copy.deepcopy(update) == restored
+
+    user = User.parse(DATA['message']['from'])
+    assert pickle.loads(pickle.dumps(user)) == user
+    assert hash(pickle.loads(pickle.dumps(user))) == hash(user)
+
+
+@pytest.mark.api
+def test_lazy_pickle_keeps_laziness():
+    update = Update.parse(DATA, lazy=True)
+    restored = pickle.loads(pickle.dumps(update))
+
+    with pytest.raises(AttributeError):
+        object.__getattribute__(restored, 'message')
+
+    assert restored.message.text == 'Hello'
+    assert restored.message.user.first_name == 'User'
+
+    with pytest.raises(AttributeError):
+        restored.unknown  # noqa
+
+
+@pytest.mark.api
+def test_timestamp_converted_on_access():
+    message = Update.parse(DATA).message
+
+    assert object.__getattribute__(message, '_date_ts') == 1691234567
+    assert message.date == datetime(2023, 8, 5, 11, 22, 47, tzinfo=timezone.utc)
+    assert object.__getattribute__(message, '_date_ts') is message.date
+    assert message.edit_date is None
+
+    assert pickle.loads(pickle.dumps(message)).date == message.date
+    assert Update.parse(DATA, lazy=True).message.date == message.date
@@ -0,0 +1,30 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import pytest
+
+from rocketgram import UpdateType, MessageType
+
+
+@pytest.mark.api
+def test_update_type_detection():
+    assert UpdateType.detect({'update_id': 1, 'message': {}}) is UpdateType.message
+    assert UpdateType.detect({'update_id': 1, 'callback_query': {}}) is UpdateType.callback_query
+    assert UpdateType.detect({'update_id': 1, 'removed_chat_boost': {}}) is UpdateType.removed_chat_boost
+    assert UpdateType.detect({'update_id': 1}) is UpdateType.unknown
+    assert UpdateType.detect({'update_id': 1, 'unknown': {}}) is UpdateType.unknown
+
+
+@pytest.mark.api
+def test_message_type_detection():
+    base = {'message_id': 1, 'date': 1691234567, 'chat': {'id': 1, 'type': 'private'}}
+
+    assert MessageType.detect({**base, 'text': 'text'}) is MessageType.text
+    assert MessageType.detect({**base, 'photo': [], 'caption': 'text'}) is MessageType.photo
+    assert MessageType.detect({**base, 'document': {}}) is MessageType.document
+    assert MessageType.detect({**base, 'document': {}, 'animation': {}}) is MessageType.animation
+    assert MessageType.detect({**base, 'forum_topic_closed': {}}) is MessageType.forum_topic_closed
+    assert MessageType.detect({**base, 'location': {}, 'venue': {}}) is MessageType.location
+    assert MessageType.detect(base) is MessageType.unknown
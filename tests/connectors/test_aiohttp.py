@@ -0,0 +1,106 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+import json
+
+import pytest
+
+web = pytest.importorskip('aiohttp.web')
+
+from rocketgram import AioHttpConnector, AnswerCallbackQuery, PoolStats, SendMessage, InlineKeyboard  # noqa: E402
+
+
+async def start_server(handler):
+    runner = web.AppRunner(web.Application())
+    runner.app.router.add_post('/{path:.*}', handler)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f'http://127.0.0.1:{port}/bot%s/'
+
+
+@pytest.mark.connectors
+def test_pool_stats():
+    async def main():
+        release = asyncio.Event()
+        received = list()
+
+        async def handler(request):
+            received.append((request.path, await request.json()))
+            await release.wait()
+            return web.json_response({'ok': True, 'result': True})
+
+        runner, api_url = await start_server(handler)
+        connector = AioHttpConnector(api_url=api_url, limit=2, keepalive_timeout=30)
+
+        try:
+            assert connector.stats() == PoolStats(limit=2, limit_per_host=0, in_flight=0, in_use=0, waiters=0,
+                                                 created=0, reused=0)
+
+            tasks = [asyncio.create_task(connector.send('TOKEN', AnswerCallbackQuery(str(i)))) for i in range(5)]
+
+            while len(received) < 2:
+                await asyncio.sleep(0.01)
+
+            stats = connector.stats()
+            assert stats.in_flight == 5
+            assert stats.in_use == 2
+            assert stats.waiters == 3
+
+            # cancelled request stops waiting
+            tasks.pop().cancel()
+            await asyncio.sleep(0)
+            assert (connector.stats().in_flight, connector.stats().waiters) == (4, 2)
+
+            release.set()
+            responses = await asyncio.gather(*tasks)
+
+            assert all(r.ok and r.result is True for r in responses)
+            assert sorted(b['callback_query_id'] for _, b in received) == ['0', '1', '2', '3']
+            assert all(p == '/botTOKEN/AnswerCallbackQuery' for p, _ in received)
+
+            stats = connector.stats()
+            assert stats.in_use == 0
+            assert stats.waiters == 0
+            assert stats.in_flight == 0
+            assert (stats.created, stats.reused) == (2, 2)
+        finally:
+            await connector.shutdown()
+            await runner.cleanup()
+
+    asyncio.run(main())
+
+
+@pytest.mark.connectors
+def test_direct_encoding():
+    async def main():
+        received = list()
+
+        async def handler(request):
+            received.append(await request.read())
+            message = {'message_id': 1, 'date': 1691234567, 'chat': {'id': 123, 'type': 'private'}, 'text': 'text'}
+            return web.json_response({'ok': True, 'result': message})
+
+        runner, api_url = await start_server(handler)
+
+        kb = InlineKeyboard()
+        kb.callback('Yes', 'yes').callback('No', 'no').arrange_simple(1)
+        request = SendMessage(123, 'text', reply_markup=kb)
+
+        try:
+            for direct_encoding in (False, True):
+                connector = AioHttpConnector(api_url=api_url, direct_encoding=direct_encoding)
+                try:
+                    assert (await connector.send('TOKEN', request)).ok
+                finally:
+                    await connector.shutdown()
+        finally:
+            await runner.cleanup()
+
+        assert json.loads(received[0]) == json.loads(received[1]) == request.render()
+
+    asyncio.run(main())
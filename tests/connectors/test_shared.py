@@ -0,0 +1,120 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+
+import pytest
+
+from rocketgram import Bot, Connector, Router, SharedConnector, Response, TokenStats
+from rocketgram import SendMessage
+
+TOKEN_A = "1111111111:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX"
+TOKEN_B = "2222222222:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX"
+
+
+class FakeConnector(Connector):
+    def __init__(self):
+        super().__init__()
+        self.sent = list()
+        self.inits = 0
+        self.shutdowns = 0
+        self.release = asyncio.Event()
+
+    async def init(self):
+        self.inits += 1
+
+    async def shutdown(self):
+        self.shutdowns += 1
+
+    async def send(self, token, request):
+        self.sent.append((token, request.text))
+        await self.release.wait()
+        return Response(request, {'ok': True, 'result': True}, True, None, None, True, None)
+
+
+class NullRouter(Router):
+    async def init(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+
+@pytest.mark.connectors
+def test_reference_counting():
+    async def main():
+        inner = FakeConnector()
+        shared = SharedConnector(inner)
+
+        bots = [Bot(token, connector=shared, router=NullRouter()) for token in (TOKEN_A, TOKEN_B)]
+
+        for bot in bots:
+            await bot.init()
+        assert (inner.inits, shared.stats().users) == (1, 2)
+
+        await bots[0].shutdown()
+        assert inner.shutdowns == 0
+
+        await bots[1].shutdown()
+        assert (inner.shutdowns, shared.stats().users) == (1, 0)
+
+    asyncio.run(main())
+
+
+@pytest.mark.connectors
+def test_round_robin():
+    async def main():
+        inner = FakeConnector()
+        shared = SharedConnector(inner, max_in_flight=1)
+        await shared.init()
+
+        tasks = [asyncio.create_task(shared.send(TOKEN_A, SendMessage(1, f'a{i}'))) for i in range(1, 5)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(shared.send(TOKEN_B, SendMessage(1, 'b1'))))
+        await asyncio.sleep(0)
+
+        stats = shared.stats()
+        assert (stats.in_flight, stats.queued) == (1, 4)
+        assert stats.bots == {1111111111: TokenStats(1, 3), 2222222222: TokenStats(0, 1)}
+
+        inner.release.set()
+        await asyncio.gather(*tasks)
+
+        assert [text for _, text in inner.sent] == ['a1', 'a2', 'b1', 'a3', 'a4']
+
+        stats = shared.stats()
+        assert (stats.in_flight, stats.queued, stats.sent, stats.bots) == (0, 0, 5, {})
+
+        await shared.shutdown()
+
+    asyncio.run(main())
+
+
+@pytest.mark.connectors
+def test_per_bot_limit():
+    async def main():
+        inner = FakeConnector()
+        shared = SharedConnector(inner, max_in_flight_per_bot=1)
+        await shared.init()
+
+        a = [asyncio.create_task(shared.send(TOKEN_A, SendMessage(1, f'a{i}'))) for i in range(1, 3)]
+        b = asyncio.create_task(shared.send(TOKEN_B, SendMessage(1, 'b1')))
+        await asyncio.sleep(0)
+
+        assert [text for _, text in inner.sent] == ['a1', 'b1']
+
+        # cancelled request does not take the slot
+        a[1].cancel()
+        inner.release.set()
+        await asyncio.gather(a[0], b)
+        with pytest.raises(asyncio.CancelledError):
+            await a[1]
+
+        assert [text for _, text in inner.sent] == ['a1', 'b1']
+        assert shared.stats().bots == {}
+
+        await shared.shutdown()
+
+    asyncio.run(main())
@@ -0,0 +1,225 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+
+import pytest
+
+from rocketgram import Bot, Connector, ThrottledConnector, RequestPriority, Response, request_priority
+from rocketgram import SendMessage, AnswerCallbackQuery
+
+
+class FakeConnector(Connector):
+    def __init__(self, errors=0):
+        super().__init__()
+        self.sent = list()
+        self.errors = errors
+
+    async def init(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def send(self, token, request):
+        self.sent.append((asyncio.get_running_loop().time(), request))
+
+        if self.errors:
+            self.errors -= 1
+            data = {'ok': False, 'error_code': 429, 'description': 'Too Many Requests',
+                    'parameters': {'retry_after': 0}}
+            return Response.parse(data, request)
+
+        return Response(request, {'ok': True, 'result': True}, True, None, None, True, None)
+
+
+def times(sent, chat_id):
+    return [t for t, r in sent if getattr(r, 'chat_id', None) == chat_id]
+
+
+@pytest.mark.connectors
+def test_per_chat_limits():
+    async def main():
+        fake = FakeConnector()
+        connector = ThrottledConnector(fake, global_rate=1000, private_rate=20, group_rate=10)
+
+        requests = [SendMessage(1, 'a'), SendMessage(1, 'b'), SendMessage(1, 'c'),
+                    SendMessage(-2, 'a'), SendMessage(-2, 'b'), SendMessage(3, 'a')]
+
+        start = asyncio.get_running_loop().time()
+        await asyncio.gather(*(connector.send('TOKEN', r) for r in requests))
+
+        # Slots are reserved on arrival, so delayed first send may shorten the gap
+        # between sends, but never makes request earlier than its slot.
+        private = times(fake.sent, 1)
+        assert [r.text for _, r in fake.sent if r.chat_id == 1] == ['a', 'b', 'c']
+        assert all(t - start >= 0.045 * n for n, t in enumerate(private))
+
+        group = times(fake.sent, -2)
+        assert group[1] - start >= 0.095
+
+        assert times(fake.sent, 3)[0] - start < 0.04
+
+        assert connector.stats().chats == 3
+        assert connector.stats().chat_queue == 0
+
+    asyncio.run(main())
+
+
+@pytest.mark.connectors
+def test_global_limit():
+    async def main():
+        fake = FakeConnector()
+        connector = ThrottledConnector(fake, global_rate=50, private_rate=1000)
+
+        tasks = [asyncio.create_task(connector.send('TOKEN', SendMessage(i, 'a'))) for i in range(1, 6)]
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert connector.stats().global_queue == 4
+
+        await asyncio.gather(*tasks)
+
+        sent = [t for t, _ in fake.sent]
+        assert all(b - a >= 0.015 for a, b in zip(sent, sent[1:]))
+        assert connector.stats().global_queue == 0
+
+    asyncio.run(main())
+
+
+@pytest.mark.connectors
+def test_bots_limited_separately():
+    async def main():
+        fake = FakeConnector()
+        connector = ThrottledConnector(fake, global_rate=1, private_rate=1)
+
+        start = asyncio.get_running_loop().time()
+        await asyncio.gather(connector.send('TOKEN1', SendMessage(1, 'a')),
+                             connector.send('TOKEN2', SendMessage(1, 'b')))
+
+        assert len(fake.sent) == 2
+        assert asyncio.get_running_loop().time() - start < 0.1
+        assert connector.stats().chats == 2
+
+    asyncio.run(main())
+
+
+@pytest.mark.connectors
+def test_idle_chats_pruned():
+    async def main():
+        fake = FakeConnector()
+        connector = ThrottledConnector(fake, global_rate=1000, private_rate=1000, group_rate=0.01, max_chats=2)
+
+        await connector.send('TOKEN', SendMessage(2, 'a'))
+        await connector.send('TOKEN', SendMessage(3, 'a'))
+        await connector.send('TOKEN', SendMessage(-1, 'a'))
+        await asyncio.sleep(0.01)
+
+        # least recently used idle buckets are pruned
+        await connector.send('TOKEN', SendMessage(4, 'a'))
+        assert connector.stats().chats == 2
+
+        # busy group bucket at the head stops pruning
+        await connector.send('TOKEN', SendMessage(5, 'a'))
+        assert connector.stats().chats == 3
+
+    asyncio.run(main())
+
+
+@pytest.mark.connectors
+def test_not_throttled():
+    async def main():
+        fake = FakeConnector()
+        connector = ThrottledConnector(fake, global_rate=1, private_rate=1)
+
+        start = asyncio.get_running_loop().time()
+        await asyncio.gather(*(connector.send('TOKEN', AnswerCallbackQuery(str(i))) for i in range(10)))
+
+        assert len(fake.sent) == 10
+        assert asyncio.get_running_loop().time() - start < 0.1
+        assert connector.stats().chats == 0
+
+    asyncio.run(main())
+
+
+@pytest.mark.connectors
+def test_retry_after():
+    async def main():
+        fake = FakeConnector(errors=2)
+        connector = ThrottledConnector(fake, private_rate=1000, max_retries=3)
+
+        response = await connector.send('TOKEN', SendMessage(1, 'a'))
+        assert response.ok
+        assert len(fake.sent) == 3
+        assert connector.stats().retried == 2
+
+        fake.errors = 5
+        response = await connector.send('TOKEN', SendMessage(1, 'a'))
+        assert response.error_code == 429
+        assert connector.stats().retried == 5
+
+    asyncio.run(main())
+
+
+@pytest.mark.connectors
+def test_priorities():
+    async def main():
+        fake = FakeConnector()
+        connector = ThrottledConnector(fake, global_rate=20, private_rate=1000)
+        bot = Bot('1:token', connector=connector)
+
+        async def send(chat_id, priority=None):
+            await bot.send(SendMessage(chat_id, 'a'), priority=priority)
+
+        tasks = [asyncio.create_task(send(1))]
+        tasks += [asyncio.create_task(send(i)) for i in (2, 3, 4)]
+        tasks += [asyncio.create_task(send(5, RequestPriority.interactive))]
+        tasks += [asyncio.create_task(send(6, RequestPriority.high))]
+        await asyncio.sleep(0.01)
+
+        assert connector.stats().priority_queue == {RequestPriority.high: 1, RequestPriority.interactive: 1,
+                                                    RequestPriority.bulk: 3}
+
+        await asyncio.gather(*tasks)
+
+        assert [r.chat_id for _, r in fake.sent] == [1, 6, 5, 2, 3, 4]
+
+    asyncio.run(main())
+
+
+@pytest.mark.connectors
+def test_request_priority():
+    connector = ThrottledConnector(FakeConnector())
+    answer = AnswerCallbackQuery('1')
+
+    assert connector.priority_of(answer) == RequestPriority.high
+
+    with request_priority(RequestPriority.bulk):
+        assert connector.priority_of(answer) == RequestPriority.bulk
+
+        with request_priority(None):
+            assert connector.priority_of(answer) == RequestPriority.high
+
+    assert connector.priority_of(SendMessage(1, 'a')) == RequestPriority.bulk
+
+
+@pytest.mark.connectors
+def test_priority_aging():
+    async def main():
+        fake = FakeConnector()
+        connector = ThrottledConnector(fake, global_rate=5, private_rate=1000, aging=0.05)
+        bot = Bot('1:token', connector=connector)
+
+        tasks = [asyncio.create_task(bot.send(SendMessage(i, 'a'), priority=RequestPriority.bulk)) for i in (1, 2)]
+        await asyncio.sleep(0.08)
+
+        tasks.append(asyncio.create_task(bot.send(SendMessage(3, 'a'), priority=RequestPriority.interactive)))
+        tasks.append(asyncio.create_task(bot.send(SendMessage(4, 'a'), priority=RequestPriority.high)))
+
+        await asyncio.gather(*tasks)
+
+        assert [r.chat_id for _, r in fake.sent] == [1, 4, 2, 3]
+
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+from typing import Tuple
+
+import pytest
+
+from rocketgram import Bot, Update, Dispatcher, Connector
+from rocketgram import context as ctx
+from rocketgram.routers.dispatcher import commonfilters
+
+
+def make_bot(bot_name: str = "TestBot") -> Tuple[Bot, Dispatcher]:
+    connector = Connector()
+    dispatcher = Dispatcher()
+    bot = Bot("1234567890:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX", router=dispatcher, connector=connector)
+    bot.name = bot_name
+
+    return bot, dispatcher
+
+
+def make_callback(data: str) -> Update:
+    return Update.parse(
+        {
+            "update_id": 123456789,
+            "callback_query": {
+                "id": "123",
+                "from": {"id": 123456789, "is_bot": False, "first_name": "User"},
+                "chat_instance": "123",
+                "data": data
+            }
+        }
+    )
+
+
+@pytest.mark.dispatcher
+def test_callback():
+    bot, dispatcher = make_bot()
+
+    results = []
+
+    @dispatcher.handler
+    @commonfilters.callback("yes", "no")
+    async def handler():
+        results.append(ctx.callback.data)
+
+    @dispatcher.handler
+    @commonfilters.callback("Vote", case_sensitive=True, separator=':')
+    async def handler_vote():
+        results.append(ctx.callback.data)
+
+    for data in ("yes", "NO 1", "yes:1", "Vote:1", "vote:1", "maybe"):
+        asyncio.run(bot.process(None, make_callback(data)))
+
+    assert results == ["yes", "NO 1", "Vote:1"]
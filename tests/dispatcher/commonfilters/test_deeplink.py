@@ -0,0 +1,77 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+from typing import Tuple
+
+import pytest
+
+from rocketgram import Bot, Update, Dispatcher, Connector
+from rocketgram import context as ctx
+from rocketgram.routers.dispatcher import commonfilters
+
+
+def make_bot(bot_name: str = "TestBot") -> Tuple[Bot, Dispatcher]:
+    connector = Connector()
+    dispatcher = Dispatcher()
+    bot = Bot("1234567890:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX", router=dispatcher, connector=connector)
+    bot.name = bot_name
+
+    return bot, dispatcher
+
+
+def make_update(text: str) -> Update:
+    return Update.parse(
+        {
+            "update_id": 123456789,
+            "message": {
+                "message_id": 1234567,
+                "from": {"id": 123456789, "is_bot": False, "first_name": "User"},
+                "chat": {"id": 123456789, "first_name": "User", "type": "private"},
+                "date": 1691234567,
+                "text": text
+            }
+        }
+    )
+
+
+@pytest.mark.dispatcher
+def test_deeplink():
+    bot, dispatcher = make_bot()
+
+    results = []
+
+    @dispatcher.handler
+    @commonfilters.deeplink("ref-", "promo")
+    async def handler():
+        results.append(ctx.message.text)
+
+    @dispatcher.handler
+    @commonfilters.deeplink()
+    async def handler_all():
+        results.append('all')
+
+    for text in ("/start ref-123", "/start@TestBot ref-456", "/start@testbot PROMO1", "/start other",
+                 "/start@OtherBot ref-1", "/start", "/stop ref-1"):
+        asyncio.run(bot.process(None, make_update(text)))
+
+    assert results == ["/start ref-123", "/start@TestBot ref-456", "/start@testbot PROMO1", "all"]
+
+
+@pytest.mark.dispatcher
+def test_deeplink_case_sensitive():
+    bot, dispatcher = make_bot()
+
+    results = []
+
+    @dispatcher.handler
+    @commonfilters.deeplink("Ref", case_sensitive=True)
+    async def handler():
+        results.append(ctx.message.text)
+
+    for text in ("/start Ref1", "/start ref1", "/start@TestBot Ref2"):
+        asyncio.run(bot.process(None, make_update(text)))
+
+    assert results == ["/start Ref1", "/start@TestBot Ref2"]
@@ -0,0 +1,69 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+from typing import Tuple
+
+import pytest
+
+from rocketgram import Bot, Update, Dispatcher, Connector
+from rocketgram import context as ctx
+from rocketgram.routers.dispatcher import commonfilters
+from rocketgram.routers.dispatcher.commonfilters import _PrefixTrie
+
+
+def make_bot(bot_name: str = "TestBot") -> Tuple[Bot, Dispatcher]:
+    connector = Connector()
+    dispatcher = Dispatcher()
+    bot = Bot("1234567890:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX", router=dispatcher, connector=connector)
+    bot.name = bot_name
+
+    return bot, dispatcher
+
+
+def make_inline(query: str) -> Update:
+    return Update.parse(
+        {
+            "update_id": 123456789,
+            "inline_query": {
+                "id": "123",
+                "from": {"id": 123456789, "is_bot": False, "first_name": "User"},
+                "query": query,
+                "offset": ""
+            }
+        }
+    )
+
+
+@pytest.mark.dispatcher
+def test_prefix_trie():
+    trie = _PrefixTrie(["ab", "abc", "x"])
+
+    assert trie.match("ab")
+    assert trie.match("abd")
+    assert trie.match("xyz")
+    assert not trie.match("a")
+    assert not trie.match("")
+    assert not trie.match("ba")
+
+    assert _PrefixTrie([""]).match("anything")
+    assert not _PrefixTrie([]).match("anything")
+
+
+@pytest.mark.dispatcher
+def test_inline():
+    bot, dispatcher = make_bot()
+
+    results = []
+
+    @dispatcher.handler
+    @commonfilters.inline("gif ", "pic")
+    async def handler():
+        results.append(ctx.inline.query)
+
+    for query in ("gif cats", "GIF dogs", "pictures", "gifs", "music"):
+        asyncio.run(bot.process(None, make_inline(query)))
+
+    assert results == ["gif cats", "GIF dogs", "pictures"]
@@ -0,0 +1,100 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+import contextvars
+
+import pytest
+
+from rocketgram import Update, SendMessage, context
+
+
+def make_message_update() -> Update:
+    return Update.parse(
+        {
+            "update_id": 1,
+            "message": {
+                "message_id": 1,
+                "from": {"id": 123, "is_bot": False, "first_name": "User"},
+                "chat": {"id": 456, "type": "group", "title": "Group"},
+                "date": 1691234567,
+                "text": "text"
+            }
+        }
+    )
+
+
+def make_callback_update() -> Update:
+    return Update.parse(
+        {
+            "update_id": 2,
+            "callback_query": {
+                "id": "1",
+                "from": {"id": 123, "is_bot": False, "first_name": "User"},
+                "chat_instance": "1",
+                "inline_message_id": "1",
+                "data": "data"
+            }
+        }
+    )
+
+
+@pytest.mark.dispatcher
+def test_message():
+    def check():
+        update = make_message_update()
+        context.assign(None, None, update)
+
+        assert context.update is update
+        assert context.message is update.message
+        assert context.chat.id == 456
+        assert context.user.id == 123
+        assert context.callback is None
+        assert context.inline is None
+
+    contextvars.copy_context().run(check)
+
+
+@pytest.mark.dispatcher
+def test_callback_without_message():
+    def check():
+        update = make_callback_update()
+        context.assign(None, None, update)
+
+        assert context.callback is update.callback_query
+        assert context.message is None
+        assert context.chat is None
+        assert context.user.id == 123
+
+    contextvars.copy_context().run(check)
+
+
+@pytest.mark.dispatcher
+def test_no_request():
+    def check():
+        assert context.update is None
+        assert context.message is None
+        assert context.bot is None
+
+    contextvars.copy_context().run(check)
+
+
+@pytest.mark.dispatcher
+def test_setters_do_not_leak_between_tasks():
+    async def child():
+        context.chat = None
+        context.webhook(SendMessage(1, 'text'))
+        return context.chat
+
+    async def main():
+        context.assign(None, None, make_message_update())
+
+        assert await asyncio.create_task(child()) is None
+
+        # changed field is not visible to the parent task, but webhook requests are shared
+        assert context.chat.id == 456
+        assert len(context.webhook_requests) == 1
+
+    asyncio.run(main())
@@ -0,0 +1,162 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+
+import pytest
+
+from rocketgram import Bot, Update, Dispatcher, Connector, MessageType
+from rocketgram import context as ctx
+from rocketgram import make_filter
+from rocketgram.routers.dispatcher import commonfilters
+
+
+def make_update(text: str) -> Update:
+    return Update.parse(
+        {
+            "update_id": 123456789,
+            "message": {
+                "message_id": 1234567,
+                "from": {"id": 123456789, "is_bot": False, "first_name": "User"},
+                "chat": {"id": 123456789, "first_name": "User", "type": "private"},
+                "date": 1691234567,
+                "text": text
+            }
+        }
+    )
+
+
+@make_filter
+def contains(word: str):
+    return word in ctx.message.text
+
+
+@make_filter
+async def async_contains(word: str):
+    await asyncio.sleep(0)
+    return word in ctx.message.text
+
+
+@make_filter(compiled=True)
+def length(min_length: int):
+    def check():
+        return len(ctx.message.text) >= min_length
+
+    return check
+
+
+@make_filter
+def not_bool():
+    return 1
+
+
+def make_bot(debug: bool = False):
+    dispatcher = Dispatcher(debug=debug)
+    bot = Bot("1234567890:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX", router=dispatcher, connector=Connector())
+    bot.name = 'TestBot'
+    return bot, dispatcher
+
+
+@pytest.mark.dispatcher
+def test_sync_and_async_filters():
+    bot, dispatcher = make_bot()
+
+    results = []
+
+    @dispatcher.handler
+    @commonfilters.message_type(MessageType.text)
+    @contains('sync')
+    @length(6)
+    async def sync_handler():
+        results.append('sync')
+
+    @dispatcher.handler
+    @commonfilters.message_type(MessageType.text)
+    @async_contains('async')
+    def async_handler():
+        results.append('async')
+
+    sync_handler_, async_handler_ = dispatcher.handlers
+    assert callable(sync_handler_.check)
+    assert async_handler_.check is None
+
+    for text in ('sync', 'sync!!', 'async', 'other'):
+        asyncio.run(bot.process(None, make_update(text)))
+
+    assert results == ['sync', 'async']
+
+
+@pytest.mark.dispatcher
+def test_debug_mode():
+    bot, dispatcher = make_bot(debug=True)
+
+    @dispatcher.handler
+    @not_bool()
+    async def handler():
+        pass
+
+    assert dispatcher.handlers[0].check is None
+
+    async def process():
+        ctx.assign(None, bot, make_update('text'))
+        await dispatcher.process()
+
+    with pytest.raises(AssertionError):
+        asyncio.run(process())
+
+
+class Deny:
+    async def __call__(self):
+        await asyncio.sleep(0)
+        return False
+
+
+class Allow:
+    async def __call__(self):
+        await asyncio.sleep(0)
+        return True
+
+
+deny = Deny()
+allow = Allow()
+
+
+@make_filter
+def denied():
+    return deny()
+
+
+@make_filter
+def allowed():
+    return allow()
+
+
+@pytest.mark.dispatcher
+@pytest.mark.parametrize('chain', (1, 2))
+def test_sync_filter_returning_awaitable(chain: int):
+    bot, dispatcher = make_bot()
+
+    results = []
+
+    def chained(handler):
+        return commonfilters.message_type(MessageType.text)(handler) if chain == 2 else handler
+
+    @dispatcher.handler
+    @denied()
+    @chained
+    async def denied_handler():
+        results.append('denied')
+
+    @dispatcher.handler
+    @allowed()
+    @chained
+    async def allowed_handler():
+        results.append('allowed')
+
+    assert all(callable(h.check) for h in dispatcher.handlers)
+
+    asyncio.run(bot.process(None, make_update('text')))
+
+    assert results == ['allowed']
@@ -0,0 +1,149 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+
+import pytest
+
+from rocketgram import Bot, Update, Dispatcher, Connector, UpdateType, MessageType
+from rocketgram import context as ctx
+from rocketgram import make_filter, priority
+from rocketgram.routers.dispatcher import commonfilters
+
+
+def make_message(text=None, **fields):
+    message = {
+        "message_id": 1234567,
+        "from": {"id": 123456789, "is_bot": False, "first_name": "User"},
+        "chat": {"id": 123456789, "first_name": "User", "type": "private"},
+        "date": 1691234567,
+        **fields
+    }
+    if text is not None:
+        message["text"] = text
+    return message
+
+
+def make_update(**fields):
+    return Update.parse({"update_id": 123456789, **fields})
+
+
+def make_callback(data):
+    return make_update(callback_query={
+        "id": "123", "from": {"id": 123456789, "is_bot": False, "first_name": "User"},
+        "message": make_message("text"), "chat_instance": "123", "data": data
+    })
+
+
+@make_filter
+def opaque():
+    return ctx.message is not None and ctx.message.text == 'opaque'
+
+
+def make_dispatcher(results):
+    dispatcher = Dispatcher()
+
+    for i in range(100):
+        @dispatcher.handler
+        @commonfilters.command(f'/cmd{i}')
+        async def _(i=i):
+            results.append(f'cmd{i}')
+
+        @dispatcher.handler
+        @commonfilters.callback(f'cb{i}', separator=':')
+        async def _(i=i):
+            results.append(f'cb{i}')
+
+    @dispatcher.handler
+    @priority(10)
+    @commonfilters.command('/start', '/help')
+    async def _():
+        results.append('start')
+
+    @dispatcher.handler
+    @priority(5)
+    @opaque()
+    async def _():
+        results.append('opaque')
+
+    @dispatcher.handler
+    @commonfilters.message_type(MessageType.photo)
+    async def _():
+        results.append('photo')
+
+    @dispatcher.handler
+    @commonfilters.update_type(UpdateType.edited_message)
+    @commonfilters.message_type(MessageType.text)
+    async def _():
+        results.append('edited')
+
+    @dispatcher.handler
+    @priority(2048)
+    @commonfilters.catch_all()
+    async def _():
+        results.append('all')
+
+    return dispatcher
+
+
+@pytest.mark.dispatcher
+@pytest.mark.parametrize('init', [False, True])
+def test_index(init):
+    results = []
+    dispatcher = make_dispatcher(results)
+    bot = Bot("1234567890:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX", router=dispatcher, connector=Connector())
+    bot.name = 'TestBot'
+
+    if init:
+        asyncio.run(dispatcher.init())
+
+    cases = [
+        (make_update(message=make_message('/cmd42')), 'cmd42'),
+        (make_update(message=make_message('/CMD42@testbot args')), 'cmd42'),
+        (make_update(message=make_message('/cmd42@OtherBot')), 'all'),
+        (make_update(message=make_message('/help')), 'start'),
+        (make_update(message=make_message('opaque')), 'opaque'),
+        (make_update(message=make_message('text')), 'all'),
+        (make_update(message=make_message(photo=[{"file_id": "1", "file_unique_id": "1", "width": 1,
+                                                  "height": 1}])), 'photo'),
+        (make_update(edited_message=make_message('/cmd1')), 'edited'),
+        (make_callback('cb7:data'), 'cb7'),
+        (make_callback('cb7 data'), 'all'),
+        (make_update(inline_query={"id": "1", "from": {"id": 1, "is_bot": False, "first_name": "User"},
+                                   "query": "", "offset": ""}), 'all'),
+    ]
+
+    for update, expected in cases:
+        results.clear()
+        asyncio.run(bot.process(None, update))
+        assert results == [expected]
+
+
+@pytest.mark.dispatcher
+def test_candidates():
+    dispatcher = make_dispatcher([])
+    bot = Bot("1234567890:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX", router=dispatcher, connector=Connector())
+    bot.name = 'TestBot'
+    asyncio.run(dispatcher.init())
+
+    def candidates(update):
+        async def main():
+            ctx.assign(None, bot, update)
+            return len(dispatcher.index.candidates())
+
+        return asyncio.run(main())
+
+    # command, opaque and catch_all
+    assert candidates(make_update(message=make_message('/cmd42'))) == 3
+    assert candidates(make_update(message=make_message('/cmd42@TestBot'))) == 3
+    # start, opaque and catch_all
+    assert candidates(make_update(message=make_message('/start'))) == 3
+    # callback, opaque and catch_all
+    assert candidates(make_callback('cb7:data')) == 3
+    # opaque and catch_all
+    assert candidates(make_callback('unknown')) == 2
+
+    priorities = [h.priority for h in dispatcher.handlers]
+    assert priorities == sorted(priorities)
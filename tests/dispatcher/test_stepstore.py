@@ -0,0 +1,195 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+from time import time
+
+import pytest
+
+from rocketgram import Bot, Update, Dispatcher, Connector, MessageType, context
+from rocketgram.routers.dispatcher import MemoryStepStore, SqliteStepStore, MemoryWaiterStore
+from rocketgram.routers.dispatcher import commonfilters, commonwaiters
+from rocketgram.routers.dispatcher.dispatcher import Waiter
+
+TOKEN = "1234567890:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX"
+
+
+def make_update(update_id: int, text: str) -> Update:
+    return Update.parse(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "from": {"id": 123456789, "is_bot": False, "first_name": "User"},
+                "chat": {"id": 123456789, "first_name": "User", "type": "private"},
+                "date": 1691234567,
+                "text": text
+            }
+        }
+    )
+
+
+def make_worker(store, results: list) -> Bot:
+    # Every worker process builds its own dispatcher with the same steps.
+
+    dispatcher = Dispatcher(step_store=store)
+    bot = Bot(TOKEN, router=dispatcher, connector=Connector())
+    bot.name = 'TestBot'
+
+    @dispatcher.step('order.address')
+    def address(data):
+        results.append(('address', data['item'], context.message.text))
+        return commonwaiters.next_step('order.confirm', commonwaiters.next_message(), dict(data, address=True))
+
+    @dispatcher.step('order.confirm')
+    async def confirm(data):
+        results.append(('confirm', data, context.message.text))
+
+    @dispatcher.handler
+    @commonfilters.command('/order')
+    def order():
+        return commonwaiters.next_step(address, commonwaiters.next_message(), {'item': 42})
+
+    return bot
+
+
+@pytest.mark.dispatcher
+def test_memory_step_store():
+    store = MemoryStepStore(10)
+
+    now = time()
+    state = store.set('a', 'step', 'module:waiter', (1,), {'x': 2}, {'data': [1, 2]}, now - 5)
+    store.set('b', 'step', 'module:waiter', (), {}, None, now - 20)
+
+    assert store.get('a') == state
+    assert store.get('a') is not state
+    assert store.get('b') is None
+    assert store.next_expiry() == now - 10
+
+    assert store.pop_expired(now) == 1
+    assert len(store) == 1
+
+    stats = store.stats()
+    assert stats.steps == 1
+    assert stats.expired == 1
+    assert stats.size > 0
+    assert stats.next_expiry == now + 5
+
+    assert store.pop('a') == state
+    assert store.stats().size == 0
+    assert store.next_expiry() is None
+
+
+@pytest.mark.dispatcher
+def test_sqlite_step_store_persists(tmp_path):
+    path = str(tmp_path / 'steps.db')
+
+    now = time()
+    store = SqliteStepStore(path, 10)
+    state = store.set('a', 'step', 'module:waiter', (1,), {'x': 2}, {'data': [1, 2]}, now)
+    store.set('b', 'step', 'module:waiter', (), {}, None, now - 20)
+    store.close()
+
+    store = SqliteStepStore(path, 10)
+    assert len(store) == 2
+    assert store.get('a') == state
+    assert store.get('b') is None
+
+    assert store.pop_expired(now) == 1
+    stats = store.stats()
+    assert (stats.steps, stats.expired, stats.next_expiry) == (1, 1, now + 10)
+    assert stats.size > 0
+
+    assert store.pop('a') == state
+    assert store.pop('a') is None
+    assert store.next_expiry() is None
+    store.close()
+
+
+@pytest.mark.dispatcher
+def test_conversation_resumed_by_another_worker(tmp_path):
+    path = str(tmp_path / 'steps.db')
+    results = []
+
+    first = make_worker(SqliteStepStore(path, 60), results)
+    second = make_worker(SqliteStepStore(path, 60), results)
+
+    scope = '1234567890-123456789-123456789'
+
+    async def main():
+        await first.init()
+        await second.init()
+
+        await first.process(None, make_update(1, '/order'))
+        assert first.router.steps.get(scope).step == 'order.address'
+
+        # next messages are processed by another worker
+        await second.process(None, make_update(2, 'Street'))
+        assert second.router.steps.get(scope).data == {'item': 42, 'address': True}
+
+        await first.process(None, make_update(3, 'yes'))
+        assert first.router.steps.get(scope) is None
+
+        await first.shutdown()
+        await second.shutdown()
+
+    asyncio.run(main())
+
+    assert results == [('address', 42, 'Street'), ('confirm', {'item': 42, 'address': True}, 'yes')]
+
+
+@pytest.mark.dispatcher
+def test_step_replaces_generator():
+    dispatcher = Dispatcher()
+    bot = Bot(TOKEN, router=dispatcher, connector=Connector())
+    bot.name = 'TestBot'
+
+    closed = []
+
+    @dispatcher.step('step')
+    def step(data):
+        closed.append(data)
+
+    @dispatcher.handler
+    @commonfilters.command('/start')
+    async def start():
+        try:
+            yield commonwaiters.next_message(MessageType.photo)
+        finally:
+            closed.append('generator')
+
+    @dispatcher.handler
+    @commonfilters.command('/step')
+    def start_step():
+        return commonwaiters.next_step(step, commonwaiters.next_message(), 'data')
+
+    async def main():
+        await bot.process(None, make_update(1, '/start'))
+        assert len(dispatcher.waiters) == 1
+
+        await bot.process(None, make_update(2, '/step'))
+        assert len(dispatcher.waiters) == 0
+        assert len(dispatcher.steps) == 1
+
+        await bot.process(None, make_update(3, 'text'))
+        assert len(dispatcher.steps) == 0
+
+    asyncio.run(main())
+
+    assert closed == ['generator', 'data']
+
+
+@pytest.mark.dispatcher
+def test_waiter_store_memory():
+    store = MemoryWaiterStore(10)
+    empty = store.stats().memory
+
+    async def handler():
+        yield
+
+    for n in range(10):
+        store.set(str(n), Waiter(time(), handler(), commonwaiters.next_message, (), {}, []))
+
+    assert store.stats().memory > empty
@@ -0,0 +1,156 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+from time import time
+
+import pytest
+
+from rocketgram import Bot, Update, Dispatcher, Connector
+from rocketgram.routers.dispatcher import MemoryWaiterStore, commonfilters, commonwaiters
+from rocketgram.routers.dispatcher.dispatcher import Waiter
+
+
+def make_update(update_id: int, text: str) -> Update:
+    return Update.parse(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "from": {"id": 123456789, "is_bot": False, "first_name": "User"},
+                "chat": {"id": 123456789, "first_name": "User", "type": "private"},
+                "date": 1691234567,
+                "text": text
+            }
+        }
+    )
+
+
+async def handler():
+    yield
+
+
+def make_waiter(created: float) -> Waiter:
+    return Waiter(created, handler, commonwaiters.next_message, (), {}, [])
+
+
+@pytest.mark.dispatcher
+def test_expiration_order():
+    store = MemoryWaiterStore(10)
+
+    now = time()
+    store.set('a', make_waiter(now - 5))
+    store.set('b', make_waiter(now - 20))
+    store.set('c', make_waiter(now - 15))
+
+    assert len(store) == 3
+    assert store.get('a') is not None
+    assert store.get('b') is None
+    assert store.next_expiry() == now - 10
+
+    expired = store.pop_expired(now, limit=1)
+    assert [w.created for w in expired] == [now - 20]
+
+    expired = store.pop_expired(now)
+    assert [w.created for w in expired] == [now - 15]
+
+    stats = store.stats()
+    assert stats.waiters == 1
+    assert stats.expired == 2
+    assert stats.next_expiry == now + 5
+
+
+@pytest.mark.dispatcher
+def test_replaced_waiter_not_expired():
+    store = MemoryWaiterStore(10)
+
+    now = time()
+    store.set('a', make_waiter(now - 20))
+    store.set('a', make_waiter(now))
+
+    assert store.pop_expired(now) == []
+    assert store.get('a').created == now
+
+    assert store.pop('a').created == now
+    assert store.next_expiry() is None
+    assert store.stats().heap == 0
+
+
+@pytest.mark.dispatcher
+def test_state():
+    store = MemoryWaiterStore(10)
+    store.set('a', Waiter(100, handler, commonwaiters.next_message, (1,), {'x': 2}, []))
+
+    state = store.state('a')
+    assert state.handler.endswith(':handler')
+    assert state.waiter == 'rocketgram.routers.dispatcher.commonwaiters:next_message'
+    assert (state.args, state.kwargs, state.created, state.expires) == ((1,), {'x': 2}, 100, 110)
+    assert store.states() == [state]
+    assert store.state('b') is None
+
+
+@pytest.mark.dispatcher
+def test_dispatcher_uses_store():
+    store = MemoryWaiterStore(60)
+    dispatcher = Dispatcher(waiter_store=store)
+    bot = Bot("1234567890:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX", router=dispatcher, connector=Connector())
+    bot.name = 'TestBot'
+
+    results = []
+
+    @dispatcher.handler
+    @commonfilters.command('/start')
+    async def start():
+        yield commonwaiters.next_message()
+        results.append('answer')
+
+    async def main():
+        await bot.process(None, make_update(1, '/start'))
+        assert dispatcher.waiters is store
+        assert len(store) == 1
+
+        await bot.process(None, make_update(2, 'text'))
+        assert len(store) == 0
+
+    asyncio.run(main())
+
+    assert results == ['answer']
+
+
+@pytest.mark.dispatcher
+def test_expired_waiters_closed_in_background():
+    store = MemoryWaiterStore(10)
+    dispatcher = Dispatcher(waiter_store=store, watires_expire_batch=2)
+
+    closed = []
+
+    async def conversation(n: int):
+        try:
+            yield
+        finally:
+            closed.append(n)
+
+    async def main():
+        now = time()
+        for n in range(5):
+            gen = conversation(n)
+            await gen.asend(None)
+            store.set(str(n), Waiter(now - 20 + n, gen, commonwaiters.next_message, (), {}, []))
+
+        alive = conversation(5)
+        await alive.asend(None)
+        store.set('alive', Waiter(now, alive, commonwaiters.next_message, (), {}, []))
+
+        await dispatcher.init()
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert sorted(closed) == [0, 1, 2, 3, 4]
+        assert len(store) == 1
+
+        await dispatcher.shutdown()
+        await alive.aclose()
+
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+
+import pytest
+
+from rocketgram import Ordering, Update, chat_key, user_key
+
+
+def make_update(update_id: int, chat_id: int, user_id: int = 123456789) -> Update:
+    return Update.parse({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "from": {"id": user_id, "is_bot": False, "first_name": "User"},
+            "chat": {"id": chat_id, "type": "group", "title": "Group"},
+            "date": 1691234567,
+            "text": "text"
+        }
+    })
+
+
+@pytest.mark.executors
+def test_keys():
+    update = make_update(1, -100, 200)
+
+    assert chat_key(update) == -100
+    assert user_key(update) == 200
+    assert chat_key(Update.parse({"update_id": 1})) is None
+
+
+@pytest.mark.executors
+def test_ordering():
+    async def main():
+        ordering = Ordering(chat_key)
+        running = set()
+        log = list()
+
+        async def process(update: Update, delay: float):
+            chat_id = chat_key(update)
+            assert chat_id not in running
+            running.add(chat_id)
+            log.append(('start', update.update_id))
+            await asyncio.sleep(delay)
+            log.append(('end', update.update_id))
+            running.remove(chat_id)
+            return update.update_id
+
+        updates = [(make_update(1, 1), 0.03), (make_update(2, 2), 0.01), (make_update(3, 1), 0.01),
+                   (make_update(4, 1), 0), (make_update(5, 2), 0)]
+
+        tasks = [ordering.create_task(u, lambda u=u, d=d: process(u, d)) for u, d in updates]
+
+        assert ordering.active_keys == 2
+
+        assert await asyncio.gather(*tasks) == [1, 2, 3, 4, 5]
+
+        starts = [i for e, i in log if e == 'start']
+        assert starts[:2] == [1, 2]
+        assert [i for i in starts if i in (1, 3, 4)] == [1, 3, 4]
+        assert log.index(('end', 1)) < log.index(('start', 3)) < log.index(('end', 3)) < log.index(('start', 4))
+        assert log.index(('start', 5)) < log.index(('end', 1))
+
+        assert ordering.active_keys == 0
+
+    asyncio.run(main())
+
+
+@pytest.mark.executors
+def test_ordering_errors_and_scopes():
+    async def main():
+        ordering = Ordering(chat_key)
+        done = list()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError()
+
+        async def process(name):
+            done.append(name)
+
+        update = make_update(1, 1)
+
+        first = ordering.create_task(update, fail)
+        second = ordering.create_task(update, lambda: process('second'))
+        other = ordering.create_task(update, lambda: process('other scope'), scope='bot2')
+
+        await asyncio.wait((first, second, other))
+
+        assert isinstance(first.exception(), ValueError)
+        assert done == ['other scope', 'second']
+        assert ordering.active_keys == 0
+
+        unordered = ordering.create_task(Update.parse({"update_id": 1}), lambda: process('unordered'))
+        assert ordering.active_keys == 0
+        await unordered
+
+    asyncio.run(main())
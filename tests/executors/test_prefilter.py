@@ -0,0 +1,84 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import pytest
+
+from rocketgram import PreFilter, UpdateType, MessageType
+
+
+def make_message(chat_id: int, **fields) -> dict:
+    return {
+        "update_id": 123456789,
+        "message": {
+            "message_id": 1234567,
+            "from": {"id": 123456789, "is_bot": False, "first_name": "User"},
+            "chat": {"id": chat_id, "type": "group", "title": "Group"},
+            "date": 1691234567,
+            **fields
+        }
+    }
+
+
+def make_callback(chat_id: int) -> dict:
+    return {
+        "update_id": 123456789,
+        "callback_query": {
+            "id": "123",
+            "from": {"id": 123456789, "is_bot": False, "first_name": "User"},
+            "message": make_message(chat_id, text="text")["message"],
+            "chat_instance": "123",
+            "data": "data"
+        }
+    }
+
+
+@pytest.mark.executors
+def test_empty_prefilter():
+    prefilter = PreFilter()
+
+    assert prefilter(make_message(-1, text="text"))
+    assert prefilter(make_message(-1, new_chat_title="title"))
+    assert prefilter(make_callback(-1))
+
+
+@pytest.mark.executors
+def test_update_types():
+    prefilter = PreFilter(update_types=[UpdateType.callback_query])
+
+    assert not prefilter(make_message(-1, text="text"))
+    assert prefilter(make_callback(-1))
+
+
+@pytest.mark.executors
+def test_message_types():
+    prefilter = PreFilter(message_types=[MessageType.text])
+
+    assert prefilter(make_message(-1, text="text"))
+    assert not prefilter(make_message(-1, new_chat_title="title"))
+    assert prefilter(make_callback(-1))
+
+
+@pytest.mark.executors
+def test_chat_ids():
+    allow = PreFilter(chat_ids=[-1])
+    deny = PreFilter(exclude_chat_ids=[-1])
+
+    assert allow(make_message(-1, text="text"))
+    assert allow(make_callback(-1))
+    assert not allow(make_message(-2, text="text"))
+    assert not allow(make_callback(-2))
+
+    assert not deny(make_message(-1, text="text"))
+    assert not deny(make_callback(-1))
+    assert deny(make_message(-2, text="text"))
+
+
+@pytest.mark.executors
+def test_commands():
+    prefilter = PreFilter(commands=['/'])
+
+    assert prefilter(make_message(-1, text="/start"))
+    assert not prefilter(make_message(-1, text="text"))
+    assert prefilter(make_message(-1, new_chat_title="title"))
@@ -0,0 +1,72 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import time
+
+import pytest
+
+from rocketgram import Bot, BotRegistry, Connector, hashed_suffix
+
+TOKEN = "1234567890:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX"
+
+
+def make_bot(bot_id: int) -> Bot:
+    return Bot(f"{bot_id}:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX", connector=Connector())
+
+
+@pytest.mark.executors
+def test_hashed_suffix():
+    suffix = hashed_suffix(TOKEN)
+
+    assert suffix.startswith('1234567890/')
+    assert 'AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX' not in suffix
+    assert suffix == hashed_suffix(TOKEN)
+    assert suffix != hashed_suffix(TOKEN + 'x')
+
+
+@pytest.mark.executors
+def test_add_remove():
+    registry = BotRegistry()
+    bots = [make_bot(i) for i in range(1, 4)]
+
+    for bot in bots:
+        registry.add(f'/{bot.token}', bot, initialized=bot is not bots[2])
+
+    assert len(registry) == 3
+    assert registry.active == 2
+    assert registry.get(f'/{bots[1].token}').bot is bots[1]
+
+    with pytest.raises(ValueError):
+        registry.add('/other', bots[0])
+    with pytest.raises(ValueError):
+        registry.add(f'/{bots[0].token}', make_bot(4))
+
+    entry = registry.remove(bots[1])
+    assert entry.bot is bots[1]
+    assert bots[1] not in registry
+    assert registry.get(f'/{bots[1].token}') is None
+    assert registry.bots == [bots[0], bots[2]]
+
+    with pytest.raises(ValueError):
+        registry.remove(bots[1])
+
+
+@pytest.mark.executors
+def test_idle():
+    registry = BotRegistry()
+    first, second, third = (registry.add(f'/{i}', make_bot(i)) for i in range(1, 4))
+
+    time.sleep(0.02)
+    registry.touch(first)
+
+    assert registry.idle(0.01) == [second, third]
+
+    registry.deactivate(second)
+    assert registry.idle(0.01) == [third]
+    assert registry.active == 2
+
+    # touching does not activate bot that is not initialized
+    registry.touch(second)
+    assert registry.active == 2
@@ -0,0 +1,199 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import json
+import os
+import signal
+import socket
+import threading
+import time
+import urllib.request
+from functools import partial
+
+import pytest
+
+from rocketgram import Bot, Connector, Executor, Response, Router
+
+TOKEN = "1234567890:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX"
+
+
+async def noop():
+    pass
+
+
+def write_pid(directory: str):
+    with open(os.path.join(directory, str(os.getpid())), 'w') as f:
+        f.write('done')
+
+
+@pytest.mark.executors
+def test_run_workers(tmp_path):
+    calls = []
+
+    async def setup():
+        calls.append(('setup', len(os.listdir(tmp_path))))
+
+    async def teardown():
+        calls.append(('teardown', len(os.listdir(tmp_path))))
+
+    Executor._run_workers(partial(write_pid, str(tmp_path)), 3, setup, teardown, (signal.SIGUSR1,),
+                          shutdown_wait=5, start_method='fork')
+
+    pids = os.listdir(tmp_path)
+    assert len(pids) == 3
+    assert str(os.getpid()) not in pids
+    assert calls == [('setup', 0), ('teardown', 3)]
+
+
+def crash_once(directory: str):
+    # The first worker fails, others and the restarted one finish normally.
+
+    try:
+        open(os.path.join(directory, 'crashed'), 'x').close()
+    except FileExistsError:
+        write_pid(directory)
+    else:
+        os._exit(1)
+
+
+@pytest.mark.executors
+def test_run_workers_restarts_failed(tmp_path):
+    Executor._run_workers(partial(crash_once, str(tmp_path)), 2, noop, noop, (signal.SIGUSR1,),
+                          shutdown_wait=5, start_method='fork')
+
+    assert sorted(os.listdir(tmp_path))[-1] == 'crashed'
+    assert len(os.listdir(tmp_path)) == 3
+
+
+def signal_coordinator(directory: str):
+    # Stops the coordinator while it may be still starting other workers.
+
+    write_pid(directory)
+    os.kill(os.getppid(), signal.SIGUSR1)
+    time.sleep(30)
+
+
+@pytest.mark.executors
+def test_run_workers_signal_while_starting(tmp_path):
+    start = time.monotonic()
+    Executor._run_workers(partial(signal_coordinator, str(tmp_path)), 4, noop, noop, (signal.SIGUSR1,),
+                          shutdown_wait=5, start_method='fork')
+
+    assert time.monotonic() - start < 5
+
+    pids = os.listdir(tmp_path)
+    assert pids
+    for pid in pids:
+        with pytest.raises(ProcessLookupError):
+            os.kill(int(pid), 0)
+
+
+def record(directory: str, event: str):
+    with open(os.path.join(directory, 'events'), 'a') as f:
+        f.write(f'{os.getpid()} {event}\n')
+
+
+def events(directory: str) -> list:
+    path = os.path.join(directory, 'events')
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [line.split() for line in f.read().splitlines()]
+
+
+class RecordingConnector(Connector):
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = directory
+
+    async def init(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def send(self, token, request):
+        record(self.directory, request.method)
+        return Response(request, {}, True, None, None, True, None)
+
+
+class RecordingRouter(Router):
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    async def init(self):
+        record(self.directory, 'init')
+
+    async def shutdown(self):
+        record(self.directory, 'shutdown')
+
+    async def process(self):
+        record(self.directory, 'process')
+
+
+def make_bot(directory: str) -> Bot:
+    bot = Bot(TOKEN, router=RecordingRouter(directory), connector=RecordingConnector(directory))
+    bot.name = 'TestBot'
+    return bot
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+
+def feed(directory: str, port: int):
+    # Sends updates until both workers processed some, then stops the coordinator.
+
+    deadline = time.monotonic() + 20
+    update_id = 0
+    while time.monotonic() < deadline:
+        update_id += 1
+        data = json.dumps({"update_id": update_id}).encode()
+        request = urllib.request.Request(f'http://localhost:{port}/{TOKEN}', data=data,
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=1):
+                pass
+        except OSError:
+            time.sleep(0.05)
+            continue
+
+        if len({pid for pid, event in events(directory) if event == 'process'}) == 2:
+            break
+
+    os.kill(os.getpid(), signal.SIGUSR1)
+
+
+@pytest.mark.executors
+def test_webhook_run_workers(tmp_path):
+    aiohttp_executor = pytest.importorskip('rocketgram.executors.aiohttp')
+
+    directory = str(tmp_path)
+    port = free_port()
+
+    thread = threading.Thread(target=feed, args=(directory, port), daemon=True)
+    thread.start()
+
+    aiohttp_executor.AioHttpExecutor.run_workers(partial(make_bot, directory), 'https://example.com/', '/',
+                                                 processes=2, port=port, signals=(signal.SIGUSR1,),
+                                                 shutdown_wait=5, start_method='fork')
+    thread.join()
+
+    recorded = events(directory)
+    coordinator = str(os.getpid())
+
+    # webhook is set and removed once by the coordinator
+    assert [e for e in recorded if e[1] in ('SetWebhook', 'DeleteWebhook')] == \
+           [[coordinator, 'SetWebhook'], [coordinator, 'DeleteWebhook']]
+
+    # both workers serve the same port
+    workers = {pid for pid, event in recorded if event == 'init'}
+    assert len(workers) == 2 and coordinator not in workers
+    assert {pid for pid, event in recorded if event == 'process'} == workers
+
+    # workers shut down their bots gracefully
+    assert {pid for pid, event in recorded if event == 'shutdown'} == workers
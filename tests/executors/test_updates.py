@@ -0,0 +1,200 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+
+import pytest
+
+from rocketgram import Bot, Connector, Router, Response, UpdatesExecutor, GetUpdates, Ordering, chat_key, context
+
+
+def make_update(update_id: int) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "from": {"id": 123456789, "is_bot": False, "first_name": "User"},
+            "chat": {"id": 123456789, "type": "private", "first_name": "User"},
+            "date": 1691234567,
+            "text": "text"
+        }
+    }
+
+
+class FakeConnector(Connector):
+    def __init__(self, updates: int):
+        super().__init__()
+        self.updates = [make_update(i) for i in range(1, updates + 1)]
+        self.limits = list()
+
+    async def init(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def send(self, token, request):
+        if isinstance(request, GetUpdates):
+            self.limits.append(request.limit)
+            offset = request.offset or 0
+            result = [u for u in self.updates if u['update_id'] >= offset][:request.limit or 100]
+            if not result:
+                await asyncio.sleep(0.01)
+            return Response(request, {}, True, None, None, request.parse_result(result), None)
+
+        return Response(request, {}, True, None, None, True, None)
+
+
+class SlowRouter(Router):
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.processing = 0
+        self.max_processing = 0
+        self.processed = list()
+
+    async def init(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def process(self):
+        self.processing += 1
+        self.max_processing = max(self.max_processing, self.processing)
+        try:
+            await self.release.wait()
+            await asyncio.sleep(0)
+            self.processed.append(context.update.update_id)
+        finally:
+            self.processing -= 1
+
+
+async def make_bot(executor: UpdatesExecutor, updates: int, token: str = '1:token', router=None):
+    router = router or SlowRouter()
+    bot = Bot(token, connector=FakeConnector(updates), router=router)
+    bot.name = 'test'
+    await executor.add_bot(bot)
+    return bot, router
+
+
+async def wait_for(condition):
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("Condition was not reached")
+
+
+@pytest.mark.executors
+def test_max_in_flight():
+    async def main():
+        executor = UpdatesExecutor(max_in_flight=3)
+        bot, router = await make_bot(executor, 10)
+        await executor.start()
+
+        await wait_for(lambda: executor.in_flight(bot) == 3)
+        await asyncio.sleep(0.05)
+
+        assert router.processing == 3
+        assert bot.connector.limits == [3]
+
+        router.release.set()
+        await wait_for(lambda: len(router.processed) == 10)
+
+        assert router.max_processing == 3
+        assert sorted(router.processed) == list(range(1, 11))
+        assert all(limit is not None and limit <= 3 for limit in bot.connector.limits)
+        assert executor.in_flight(bot) == 0
+
+        await executor.stop()
+        await executor.remove_bot(bot)
+
+    asyncio.run(main())
+
+
+@pytest.mark.executors
+def test_max_in_flight_total():
+    async def main():
+        executor = UpdatesExecutor(max_in_flight_total=4)
+        bot1, router = await make_bot(executor, 10, '1:token')
+        bot2, _ = await make_bot(executor, 10, '2:token', router)
+        await executor.start()
+
+        await wait_for(lambda: executor.in_flight() == 4)
+        await asyncio.sleep(0.05)
+
+        assert router.processing == 4
+        assert executor.in_flight(bot1) + executor.in_flight(bot2) == 4
+
+        router.release.set()
+        await wait_for(lambda: len(router.processed) == 20)
+
+        assert router.max_processing == 4
+        assert executor.in_flight() == 0
+
+        await executor.stop()
+        await executor.remove_bot(bot1)
+        await executor.remove_bot(bot2)
+
+    asyncio.run(main())
+
+
+@pytest.mark.executors
+def test_unlimited():
+    async def main():
+        executor = UpdatesExecutor()
+        bot, router = await make_bot(executor, 10)
+        await executor.start()
+
+        await wait_for(lambda: router.processing == 10)
+        assert bot.connector.limits[0] is None
+
+        router.release.set()
+        await wait_for(lambda: len(router.processed) == 10)
+
+        await executor.stop()
+        await executor.remove_bot(bot)
+
+    asyncio.run(main())
+
+
+@pytest.mark.executors
+def test_ordering():
+    async def main():
+        executor = UpdatesExecutor(ordering=Ordering(chat_key))
+        bot, router = await make_bot(executor, 10)
+        router.release.set()
+        await executor.start()
+
+        await wait_for(lambda: len(router.processed) == 10)
+
+        assert router.max_processing == 1
+        assert router.processed == list(range(1, 11))
+
+        await executor.stop()
+        await executor.remove_bot(bot)
+
+    asyncio.run(main())
+
+
+@pytest.mark.executors
+def test_malformed_update_releases_capacity():
+    async def main():
+        executor = UpdatesExecutor(max_in_flight=1)
+        router = SlowRouter()
+        router.release.set()
+        bot, _ = await make_bot(executor, 5, router=router)
+        del bot.connector.updates[1]['message']['chat']
+        await executor.start()
+
+        await wait_for(lambda: len(router.processed) == 4)
+
+        assert sorted(router.processed) == [1, 3, 4, 5]
+        assert executor.in_flight(bot) == 0
+
+        await executor.stop()
+        await executor.remove_bot(bot)
+
+    asyncio.run(main())
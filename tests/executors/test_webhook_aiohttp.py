@@ -0,0 +1,230 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+import json
+
+import pytest
+
+test_utils = pytest.importorskip('aiohttp.test_utils')
+
+from rocketgram import AioHttpExecutor, Bot, Connector, Response, Router, SendMessage, context  # noqa: E402
+from rocketgram import hashed_suffix  # noqa: E402
+
+TOKEN = "1234567890:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX"
+
+
+def make_update(update_id: int) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "from": {"id": 123456789, "is_bot": False, "first_name": "User"},
+            "chat": {"id": 123456789, "type": "private", "first_name": "User"},
+            "date": 1691234567,
+            "text": "text"
+        }
+    }
+
+
+class FakeConnector(Connector):
+    def __init__(self):
+        super().__init__()
+        self.sent = list()
+
+    async def init(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def send(self, token, request):
+        self.sent.append(request)
+        return Response(request, {}, True, None, None, True, None)
+
+
+class SlowRouter(Router):
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def init(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def process(self):
+        await self.release.wait()
+        SendMessage(context.chat.id, 'reply').webhook()
+
+
+async def start(**kwargs):
+    connector = FakeConnector()
+    router = SlowRouter()
+    bot = Bot(TOKEN, router=router, connector=connector)
+    bot.name = 'TestBot'
+
+    executor = AioHttpExecutor('https://example.com/', '/', **kwargs)
+    await executor.add_bot(bot, set_webhook=False)
+
+    server = test_utils.RawTestServer(executor._AioHttpExecutor__handler)
+    client = test_utils.TestClient(server)
+    await client.start_server()
+
+    return executor, bot, router, connector, client
+
+
+async def stop(executor, bot, client):
+    await client.close()
+    await executor.remove_bot(bot, delete_webhook=False)
+
+
+@pytest.mark.executors
+def test_reply_deadline_none():
+    async def main():
+        executor, bot, router, connector, client = await start()
+
+        request = asyncio.create_task(client.post('/' + TOKEN, data=json.dumps(make_update(1))))
+        await asyncio.sleep(0.05)
+        assert not request.done()
+        assert executor.pending == 1
+
+        router.release.set()
+        response = await request
+        assert response.status == 200
+        assert (await response.json())['method'] == 'SendMessage'
+        assert connector.sent == []
+
+        await stop(executor, bot, client)
+
+    asyncio.run(main())
+
+
+@pytest.mark.executors
+def test_reply_deadline_zero():
+    async def main():
+        executor, bot, router, connector, client = await start(reply_deadline=0)
+
+        response = await client.post('/' + TOKEN, data=json.dumps(make_update(1)))
+        assert response.status == 200
+        assert await response.read() == b''
+        assert executor.pending == 1
+
+        router.release.set()
+        await asyncio.sleep(0.01)
+
+        assert executor.pending == 0
+        assert [r.method for r in connector.sent] == ['SendMessage']
+
+        await stop(executor, bot, client)
+
+    asyncio.run(main())
+
+
+@pytest.mark.executors
+def test_reply_deadline_fallback():
+    async def main():
+        executor, bot, router, connector, client = await start(reply_deadline=0.05)
+
+        response = await client.post('/' + TOKEN, data=json.dumps(make_update(1)))
+        assert response.status == 200
+        assert await response.read() == b''
+
+        router.release.set()
+        await asyncio.sleep(0.01)
+
+        assert executor.pending == 0
+        assert [r.method for r in connector.sent] == ['SendMessage']
+
+        response = await client.post('/' + TOKEN, data=json.dumps(make_update(2)))
+        assert (await response.json())['method'] == 'SendMessage'
+
+        await stop(executor, bot, client)
+
+    asyncio.run(main())
+
+
+@pytest.mark.executors
+def test_max_pending():
+    async def main():
+        executor, bot, router, connector, client = await start(reply_deadline=0, max_pending=1)
+
+        response = await client.post('/' + TOKEN, data=json.dumps(make_update(1)))
+        assert response.status == 200
+
+        response = await client.post('/' + TOKEN, data=json.dumps(make_update(2)))
+        assert response.status == 503
+        assert response.headers['Retry-After'] == '1'
+
+        router.release.set()
+        await asyncio.sleep(0.01)
+
+        response = await client.post('/' + TOKEN, data=json.dumps(make_update(3)))
+        assert response.status == 200
+
+        await stop(executor, bot, client)
+
+    asyncio.run(main())
+
+
+class CountingRouter(Router):
+    def __init__(self):
+        self.inits = 0
+        self.shutdowns = 0
+        self.processed = 0
+
+    async def init(self):
+        self.inits += 1
+
+    async def shutdown(self):
+        self.shutdowns += 1
+
+    async def process(self):
+        self.processed += 1
+
+
+@pytest.mark.executors
+def test_lazy_init_and_eviction():
+    async def main():
+        router = CountingRouter()
+        bot = Bot(TOKEN, router=router, connector=FakeConnector())
+        bot.name = 'TestBot'
+
+        executor = AioHttpExecutor('https://example.com/', '/', hashed_paths=True, lazy_init=True,
+                                   idle_timeout=0.05)
+        await executor.add_bot(bot, set_webhook=False)
+        assert router.inits == 0
+        assert executor.registry.active == 0
+
+        server = test_utils.RawTestServer(executor._AioHttpExecutor__handler)
+        client = test_utils.TestClient(server)
+        await client.start_server()
+        executor._start_evictor()
+
+        response = await client.post('/' + TOKEN, data=json.dumps(make_update(1)))
+        assert response.status == 404
+
+        path = '/' + hashed_suffix(TOKEN)
+        for update_id in (1, 2):
+            response = await client.post(path, data=json.dumps(make_update(update_id)))
+            assert response.status == 200
+
+        assert (router.inits, router.processed) == (1, 2)
+        assert executor.registry.active == 1
+
+        await asyncio.sleep(0.15)
+        assert router.shutdowns == 1
+        assert executor.registry.active == 0
+
+        response = await client.post(path, data=json.dumps(make_update(3)))
+        assert response.status == 200
+        assert (router.inits, router.processed) == (2, 3)
+
+        await executor._stop_evictor()
+        await client.close()
+        await executor.remove_bot(bot, delete_webhook=False)
+        assert router.shutdowns == 2
+
+    asyncio.run(main())
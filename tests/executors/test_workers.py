@@ -0,0 +1,191 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+import json
+import os
+import signal
+
+import pytest
+
+from rocketgram import Bot, Connector, Router, SendMessage, WorkerPool, UpdatesExecutor, Ordering, context
+
+TOKEN = "1234567890:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX"
+
+
+def make_update(update_id: int, chat_id: int) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "from": {"id": chat_id, "is_bot": False, "first_name": "User"},
+            "chat": {"id": chat_id, "type": "private", "first_name": "User"},
+            "date": 1691234567,
+            "text": "text"
+        }
+    }
+
+
+class EchoRouter(Router):
+    async def init(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def process(self):
+        SendMessage(context.chat.id, f'{os.getpid()} {context.bot.name} {context.update.update_id}').webhook()
+
+
+class SlowRouter(EchoRouter):
+    # Replies with number of update in order of processing by the worker.
+
+    def __init__(self):
+        self.processed = 0
+
+    async def process(self):
+        await asyncio.sleep(0.02)
+        self.processed += 1
+        text = f'{os.getpid()} {context.bot.name} {context.update.update_id} {self.processed}'
+        SendMessage(context.chat.id, text).webhook()
+
+
+def make_bot(token: str) -> Bot:
+    return Bot(token, router=EchoRouter(), connector=Connector())
+
+
+def make_slow_bot(token: str) -> Bot:
+    return Bot(token, router=SlowRouter(), connector=Connector())
+
+
+@pytest.mark.executors
+def test_shard():
+    pool = WorkerPool(make_bot, 4)
+
+    assert pool.shard(make_update(1, 100)) == pool.shard(make_update(2, 100))
+    assert [pool.shard({"update_id": 1}, seq) for seq in range(4)] == [0, 1, 2, 3]
+
+
+@pytest.mark.executors
+def test_webhook_replies():
+    pool = WorkerPool(make_bot, 2)
+    bot = Bot(TOKEN, router=EchoRouter(), connector=Connector())
+    bot.name = 'TestBot'
+
+    async def main():
+        await pool.start(webhook_replies=True)
+        try:
+            updates = [make_update(i, chat_id) for i, chat_id in enumerate((1, 2, 1, 2, 3), 1)]
+            return await asyncio.gather(*(pool.process(bot, u) for u in updates)), pool.pending()
+        finally:
+            await pool.stop()
+
+    replies, pending = asyncio.run(main())
+
+    assert pending == [0, 0]
+
+    replies = [json.loads(r) for r in replies]
+    assert [r['method'] for r in replies] == ['SendMessage'] * 5
+    assert [r['chat_id'] for r in replies] == [1, 2, 1, 2, 3]
+
+    pids = [r['text'].split()[0] for r in replies]
+    assert pids[0] == pids[2] and pids[1] == pids[3]
+    assert str(os.getpid()) not in pids
+    assert all(r['text'].split()[1] == 'TestBot' for r in replies)
+    assert [int(r['text'].split()[2]) for r in replies] == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.executors
+def test_dead_worker_restarted():
+    pool = WorkerPool(make_bot, 1)
+    bot = Bot(TOKEN, router=EchoRouter(), connector=Connector())
+    bot.name = 'TestBot'
+
+    async def main():
+        await pool.start(webhook_replies=True)
+        try:
+            first = json.loads(await pool.process(bot, make_update(1, 1)))['text'].split()[0]
+            os.kill(int(first), signal.SIGKILL)
+
+            failed = 0
+            for n in range(2, 200):
+                try:
+                    reply = await pool.process(bot, make_update(n, 1))
+                    break
+                except ConnectionError:
+                    failed += 1
+                    await asyncio.sleep(0.05)
+            else:
+                raise AssertionError('Worker was not restarted')
+
+            return first, json.loads(reply)['text'].split()[0], failed, pool.pending()
+        finally:
+            await pool.stop()
+
+    first, second, failed, pending = asyncio.run(main())
+
+    assert first != second
+    assert failed > 0
+    assert pending == [0]
+
+
+@pytest.mark.executors
+def test_worker_crash_under_load():
+    pool = WorkerPool(make_slow_bot, 2)
+    bot = Bot(TOKEN, router=EchoRouter(), connector=Connector())
+    bot.name = 'TestBot'
+
+    chats = [c for c in range(1, 100) if pool.shard(make_update(0, c)) == 0][:5]
+    chats += [c for c in range(1, 100) if pool.shard(make_update(0, c)) == 1][:5]
+
+    async def main():
+        await pool.start(webhook_replies=True)
+        try:
+            victim = json.loads(await pool.process(bot, make_update(0, chats[0])))['text'].split()[0]
+
+            updates = [make_update(n, chats[n % len(chats)]) for n in range(1, 101)]
+            tasks = [asyncio.create_task(pool.process(bot, u)) for u in updates]
+
+            await asyncio.sleep(0.1)
+            os.kill(int(victim), signal.SIGKILL)
+
+            results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 10)
+
+            # restarted worker serves its chats again
+            for _ in range(200):
+                try:
+                    reply = await pool.process(bot, make_update(101, chats[0]))
+                    break
+                except ConnectionError:
+                    await asyncio.sleep(0.05)
+            else:
+                raise AssertionError('Worker was not restarted')
+
+            return victim, updates, results, json.loads(reply)['text'].split()[0], pool.pending()
+        finally:
+            await pool.stop()
+
+    victim, updates, results, restarted, pending = asyncio.run(main())
+
+    assert restarted != victim
+    assert pending == [0, 0]
+
+    failed = [u for u, r in zip(updates, results) if isinstance(r, ConnectionError)]
+    assert failed, 'Updates in work of the killed worker should fail'
+    assert all(pool.shard(u) == 0 for u in failed)
+    assert not any(isinstance(r, BaseException) and not isinstance(r, ConnectionError) for r in results)
+
+    # updates of the other worker are all processed, updates of every chat in order
+    replies = [json.loads(r) for u, r in zip(updates, results) if pool.shard(u) == 1]
+    assert len(replies) == 50
+    for chat_id in chats[5:]:
+        order = [int(r['text'].split()[3]) for r in replies if r['chat_id'] == chat_id]
+        assert len(order) == 10 and order == sorted(order)
+
+
+@pytest.mark.executors
+def test_workers_reject_ordering():
+    with pytest.raises(AssertionError):
+        UpdatesExecutor(ordering=Ordering(), workers=WorkerPool(make_bot, 1))
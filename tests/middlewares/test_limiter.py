@@ -0,0 +1,132 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+
+import asyncio
+from time import monotonic
+
+import pytest
+
+from rocketgram import Bot, Update, Dispatcher, Connector, LimiterMiddleware, LimitAction, UpdateType, context
+from rocketgram.routers.dispatcher import commonfilters
+
+
+def make_update(update_id: int, chat_id: int = 1, user_id: int = 1) -> Update:
+    return Update.parse(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "from": {"id": user_id, "is_bot": False, "first_name": "User"},
+                "chat": {"id": chat_id, "type": "group", "title": "Group"},
+                "date": 1691234567,
+                "text": "text"
+            }
+        }
+    )
+
+
+def make_bot(limiter: LimiterMiddleware, processed: list) -> Bot:
+    dispatcher = Dispatcher()
+    bot = Bot("1234567890:AAgLHoRpZxIcND0EqNL15HurLzwwSKomngX", router=dispatcher, connector=Connector())
+    bot.name = 'TestBot'
+    bot.middleware(limiter)
+
+    @dispatcher.handler
+    @commonfilters.update_type(UpdateType.message)
+    async def handler():
+        processed.append(context.update.update_id)
+
+    return bot
+
+
+@pytest.mark.middlewares
+def test_drop_per_bot():
+    processed = []
+    bot = make_bot(LimiterMiddleware(2, 60), processed)
+
+    async def main():
+        for n in range(5):
+            await bot.process(None, make_update(n, chat_id=n))
+
+    asyncio.run(main())
+
+    assert processed == [0, 1]
+
+
+@pytest.mark.middlewares
+def test_drop_per_chat():
+    processed = []
+    limiter = LimiterMiddleware(1, 60, key='chat')
+    bot = make_bot(limiter, processed)
+
+    async def main():
+        for n in range(6):
+            await bot.process(None, make_update(n, chat_id=n % 3))
+
+    asyncio.run(main())
+
+    assert processed == [0, 1, 2]
+    assert len(limiter) == 3
+
+
+@pytest.mark.middlewares
+def test_custom_key():
+    processed = []
+    bot = make_bot(LimiterMiddleware(1, 60, key=lambda: None), processed)
+
+    async def main():
+        for n in range(3):
+            await bot.process(None, make_update(n))
+
+    asyncio.run(main())
+
+    assert processed == [0, 1, 2]
+
+
+@pytest.mark.middlewares
+def test_delay():
+    processed = []
+    bot = make_bot(LimiterMiddleware(2, 0.1, key='user', action='delay', max_delay=0.15), processed)
+
+    async def main():
+        started = monotonic()
+        await asyncio.gather(*(bot.process(None, make_update(n)) for n in range(5)))
+        return monotonic() - started
+
+    elapsed = asyncio.run(main())
+
+    # two updates pass at once, two wait for the next window, the last one would wait too long
+    assert sorted(processed) == [0, 1, 2, 3]
+    assert 0.1 <= elapsed < 0.5
+
+
+@pytest.mark.middlewares
+def test_queue():
+    processed = []
+    bot = make_bot(LimiterMiddleware(1, 0.05, action=LimitAction.queue, max_queue=2), processed)
+
+    async def main():
+        await asyncio.gather(*(bot.process(None, make_update(n)) for n in range(5)))
+
+    asyncio.run(main())
+
+    assert sorted(processed) == [0, 1, 2]
+
+
+@pytest.mark.middlewares
+def test_keys_are_bounded():
+    processed = []
+    limiter = LimiterMiddleware(1, 60, key='chat', max_keys=10)
+    bot = make_bot(limiter, processed)
+
+    async def main():
+        for n in range(100):
+            await bot.process(None, make_update(n, chat_id=n))
+        await bot.shutdown()
+
+    asyncio.run(main())
+
+    assert len(processed) == 100
+    assert len(limiter) == 0
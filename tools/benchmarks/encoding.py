@@ -0,0 +1,89 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+"""\
+Compares request body encoding paths.
+
+old: request.render() followed by adapter's dumps (and str.encode when dumps returns str),
+     the default path of AioHttpConnector
+new: request.encode(adapter) that produces the same bytes without rendering nested objects,
+     used by AioHttpConnector(direct_encoding=True)
+
+With the standard json adapter the new path is faster for flat requests (1.1x-1.5x between runs)
+and about the same for requests with keyboards and entities. With orjson both paths cost about
+the same (0.8x-1.4x between runs), because orjson serializes the rendered dict as fast as
+the shallow one and calls back into python for every nested object.
+
+Usage: PYTHONPATH=src python tools/benchmarks/encoding.py [number]
+"""
+
+import sys
+from contextlib import suppress
+from datetime import datetime, timezone
+from timeit import repeat
+
+from rocketgram import AnswerCallbackQuery, SendMessage, EditMessageText, BanChatMember, GetUpdates
+from rocketgram import InlineKeyboard, MessageEntity, EntityType, ParseModeType, ReplyParameters
+from rocketgram import StandardJsonAdapter
+
+ADAPTERS = [StandardJsonAdapter]
+
+with suppress(ImportError):
+    from rocketgram import UJsonJsonAdapter
+
+    ADAPTERS.append(UJsonJsonAdapter)
+
+with suppress(ImportError):
+    from rocketgram import OrJsonJsonAdapter
+
+    ADAPTERS.append(OrJsonJsonAdapter)
+
+
+def requests():
+    kb = InlineKeyboard()
+    for i in range(6):
+        kb.callback(f'Button {i}', f'button-{i}')
+    kb.arrange_simple(2)
+
+    return {
+        'GetUpdates': GetUpdates(offset=123456, timeout=30),
+        'AnswerCallbackQuery': AnswerCallbackQuery('1234567890', text='Done!'),
+        'SendMessage': SendMessage(123456789, 'Hello world!'),
+        'SendMessage+keyboard': SendMessage(123456789, '<b>Hello</b> world!', parse_mode=ParseModeType.html,
+                                            reply_parameters=ReplyParameters(456), reply_markup=kb),
+        'EditMessageText+entities': EditMessageText('Hello world!', 123456789, 456, entities=[
+            MessageEntity(EntityType.bold, 0, 5, None, None, None, None),
+            MessageEntity(EntityType.italic, 6, 6, None, None, None, None),
+        ]),
+        'BanChatMember': BanChatMember(123456789, 987654321, datetime(2030, 1, 1, tzinfo=timezone.utc)),
+    }
+
+
+def old_path(adapter, request):
+    data = adapter.dumps(request.render())
+    return data if isinstance(data, bytes) else data.encode()
+
+
+def new_path(adapter, request):
+    return request.encode(adapter)
+
+
+def measure(func, number):
+    return min(repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print(f"{'adapter':<20} {'request':<26} {'old, us':>10} {'new, us':>10} {'speedup':>8}")
+
+    for adapter in ADAPTERS:
+        for name, request in requests().items():
+            old = measure(lambda: old_path(adapter, request), number)
+            new = measure(lambda: new_path(adapter, request), number)
+            print(f"{adapter.__name__:<20} {name:<26} {old:>10.2f} {new:>10.2f} {old / new:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
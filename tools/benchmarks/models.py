@@ -0,0 +1,98 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+"""\
+Measures memory, allocations and time of parsing representative updates.
+
+memory: bytes retained by one parsed update (raw data excluded)
+blocks: number of memory blocks retained by one parsed update
+parse: time of parsing one update
+
+Usage: PYTHONPATH=src python tools/benchmarks/models.py [number]
+"""
+
+import gc
+import sys
+import tracemalloc
+from timeit import repeat
+
+from rocketgram import Update
+
+USER = {'id': 123456789, 'is_bot': False, 'first_name': 'User', 'last_name': 'Name', 'username': 'username',
+        'language_code': 'en'}
+CHAT = {'id': 123456789, 'first_name': 'User', 'last_name': 'Name', 'username': 'username', 'type': 'private'}
+GROUP = {'id': -1001234567890, 'title': 'Group', 'type': 'supergroup'}
+
+
+def updates():
+    return {
+        'text': {
+            'update_id': 1,
+            'message': {'message_id': 1, 'from': USER, 'chat': CHAT, 'date': 1691234567, 'text': 'Hello world!'},
+        },
+        'command+entities': {
+            'update_id': 2,
+            'message': {'message_id': 2, 'from': USER, 'chat': GROUP, 'date': 1691234567, 'text': '/start@bot arg',
+                        'entities': [{'type': 'bot_command', 'offset': 0, 'length': 10}]},
+        },
+        'photo+reply': {
+            'update_id': 3,
+            'message': {'message_id': 3, 'from': USER, 'chat': GROUP, 'date': 1691234567, 'caption': 'Photo',
+                        'photo': [{'file_id': f'file{i}', 'file_unique_id': f'unique{i}', 'width': 90 * i,
+                                   'height': 60 * i, 'file_size': 1000 * i} for i in range(1, 5)],
+                        'reply_to_message': {'message_id': 1, 'from': USER, 'chat': GROUP, 'date': 1691234500,
+                                             'text': 'Hello world!'}},
+        },
+        'callback_query': {
+            'update_id': 4,
+            'callback_query': {'id': '1234567890', 'from': USER, 'chat_instance': '-123', 'data': 'button-1',
+                               'message': {'message_id': 4, 'from': USER, 'chat': CHAT, 'date': 1691234567,
+                                           'text': 'Choose:',
+                                           'reply_markup': {'inline_keyboard': [[
+                                               {'text': 'Button 1', 'callback_data': 'button-1'},
+                                               {'text': 'Button 2', 'callback_data': 'button-2'},
+                                           ]]}}},
+        },
+    }
+
+
+def retained(data, lazy: bool, count: int = 1000):
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+
+    # access message to decode its fields in lazy mode like handlers do
+    parsed = [Update.parse(data, lazy=lazy) for _ in range(count)]
+    for update in parsed:
+        if update.message is not None:
+            _ = update.message.text, update.message.user, update.message.chat
+
+    stats = tracemalloc.take_snapshot().compare_to(snapshot, 'filename')
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    blocks = sum(s.count_diff for s in stats)
+    del parsed
+    return (after - before) / count, blocks / count
+
+
+def measure(func, number):
+    return min(repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print(f"{'update':<20} {'mode':<6} {'memory, B':>10} {'blocks':>8} {'parse, us':>10}")
+
+    for name, data in updates().items():
+        for lazy in (False, True):
+            memory, blocks = retained(data, lazy)
+            parse = measure(lambda: Update.parse(data, lazy=lazy), number)
+            print(f"{name:<20} {'lazy' if lazy else 'eager':<6} {memory:>10.0f} {blocks:>8.1f} {parse:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
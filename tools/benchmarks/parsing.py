@@ -0,0 +1,74 @@
+# Copyright (C) 2015-2024 by Vd.
+# This file is part of Rocketgram, the modern Telegram bot framework.
+# Rocketgram is released under the MIT License (see LICENSE).
+
+"""\
+Measures parsing of updates with date fields.
+
+parse: Update.parse() of the raw update
+parse+date: parsing followed by access to message dates like handlers that use them do
+fromtimestamp: cost of datetime construction per date field for comparison
+
+Usage: PYTHONPATH=src python tools/benchmarks/parsing.py [number]
+"""
+
+import sys
+from datetime import datetime, timezone
+from timeit import repeat
+
+from rocketgram import Update
+
+USER = {'id': 123456789, 'is_bot': False, 'first_name': 'User'}
+CHAT = {'id': -1001234567890, 'title': 'Group', 'type': 'supergroup'}
+
+
+def updates():
+    return {
+        'text': {
+            'update_id': 1,
+            'message': {'message_id': 1, 'from': USER, 'chat': CHAT, 'date': 1691234567, 'text': 'Hello world!'},
+        },
+        'edited+reply': {
+            'update_id': 2,
+            'edited_message': {'message_id': 2, 'from': USER, 'chat': CHAT, 'date': 1691234567,
+                               'edit_date': 1691234600, 'text': 'Edited',
+                               'reply_to_message': {'message_id': 1, 'from': USER, 'chat': CHAT,
+                                                    'date': 1691234500, 'text': 'Hello world!'}},
+        },
+        'chat_member': {
+            'update_id': 3,
+            'chat_member': {'chat': CHAT, 'from': USER, 'date': 1691234567,
+                            'old_chat_member': {'status': 'member', 'user': USER},
+                            'new_chat_member': {'status': 'kicked', 'user': USER, 'until_date': 1691300000}},
+        },
+    }
+
+
+def access(update: Update):
+    message = update.message or update.edited_message
+    if message is not None:
+        return message.date, message.edit_date
+    return update.chat_member.date
+
+
+def measure(func, number):
+    return min(repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print(f"{'update':<16} {'mode':<6} {'parse, us':>10} {'parse+date, us':>15}")
+
+    for name, data in updates().items():
+        for lazy in (False, True):
+            parse = measure(lambda: Update.parse(data, lazy=lazy), number)
+            full = measure(lambda: access(Update.parse(data, lazy=lazy)), number)
+            print(f"{name:<16} {'lazy' if lazy else 'eager':<6} {parse:>10.2f} {full:>15.2f}")
+
+    dt = measure(lambda: datetime.fromtimestamp(1691234567, tz=timezone.utc), number)
+    print(f"\nfromtimestamp: {dt:.2f} us")
+
+
+if __name__ == '__main__':
+    main()